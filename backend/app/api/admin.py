@@ -2,26 +2,43 @@
 # FICHIER : backend/app/api/admin.py
 # ============================================
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import exists, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 from typing import List
+from pydantic import TypeAdapter
 from app.database import get_db
-from app.models.models import User, Player, Team, Pool
+from app.models.models import User, Player, Team, Pool, Match
 from app.schemas.admin import (
     PlayerCreate, PlayerUpdate, PlayerResponse,
     TeamCreate, TeamResponse,
-    PoolCreate, PoolResponse,
-    AccountCreate, AccountResponse,
+    PoolCreate, PoolResponse, PoolScheduleCreate, PoolScheduleResponse, UnscheduledPairing,
+    AccountCreate, AccountResponse, BulkAccountCreate,
     RoleUpdate
 )
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
+from app.api.serialization import json_response
+from app.core.response_cache import response_cache
+from app.core.single_flight import single_flight
+from app.core.principal_cache import Principal, principal_cache
+from app.core.hashing import hash_password, hashing_pool
 from app.core.security import get_password_hash
+from app.core.login_attempts import login_attempts
+from app.core.slow_queries import slow_query_log
+from app.services.standings import recompute_standings
+from app.services.scheduling import SlotConflict, bulk_create_events
+from app.services.round_robin import load_pools, plan_round_robin
+import csv
+import io
 import secrets
 import string
 
 router = APIRouter()
 
-def check_admin(current_user: User):
+PLAYER_LIST = TypeAdapter(List[PlayerResponse])
+
+def check_admin(current_user: Principal):
     if current_user.role != "ADMINISTRATEUR":
         raise HTTPException(status_code=403, detail="Accès réservé aux administrateurs")
 
@@ -31,7 +48,7 @@ def check_admin(current_user: User):
 def create_player(
     player: PlayerCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
     
@@ -50,17 +67,18 @@ def create_player(
 @router.get("/players", response_model=List[PlayerResponse])
 def get_players(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
-    return db.query(Player).all()
+    players = db.query(Player).options(joinedload(Player.user)).all()  # user_role sans requête par joueur
+    return json_response(PLAYER_LIST, players, from_orm=True)
 
 @router.put("/players/{player_id}", response_model=PlayerResponse)
 def update_player(
     player_id: int,
     player_update: PlayerUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
     db_player = db.query(Player).filter(Player.id == player_id).first()
@@ -68,8 +86,22 @@ def update_player(
         raise HTTPException(404, "Joueur non trouvé")
         
     update_data = player_update.model_dump(exclude_unset=True)
+
+    # Comme à la création d'une équipe : ses deux joueurs restent dans la même entreprise
+    if "company" in update_data and db_player.team_id:
+        teammate_differs = db.query(exists().where(
+            (Player.team_id == db_player.team_id) & (Player.id != db_player.id)
+            & Player.company.is_distinct_from(update_data["company"])
+        )).scalar()
+        if teammate_differs:
+            raise HTTPException(400, "Les deux joueurs d'une équipe doivent appartenir à la même entreprise")
+
     for key, value in update_data.items():
         setattr(db_player, key, value)
+
+    # L'entreprise de l'équipe suit celle de ses joueurs
+    if db_player.team and "company" in update_data:
+        db_player.team.company = db_player.company
         
     db.commit()
     db.refresh(db_player)
@@ -79,7 +111,7 @@ def update_player(
 def delete_player(
     player_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
     db_player = db.query(Player).filter(Player.id == player_id).first()
@@ -98,10 +130,10 @@ def change_player_role(
     player_id: int,
     role_update: RoleUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
-    player = db.query(Player).filter(Player.id == player_id).first()
+    player = db.query(Player).options(joinedload(Player.user)).filter(Player.id == player_id).first()
     if not player:
         raise HTTPException(404, "Joueur non trouvé")
     
@@ -121,7 +153,7 @@ def change_player_role(
 def create_team(
     team: TeamCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
     
@@ -145,7 +177,7 @@ def create_team(
     if existing_team:
         raise HTTPException(400, "Une équipe avec ce nom existe déjà")
 
-    db_team = Team(name=team.name)
+    db_team = Team(name=team.name, company=p1.company)
     db.add(db_team)
     db.commit()
     
@@ -158,7 +190,7 @@ def create_team(
 @router.get("/teams", response_model=List[TeamResponse])
 def get_teams(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
     return db.query(Team).all()
@@ -167,14 +199,17 @@ def get_teams(
 def delete_team(
     team_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
     db_team = db.query(Team).filter(Team.id == team_id).first()
     if not db_team:
         raise HTTPException(404, "Équipe non trouvée")
         
-    if db_team.matches_as_team1 or db_team.matches_as_team2:
+    has_matches = db.query(
+        exists().where((Match.team1_id == team_id) | (Match.team2_id == team_id))
+    ).scalar()
+    if has_matches:
         raise HTTPException(400, " Impossible de supprimer une équipe qui a déjà joué des matchs")
     
     # Libérer les joueurs
@@ -191,7 +226,7 @@ def delete_team(
 def create_pool(
     pool: PoolCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
     
@@ -220,11 +255,108 @@ def create_pool(
 @router.get("/pools", response_model=List[PoolResponse])
 def get_pools(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
     return db.query(Pool).all()
 
+@router.post("/pools/schedule", response_model=PoolScheduleResponse)
+def schedule_pools(
+    schedule: PoolScheduleCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Génère les matchs aller des poules (chaque équipe rencontre toutes les autres)
+    sur le calendrier fourni, puis les enregistre via la création en lot du planning.
+    Les rencontres déjà programmées ne sont pas dupliquées.
+    """
+    check_admin(current_user)
+
+    pools = load_pools(db, schedule.pool_ids)
+    missing = set(schedule.pool_ids) - set(pools)
+    if missing:
+        raise HTTPException(404, f"Poule {min(missing)} non trouvée ou sans équipe")
+
+    try:
+        events, unscheduled = plan_round_robin(
+            db, pools, schedule.dates, schedule.start_times, schedule.courts, schedule.duration_minutes
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    event_ids = []
+    if events and not schedule.dry_run:
+        try:
+            event_ids, errors = bulk_create_events(db, events, all_or_nothing=True)
+        except SlotConflict:
+            raise HTTPException(409, "Le planning a changé pendant la génération, veuillez réessayer")
+        if errors:
+            raise HTTPException(409, errors[0][1])
+        db.commit()
+
+    return PoolScheduleResponse(
+        matches_planned=sum(len(e.matches) for e in events),
+        event_ids=event_ids,
+        events=events,
+        unscheduled=[UnscheduledPairing(pool_id=p, team1_id=t1, team2_id=t2) for p, t1, t2 in unscheduled]
+    )
+
+# --- Standings ---
+
+@router.post("/standings/recompute")
+def recompute_team_standings(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Reconstruit le classement depuis les matchs et signale les écarts corrigés"""
+    check_admin(current_user)
+    return recompute_standings(db)
+
+# --- Login attempts ---
+
+@router.delete("/login-attempts/{email}")
+def unlock_login(
+    email: str,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Débloque un compte après trop d'échecs de connexion"""
+    check_admin(current_user)
+    login_attempts.reset(email)
+    return {"message": f"Tentatives de connexion réinitialisées pour {email}"}
+
+# --- Metrics ---
+
+@router.get("/metrics/principal-cache")
+def get_principal_cache_metrics(current_user: Principal = Depends(get_current_principal)):
+    """Taille et compteurs succès/échecs du cache d'authentification"""
+    check_admin(current_user)
+    return principal_cache.stats()
+
+@router.get("/metrics/response-cache")
+def get_response_cache_metrics(current_user: Principal = Depends(get_current_principal)):
+    """Taille et compteurs (succès, 304, invalidations) du cache de réponses"""
+    check_admin(current_user)
+    return response_cache.stats()
+
+@router.get("/metrics/single-flight")
+def get_single_flight_metrics(current_user: Principal = Depends(get_current_principal)):
+    """Calculs de réponses exécutés et requêtes servies par un calcul déjà en cours"""
+    check_admin(current_user)
+    return single_flight.stats()
+
+@router.get("/metrics/hashing")
+def get_hashing_metrics(current_user: Principal = Depends(get_current_principal)):
+    """Occupation, refus et latences du pool bcrypt"""
+    check_admin(current_user)
+    return hashing_pool.stats()
+
+@router.get("/metrics/slow-queries")
+def get_slow_queries(current_user: Principal = Depends(get_current_principal)):
+    """Requêtes SQL lentes récentes avec route, forme des paramètres et plan d'exécution"""
+    check_admin(current_user)
+    return {"threshold_ms": slow_query_log.threshold_ms, "queries": slow_query_log.entries()}
+
 # --- Accounts ---
 
 def generate_secure_password(length=12):
@@ -241,7 +373,7 @@ def generate_secure_password(length=12):
 def create_player_account(
     account: AccountCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     check_admin(current_user)
     
@@ -256,7 +388,7 @@ def create_player_account(
     
     user = User(
         email=player.email,
-        password_hash=get_password_hash(temp_password),
+        password_hash=hash_password(temp_password),
         role="JOUEUR",
         firstname=player.firstname,
         lastname=player.lastname,
@@ -269,3 +401,71 @@ def create_player_account(
     db.commit()
     
     return AccountResponse(email=user.email, temp_password=temp_password)
+
+@router.post("/accounts/bulk")
+def create_player_accounts_bulk(
+    accounts: BulkAccountCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Crée en une fois les comptes des joueurs donnés (ou de tous ceux qui n'en ont pas)
+    et renvoie un CSV email,temp_password. Les mots de passe sont hachés en parallèle
+    dans le pool bcrypt, puis les comptes insérés en une transaction : le CSV n'est
+    envoyé qu'après le commit, il ne contient que des comptes existants. Si l'insertion
+    échoue (email pris entre-temps), 409 sans aucun mot de passe.
+    Joueurs ayant déjà un compte ou dont l'email est pris : ignorés.
+    """
+    check_admin(current_user)
+
+    query = db.query(Player).filter(
+        ~Player.user.has(),
+        ~exists().where(User.email == Player.email)
+    )
+    if accounts.player_ids is not None:
+        query = query.filter(Player.id.in_(accounts.player_ids))
+
+    players, emails = [], set()
+    for player in query.order_by(Player.id):
+        if player.email not in emails:
+            emails.add(player.email)
+            players.append(player)
+    credentials = [(player, generate_secure_password()) for player in players]
+
+    users, rows = [], []
+    for (player, temp_password), password_hash in hashing_pool.imap_unordered(
+        "hash", lambda c: get_password_hash(c[1]), credentials
+    ):
+        users.append({
+            "email": player.email,
+            "password_hash": password_hash,
+            "role": "JOUEUR",
+            "firstname": player.firstname,
+            "lastname": player.lastname,
+            "license_number": player.license_number,
+            "is_active": True,
+            "must_change_password": True,
+            "player_id": player.id
+        })
+        rows.append([player.email, temp_password])
+
+    if users:
+        try:
+            db.execute(insert(User), users)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Un compte a été créé entre-temps pour un de ces joueurs, aucun compte créé : réessayez"
+            )
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["email", "temp_password"])
+    writer.writerows(rows)
+    return Response(
+        buffer.getvalue(),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="comptes.csv"'}
+    )
@@ -2,93 +2,70 @@
 # FICHIER : backend/app/api/auth.py
 # ============================================
 
-from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.database import get_db
-from app.models.models import User, LoginAttempt
+from app.models.models import User
 from app.schemas.auth import LoginRequest, TokenResponse, UserResponse, ChangePasswordRequest, UserUpdate
-from app.core.security import verify_password, get_password_hash, create_access_token
-from app.api.deps import get_current_user
-import shutil
-import os
-import uuid
+from app.core.security import create_access_token
+from app.core.hashing import check_password, check_password_async, hash_password
+from app.core.login_attempts import login_attempts, MAX_ATTEMPTS, LOCKOUT_MINUTES
+from app.api.deps import get_current_user, get_current_user_async, get_current_principal
+from app.core.principal_cache import Principal
+from app.core.uploads import UploadRejected, receive_image
+from app.services import avatars
+from app.services.avatars import store_avatar, remove_legacy_avatar
 
 router = APIRouter()
 
-MAX_ATTEMPTS = 5
-LOCKOUT_MINUTES = 30
+def locked_out(locked_until: datetime, message: str = "Compte bloqué", minutes_remaining: int = None) -> HTTPException:
+    if minutes_remaining is None:
+        minutes_remaining = int((locked_until - datetime.now(timezone.utc)).total_seconds() / 60)
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail={
+            "message": message,
+            "locked_until": locked_until.isoformat(),
+            "minutes_remaining": minutes_remaining
+        }
+    )
 
-def check_and_update_attempts(db: Session, email: str, success: bool = False):
-    """Vérifie et met à jour les tentatives de connexion"""
-    attempt = db.query(LoginAttempt).filter(LoginAttempt.email == email).first()
-    
-    if not attempt:
-        attempt = LoginAttempt(email=email, attempts_count=0)
-        db.add(attempt)
-    
-    now = datetime.now(timezone.utc)
-    
-    # Vérifier si le compte est bloqué
-    if attempt.locked_until:
-        # S'assurer que locked_until est aware (SQLite peut renvoyer du naïf)
-        if attempt.locked_until.tzinfo is None:
-            attempt.locked_until = attempt.locked_until.replace(tzinfo=timezone.utc)
-            
-        if attempt.locked_until > now:
-            minutes_remaining = int((attempt.locked_until - now).total_seconds() / 60)
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail={
-                    "message": "Compte bloqué",
-                    "locked_until": attempt.locked_until.isoformat(),
-                    "minutes_remaining": minutes_remaining
-                }
-            )
-    
-    if success:
-        # Réinitialiser les tentatives en cas de succès
-        attempt.attempts_count = 0
-        attempt.locked_until = None
-    else:
-        # Incrémenter les tentatives
-        attempt.attempts_count += 1
-        attempt.last_attempt = now
-        
-        if attempt.attempts_count >= MAX_ATTEMPTS:
-            attempt.locked_until = now + timedelta(minutes=LOCKOUT_MINUTES)
-            db.commit()
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail={
-                    "message": "Compte bloqué après 5 tentatives échouées",
-                    "locked_until": attempt.locked_until.isoformat(),
-                    "minutes_remaining": LOCKOUT_MINUTES
-                }
-            )
-    
-    db.commit()
-    
-    if not success:
-        attempts_remaining = MAX_ATTEMPTS - attempt.attempts_count
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "message": "Email ou mot de passe incorrect",
-                "attempts_remaining": attempts_remaining
-            }
-        )
+def reject_failed_login(email: str):
+    """Compte l'échec et lève l'erreur adaptée (identifiants ou blocage)"""
+    attempts_count, locked_until = login_attempts.record_failure(email)
+    if locked_until is not None:
+        raise locked_out(locked_until, f"Compte bloqué après {MAX_ATTEMPTS} tentatives échouées", LOCKOUT_MINUTES)
+
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail={
+            "message": "Email ou mot de passe incorrect",
+            "attempts_remaining": MAX_ATTEMPTS - attempts_count
+        }
+    )
 
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: LoginRequest, db: Session = Depends(get_db)):
-    """Authentifie un utilisateur et retourne un token JWT"""
-    
+async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
+    """
+    Authentifie un utilisateur et retourne un token JWT.
+    Route async : les accès à la base passent par le threadpool, mais bcrypt est
+    attendu sans y garder de thread pendant le calcul dans le pool dédié.
+    """
+    
+    # Compte bloqué : inutile de vérifier le mot de passe
+    locked_until = await run_in_threadpool(login_attempts.locked_until, credentials.email)
+    if locked_until is not None:
+        raise locked_out(locked_until)
+
     # Récupérer l'utilisateur
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await run_in_threadpool(db.query(User).filter(User.email == credentials.email).first)
     
     # Vérifier les credentials
-    if not user or not verify_password(credentials.password, user.password_hash):
-        check_and_update_attempts(db, credentials.email, success=False)
+    if not user or not await check_password_async(credentials.password, user.password_hash):
+        await run_in_threadpool(reject_failed_login, credentials.email)
     
     if not user.is_active:
         raise HTTPException(
@@ -96,8 +73,8 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
             detail="Compte désactivé"
         )
     
-    # Réinitialiser les tentatives en cas de succès
-    check_and_update_attempts(db, credentials.email, success=True)
+    # Réinitialiser les tentatives en cas de succès (aucune écriture s'il n'y en a pas)
+    await run_in_threadpool(login_attempts.reset, credentials.email)
     
     # Créer le token
     access_token = create_access_token(
@@ -123,36 +100,44 @@ def change_password(
     """Change le mot de passe de l'utilisateur connecté"""
     
     # Vérifier le mot de passe actuel
-    if not verify_password(request.current_password, current_user.password_hash):
+    if not check_password(request.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Mot de passe actuel incorrect"
         )
     
     # Vérifier que le nouveau mot de passe est différent
-    if verify_password(request.new_password, current_user.password_hash):
+    if check_password(request.new_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Le nouveau mot de passe doit être différent de l'ancien"
         )
     
     # Mettre à jour le mot de passe
-    current_user.password_hash = get_password_hash(request.new_password)
+    current_user.password_hash = hash_password(request.new_password)
     current_user.must_change_password = False
     db.commit()
     
     return {"message": "Mot de passe modifié avec succès"}
 
 @router.post("/logout")
-def logout(current_user: User = Depends(get_current_user)):
+def logout(current_user: Principal = Depends(get_current_principal)):
     """Déconnecte l'utilisateur (côté client, suppression du token)"""
     return {"message": "Déconnexion réussie"}
 
-@router.get("/me", response_model=UserResponse)
 def read_users_me(current_user: User = Depends(get_current_user)):
     """Retourne les informations de l'utilisateur connecté"""
     return current_user
 
+async def read_users_me_async(current_user: User = Depends(get_current_user_async)):
+    """Retourne les informations de l'utilisateur connecté (moteur async, ASYNC_DB=true)"""
+    return current_user
+
+router.add_api_route(
+    "/me", read_users_me_async if settings.async_db else read_users_me,
+    methods=["GET"], response_model=UserResponse
+)
+
 @router.put("/me", response_model=UserResponse)
 def update_user_me(
     user_update: UserUpdate,
@@ -179,51 +164,53 @@ def update_user_me(
     db.refresh(current_user)
     return current_user
 
-@router.post("/me/avatar", response_model=UserResponse)
+AVATAR_MAX_BYTES = 2 * 1024 * 1024  # 2MB
+
+# Le corps est lu à la main (flux multipart) : décrire le champ pour la documentation
+AVATAR_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}}
+                }
+            }
+        }
+    }
+}
+
+@router.post("/me/avatar", response_model=UserResponse, openapi_extra=AVATAR_UPLOAD_OPENAPI)
 async def upload_avatar(
-    file: UploadFile = File(...),
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Upload une photo de profil"""
-    
-    # Validation du fichier
-    if not file.content_type in ["image/jpeg", "image/png", "image/jpg"]:
-        raise HTTPException(400, detail="Format de fichier non supporté (JPG/JPEG/PNG uniquement)")
-    
-    # Vérifier la taille (approximatif car on lit le stream)
-    content = await file.read()
-    if len(content) > 2 * 1024 * 1024: # 2MB
-        raise HTTPException(400, detail="La taille du fichier ne doit pas dépasser 2MB")
-        
-    await file.seek(0) # Rembobiner
-    
-    # Créer le dossier si nécessaire
-    upload_dir = "static/uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    # Générer un nom unique
-    file_ext = file.filename.split(".")[-1]
-    filename = f"{current_user.id}_{uuid.uuid4()}.{file_ext}"
-    file_path = os.path.join(upload_dir, filename)
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    # Supprimer l'ancienne photo si elle existe
-    if current_user.profile_picture:
-        # On suppose que profile_picture est stocké comme "/static/uploads/filename"
-        # On doit enlever le premier "/" pour avoir le chemin relatif
-        old_path = current_user.profile_picture.lstrip("/")
-        if os.path.exists(old_path):
-            os.remove(old_path)
-            
-    # Mettre à jour l'URL
-    current_user.profile_picture = f"/static/uploads/{filename}"
-    db.commit()
-    db.refresh(current_user)
-    
-    return current_user
+    """Upload une photo de profil (JPG/PNG, 2MB max)"""
+    
+    # Réception en flux vers un fichier temporaire, interrompue au-delà de la limite
+    try:
+        temp_path, _ = await receive_image(request, "file", avatars.UPLOAD_DIR, AVATAR_MAX_BYTES)
+    except UploadRejected as e:
+        raise HTTPException(400, detail=e.detail)
+    
+    def save_avatar():
+        # Vignettes stockées par empreinte ; l'ancienne photo n'est retirée qu'après le commit
+        profile_picture = store_avatar(temp_path)
+        old_picture = current_user.profile_picture
+        current_user.profile_picture = profile_picture
+        db.commit()
+        db.refresh(current_user)
+        remove_legacy_avatar(old_picture)
+        return current_user
+    
+    # Décodage, disque et base hors de la boucle d'événements
+    try:
+        return await run_in_threadpool(save_avatar)
+    except UploadRejected as e:
+        raise HTTPException(400, detail=e.detail)
 
 @router.delete("/me/avatar", response_model=UserResponse)
 def delete_avatar(
@@ -232,12 +219,10 @@ def delete_avatar(
 ):
     """Supprime la photo de profil"""
     if current_user.profile_picture:
-        old_path = current_user.profile_picture.lstrip("/")
-        if os.path.exists(old_path):
-            os.remove(old_path)
-        
+        old_picture = current_user.profile_picture
         current_user.profile_picture = None
         db.commit()
         db.refresh(current_user)
+        remove_legacy_avatar(old_picture)
         
     return current_user
@@ -2,59 +2,152 @@
 # FICHIER : backend/app/api/deps.py
 # ============================================
 
-from fastapi import Depends, HTTPException, status
+from contextlib import contextmanager
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.models import User
+from app.database import get_db, get_async_db
+from app.models.models import Player, User
 from app.core.security import decode_token
+from app.core.principal_cache import Principal, principal_cache
 
 security = HTTPBearer()
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Récupère l'utilisateur actuel depuis le token JWT"""
-    
+@contextmanager
+def open_db(request: Request):
+    """Session ouverte à la demande, via get_db (ou sa surcharge) hors injection de dépendances"""
+    session_factory = request.app.dependency_overrides.get(get_db, get_db)
+    sessions = session_factory()
+    try:
+        yield next(sessions)
+    finally:
+        sessions.close()
+
+def principal_statement(user_id: int):
+    """Rôle, activation, joueur et équipe de l'utilisateur, en une requête"""
+    return (
+        select(User.id, User.role, User.is_active, User.player_id, Player.team_id)
+        .outerjoin(Player, Player.id == User.player_id)
+        .where(User.id == user_id)
+    )
+
+def load_principal(db: Session, user_id: int):
+    """Principal de l'utilisateur, ou None s'il n'existe pas"""
+    row = db.execute(principal_statement(user_id)).first()
+    return Principal(*row) if row else None
+
+def token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    """Identifiant de l'utilisateur porté par le token, ou 401"""
+
     token = credentials.credentials
     payload = decode_token(token)
-    
+
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token invalide ou expiré"
         )
-    
+
     user_id = payload.get("sub")
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token invalide"
         )
-    
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None:
+
+    return int(user_id)
+
+def cache_principal(principal: Optional[Principal], version: tuple) -> Principal:
+    """
+    Principal lu en base : 401 s'il n'existe pas, sinon mis en cache
+    (version : principal_cache.version() relevée avant la lecture)
+    """
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Utilisateur introuvable"
         )
-    
-    if not user.is_active:
+    principal_cache.put(principal, version)
+    return principal
+
+def check_active(principal: Principal) -> Principal:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Compte désactivé"
         )
-    
+
+    return principal
+
+def get_current_principal(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
+    """
+    Identité de l'utilisateur actuel pour les contrôles d'accès.
+    Servie par le cache des principals : un succès n'ouvre aucune session.
+    """
+    user_id = token_user_id(credentials)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        version = principal_cache.version(user_id)
+        with open_db(request) as db:
+            principal = cache_principal(load_principal(db, user_id), version)
+    return check_active(principal)
+
+async def get_current_principal_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Équivalent de get_current_principal pour les routes async (aucun thread occupé)"""
+    user_id = token_user_id(credentials)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        version = principal_cache.version(user_id)
+        row = (await db.execute(principal_statement(user_id))).first()
+        principal = cache_principal(Principal(*row) if row else None, version)
+    return check_active(principal)
+
+def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+) -> User:
+    """Récupère l'utilisateur actuel (objet ORM) pour les routes qui le lisent ou le modifient"""
+
+    user = db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Utilisateur introuvable"
+        )
+
+    return user
+
+async def get_current_user_async(
+    principal: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Équivalent de get_current_user pour les routes async"""
+
+    user = await db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Utilisateur introuvable"
+        )
+
     return user
 
-def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+def get_current_admin(current_user: Principal = Depends(get_current_principal)) -> Principal:
     """Vérifie que l'utilisateur actuel est administrateur"""
-    
+
     if current_user.role != "ADMINISTRATEUR":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Droits administrateur requis"
         )
-    
+
     return current_user
@@ -2,170 +2,280 @@
 # FICHIER : backend/app/api/matches.py
 # ============================================
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload, contains_eager
+from typing import List, Optional, Tuple
+from pydantic import TypeAdapter
 from datetime import date, datetime, timedelta, timezone
 
-from app.database import get_db
-from app.models.models import Match, Event, Team, Player, User, MatchStatus
+from app.database import get_db, get_async_db
+from app.models.models import Match, Event, Team, Player, MatchStatus, search_key
+from app.core.config import settings
 from app.schemas.matches import MatchCreate, MatchUpdate, MatchResponse, TeamMatchInfo, PlayerMatchInfo
-from app.api.deps import get_current_user, get_current_admin
+from app.api.deps import get_current_principal, get_current_principal_async, get_current_admin
+from app.core.principal_cache import Principal
+from app.api.pagination import page_limit, decode_cursor, paginate
+from app.api.serialization import json_response
+from app.core.response_cache import serve_cached, serve_cached_async
+from app.services.scheduling import (
+    SlotConflict, reserve_slots, is_slot_conflict, find_court_conflict, slot_end, minutes_of
+)
 
 router = APIRouter()
 
-def map_match_to_response(match: Match) -> MatchResponse:
+MATCH_LIST = TypeAdapter(List[MatchResponse])
+MATCH_LIST_TAGS = ("matches", "events", "teams")
+
+def match_team_loaders(team1, team2, lean: bool = False) -> tuple:
+    """
+    Options de chargement des équipes d'un match.
+    Équipes en jointure (une ligne par match), joueurs en selectin (une requête pour
+    toutes les équipes) : le nombre de lignes lues reste linéaire.
+    """
+    if lean:
+        return (team1, team2)
+    return (team1.selectinload(Team.players), team2.selectinload(Team.players))
+
+def map_team_to_info(team: Team, lean: bool = False) -> TeamMatchInfo:
+    """En mode allégé, les joueurs ne sont ni chargés ni renvoyés"""
+    if lean:
+        return TeamMatchInfo(id=team.id, name=team.name, company=team.company, players=[])
+    return TeamMatchInfo.model_validate(team)
+
+def load_match(db: Session, match_id: int) -> Match:
+    """Match avec son événement, ses équipes et leurs joueurs, sans chargement paresseux"""
+    return db.scalars(
+        select(Match)
+        .where(Match.id == match_id)
+        .options(joinedload(Match.event), *match_team_loaders(joinedload(Match.team1), joinedload(Match.team2)))
+        .execution_options(populate_existing=True)
+    ).one()
+
+def map_match_to_response(match: Match, lean: bool = False, team_infos: Optional[dict] = None) -> MatchResponse:
+    """team_infos : TeamMatchInfo déjà construits, par id d'équipe, partagés entre les matchs d'une page"""
+    if team_infos is None:
+        team_infos = {}
+    for team in (match.team1, match.team2):
+        if team.id not in team_infos:
+            team_infos[team.id] = map_team_to_info(team, lean)
     return MatchResponse(
         id=match.id,
         date=match.event.date,
         time=match.event.start_time,
+        end_time=match.event.end_time,
         court_number=match.court_number,
         status=match.status,
         score_team1=match.score_team1,
         score_team2=match.score_team2,
-        team1=TeamMatchInfo.model_validate(match.team1),
-        team2=TeamMatchInfo.model_validate(match.team2)
+        team1=team_infos[match.team1_id],
+        team2=team_infos[match.team2_id]
     )
 
-@router.get("/", response_model=List[MatchResponse])
-def get_matches(
+def match_window(start_date: Optional[date], end_date: Optional[date]) -> Tuple[date, date]:
+    """Période de GET /matches (défaut : aujourd'hui -> +30 jours)"""
+    if not start_date:
+        start_date = date.today()
+    if not end_date:
+        end_date = start_date + timedelta(days=30)
+    return start_date, end_date
+
+def matches_statement(
+    current_user: Principal,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     all_matches: bool = False,
     company: Optional[str] = None,
     pool_id: Optional[int] = None,
     status_filter: Optional[MatchStatus] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    lean: bool = False,
+    cursor: Optional[str] = None,
+    page_size: int = settings.max_page_size
 ):
     """
-    Récupère la liste des matchs avec filtres.
-    Par défaut : 30 prochains jours.
-    Pour les joueurs : uniquement leurs matchs sauf si all_matches=True.
+    Requête de GET /matches (partagée par les versions sync et async),
+    ou None si l'utilisateur ne peut voir aucun match.
     """
-    query = db.query(Match).join(Event).join(Team, Match.team1_id == Team.id).options(
-        joinedload(Match.event),
-        joinedload(Match.team1).joinedload(Team.players),
-        joinedload(Match.team2).joinedload(Team.players)
+    query = select(Match).join(Match.event).options(
+        contains_eager(Match.event),
+        *match_team_loaders(joinedload(Match.team1), joinedload(Match.team2), lean)
     )
 
-    # Filtre date (défaut : aujourd'hui -> +30 jours)
-    if not start_date:
-        start_date = date.today()
-    if not end_date:
-        end_date = start_date + timedelta(days=30)
-    
-    query = query.filter(Event.date >= start_date, Event.date <= end_date)
+    start_date, end_date = match_window(start_date, end_date)
+    query = query.where(Event.date >= start_date, Event.date <= end_date)
 
     # Filtres Admin / Options
     if company:
-        # On cherche si l'une des équipes est de cette entreprise
-        # Note: Cela suppose que Team a un champ company.
-        # Il faut faire une jointure ou un OR.
-        # Déjà joint sur Team1, il faudrait aussi vérifier Team2.
-        # Simplification : on filtre sur les équipes chargées
-        # query = query.join(Team, Match.team2_id == Team.id, aliased=True) # Compliqué avec SQLAlchemy simple
-        # On va faire plus simple : filter sur team1.company OR team2.company
-        # Mais on a déjà join Team pour team1.
-        pass # TODO: Implémenter filtre complexe si nécessaire, pour l'instant on filtre en Python ou on améliore la query
+        # Équipes dont le nom ou l'entreprise correspond (insensible à la casse, Unicode
+        # compris, via les colonnes indexées name_key / company_key)
+        key = search_key(company)
+        team_ids = select(Team.id).where((Team.name_key == key) | (Team.company_key == key))
+        query = query.where(Match.team1_id.in_(team_ids) | Match.team2_id.in_(team_ids))
 
     if pool_id:
-        query = query.filter((Match.team1.has(pool_id=pool_id)) | (Match.team2.has(pool_id=pool_id)))
+        query = query.where((Match.team1.has(pool_id=pool_id)) | (Match.team2.has(pool_id=pool_id)))
 
     if status_filter:
-        query = query.filter(Match.status == status_filter)
+        query = query.where(Match.status == status_filter)
 
     # Filtre Joueur (si pas admin et pas all_matches)
     if current_user.role != "ADMINISTRATEUR" and not all_matches:
-        if not current_user.player:
+        if not current_user.player_id:
              # Si l'utilisateur n'est pas lié à un joueur, il ne voit rien par défaut ?
              # Ou on lui montre tout ? Disons qu'il voit tout s'il n'est pas joueur.
              pass
         else:
-            player_id = current_user.player.id
             # Matchs où le joueur est dans team1 ou team2
             # C'est complexe à exprimer en pure query sans alias multiples.
             # On peut filtrer sur les IDs d'équipe du joueur.
-            if current_user.player.team_id:
-                team_id = current_user.player.team_id
-                query = query.filter((Match.team1_id == team_id) | (Match.team2_id == team_id))
+            if current_user.team_id:
+                team_id = current_user.team_id
+                query = query.where((Match.team1_id == team_id) | (Match.team2_id == team_id))
             else:
                 # Joueur sans équipe -> pas de matchs
-                return []
+                return None
 
-    matches = query.order_by(Event.date, Event.start_time).all()
-    
-    # Filtrage Python pour 'company' si nécessaire car la query est complexe
-    if company:
-        company_lower = company.lower()
-        # On filtre sur le nom de l'équipe OU l'entreprise des joueurs
-        matches = [
-            m for m in matches 
-            if company_lower in m.team1.name.lower() 
-            or company_lower in m.team2.name.lower()
-            or any(company_lower in p.company.lower() for p in m.team1.players)
-            or any(company_lower in p.company.lower() for p in m.team2.players)
-        ]
-
-    return [map_match_to_response(m) for m in matches]
+    if cursor:
+        query = query.where(tuple_(Event.date, Event.start_time, Match.id) > decode_cursor(cursor))
+
+    return query.order_by(Event.date, Event.start_time, Match.id).limit(page_size + 1)
+
+def matches_page(matches: list, page_size: int, response: Response, lean: bool) -> Response:
+    matches = paginate(matches, page_size, response, lambda m: (m.event.date, m.event.start_time, m.id))
+    team_infos = {}
+    return json_response(MATCH_LIST, [map_match_to_response(m, lean, team_infos) for m in matches], response)
+
+def user_scope(current_user: Principal) -> tuple:
+    """Ce dont dépend la liste des matchs d'un utilisateur (clé du cache de réponses)"""
+    return current_user.role, current_user.player_id is not None, current_user.team_id
+
+def get_matches(
+    request: Request,
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    all_matches: bool = False,
+    company: Optional[str] = None,
+    pool_id: Optional[int] = None,
+    status_filter: Optional[MatchStatus] = None,
+    lean: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Récupère la liste des matchs avec filtres.
+    Par défaut : 30 prochains jours.
+    Pour les joueurs : uniquement leurs matchs sauf si all_matches=True.
+    lean=True : équipes renvoyées sans leurs joueurs (pas de jointure sur players).
+    Pagination par curseur : si la page est pleine, l'en-tête X-Next-Cursor
+    donne la valeur de `cursor` pour la page suivante.
+    Réponse mise en cache (ETag, 304) jusqu'à la prochaine écriture sur les matchs.
+    """
+    page_size = page_limit(limit)
+    # Période résolue dans la clé : la période par défaut change à minuit
+    start_date, end_date = match_window(start_date, end_date)
+
+    def build():
+        query = matches_statement(
+            current_user, start_date, end_date, all_matches, company, pool_id, status_filter, lean, cursor, page_size
+        )
+        return matches_page(db.scalars(query).all() if query is not None else [], page_size, response, lean)
+
+    return serve_cached(request, MATCH_LIST_TAGS, build, (user_scope(current_user), start_date, end_date))
+
+async def get_matches_async(
+    request: Request,
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    all_matches: bool = False,
+    company: Optional[str] = None,
+    pool_id: Optional[int] = None,
+    status_filter: Optional[MatchStatus] = None,
+    lean: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    """
+    Récupère la liste des matchs avec filtres (moteur async, ASYNC_DB=true).
+    Mêmes paramètres et même réponse que la version synchrone.
+    """
+    page_size = page_limit(limit)
+    start_date, end_date = match_window(start_date, end_date)
+
+    async def build():
+        query = matches_statement(
+            current_user, start_date, end_date, all_matches, company, pool_id, status_filter, lean, cursor, page_size
+        )
+        return matches_page((await db.scalars(query)).all() if query is not None else [], page_size, response, lean)
+
+    return await serve_cached_async(request, MATCH_LIST_TAGS, build, (user_scope(current_user), start_date, end_date))
+
+router.add_api_route(
+    "/", get_matches_async if settings.async_db else get_matches,
+    methods=["GET"], response_model=List[MatchResponse]
+)
 
 @router.post("/", response_model=MatchResponse)
 def create_match(
     match_in: MatchCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """Crée un nouveau match (Admin uniquement)"""
     
-    # Vérifier disponibilité piste/créneau
-    # On cherche s'il existe un match sur le même créneau et la même piste
-    # Créneau = Event.date + Event.start_time
-    # On suppose durée standard ou on vérifie juste le début pour l'instant
-    
-    existing_match = db.query(Match).join(Event).filter(
-        Event.date == match_in.date,
-        Event.start_time == match_in.time,
-        Match.court_number == match_in.court_number,
-        Match.status != MatchStatus.ANNULE
-    ).first()
-    
-    if existing_match:
-        raise HTTPException(
-            status_code=400,
-            detail="Un match est déjà prévu sur cette piste à ce créneau"
-        )
+    try:
+        end_time = slot_end(match_in.time, match_in.duration_minutes)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
-    # Créer l'événement
-    # TODO: Gérer la durée (end_time). Pour l'instant on met null ou +1h30
     event = Event(
         date=match_in.date,
-        start_time=match_in.time
+        start_time=match_in.time,
+        end_time=end_time
     )
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    
-    # Créer le match
     match = Match(
-        event_id=event.id,
+        event=event,
         court_number=match_in.court_number,
         team1_id=match_in.team1_id,
         team2_id=match_in.team2_id,
-        status=MatchStatus.A_VENIR
+        status=MatchStatus.A_VENIR,
+        slot_date=match_in.date,
+        slot_time=match_in.time,
+        slot_end_time=end_time
     )
     
-    db.add(match)
+    try:
+        with reserve_slots(db):
+            db.add(match)
+            db.flush()
+            court = find_court_conflict(db, match_in.date, match_in.time, end_time,
+                                        [match_in.court_number], exclude_event_id=event.id)
+            if court is not None:
+                raise SlotConflict(court)
+            match_id = match.id
+    except SlotConflict:
+        raise HTTPException(
+            status_code=400,
+            detail="Un match est déjà prévu sur cette piste à ce créneau"
+        )
+    
     db.commit()
-    db.refresh(match)
     
-    return map_match_to_response(match)
+    return map_match_to_response(load_match(db, match_id))
 
 @router.put("/{match_id}", response_model=MatchResponse)
 def update_match(
     match_id: int,
     match_in: MatchUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """Modifie un match (Admin uniquement)"""
     
@@ -178,26 +288,17 @@ def update_match(
         if match.status != MatchStatus.A_VENIR:
             raise HTTPException(400, "Impossible de modifier la date/piste d'un match terminé ou annulé")
             
-        # Vérifier disponibilité si changement
-        new_date = match_in.date or match.event.date
-        new_time = match_in.time or match.event.start_time
-        new_court = match_in.court_number or match.court_number
-        
-        if (new_date != match.event.date or 
-            new_time != match.event.start_time or 
-            new_court != match.court_number):
-            
-            conflict = db.query(Match).join(Event).filter(
-                Event.date == new_date,
-                Event.start_time == new_time,
-                Match.court_number == new_court,
-                Match.id != match_id,
-                Match.status != MatchStatus.ANNULE
-            ).first()
-            
-            if conflict:
-                raise HTTPException(400, "Créneau indisponible")
-                
+        # La disponibilité du nouveau créneau est vérifiée après le flush, avant le commit
+        if match_in.time:
+            # Décaler l'heure de fin en conservant la durée du match
+            event = match.event
+            duration = settings.match_duration_minutes
+            if event.end_time:
+                duration = minutes_of(event.end_time) - minutes_of(event.start_time)
+            try:
+                event.end_time = slot_end(match_in.time, duration)
+            except ValueError as e:
+                raise HTTPException(400, str(e))
         if match_in.date: match.event.date = match_in.date
         if match_in.time: match.event.start_time = match_in.time
         if match_in.court_number: match.court_number = match_in.court_number
@@ -230,15 +331,30 @@ def update_match(
         if match_in.score_team2 is not None:
             match.score_team2 = match_in.score_team2
         
+    # Vérifier le créneau si le match a bougé ou redevient actif
+    check_slot = bool(match_in.date or match_in.time or match_in.court_number) or match_in.status == MatchStatus.A_VENIR
+    try:
+        db.flush()  # L'index unique rejette un même départ
+        if check_slot and match.status != MatchStatus.ANNULE:
+            event = match.event
+            courts = [m.court_number for m in event.matches if m.status != MatchStatus.ANNULE]
+            if find_court_conflict(db, event.date, event.start_time, event.end_time,
+                                   courts, exclude_event_id=event.id) is not None:
+                raise SlotConflict()
+    except (IntegrityError, SlotConflict) as e:
+        db.rollback()
+        if isinstance(e, IntegrityError) and not is_slot_conflict(e):
+            raise
+        raise HTTPException(400, "Créneau indisponible")
+
     db.commit()
-    db.refresh(match)
-    return map_match_to_response(match)
+    return map_match_to_response(load_match(db, match_id))
 
 @router.delete("/{match_id}")
 def delete_match(
     match_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """Supprime un match (Admin uniquement)"""
     
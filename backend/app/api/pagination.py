@@ -0,0 +1,41 @@
+# ============================================
+# FICHIER : backend/app/api/pagination.py
+# ============================================
+
+import base64
+import json
+from datetime import date, time
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def page_limit(limit: Optional[int]) -> int:
+    """Taille de page effective, plafonnée par la configuration"""
+    return min(limit or settings.max_page_size, settings.max_page_size)
+
+def encode_cursor(day: date, start_time: time, row_id: int) -> str:
+    """Curseur opaque sur la clé de tri (date, heure, id)"""
+    raw = json.dumps([day.isoformat(), start_time.isoformat(), row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    """Retourne (date, heure, id) ou lève une 400 si le curseur est invalide"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        day, start_time, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(day), time.fromisoformat(start_time), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Curseur de pagination invalide")
+
+def paginate(rows: list, limit: int, response: Response, key) -> list:
+    """
+    Tronque une page chargée avec limit + 1 lignes et pose l'en-tête du curseur suivant.
+    key(row) retourne la clé de tri (date, heure, id) d'une ligne.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
@@ -2,45 +2,90 @@
 # FICHIER : backend/app/api/planning.py
 # ============================================
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional, Tuple
+from pydantic import TypeAdapter
 from datetime import date, timedelta
 
-from app.database import get_db
+from app.core.config import settings
+from app.database import get_db, get_async_db
 from app.models.models import Event, Match, MatchStatus, Team
-from app.schemas.planning import EventCreate, EventResponse
-from app.api.deps import get_current_user, get_current_admin
-from app.models.models import User
+from app.schemas.planning import (
+    EventCreate, EventResponse, MatchInEventResponse,
+    BulkPlanningCreate, BulkPlanningResponse, BulkItemError
+)
+from app.api.deps import get_current_principal, get_current_principal_async, get_current_admin
+from app.core.principal_cache import Principal
+from app.api.pagination import page_limit, decode_cursor, paginate
+from app.api.serialization import json_response
+from app.core.response_cache import serve_cached, serve_cached_async
+from app.api.matches import map_team_to_info, match_team_loaders
+from app.services.scheduling import SlotConflict, reserve_slots, find_court_conflict, slot_end, bulk_create_events
 
 router = APIRouter()
 
-@router.get("/", response_model=List[EventResponse])
-def get_events(
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Récupère le planning des événements.
-    """
+EVENT_LIST = TypeAdapter(List[EventResponse])
+EVENT_LIST_TAGS = ("events", "matches", "teams")
+
+def event_loaders(lean: bool = False) -> tuple:
+    """Matchs d'un événement en selectin, puis équipes et joueurs comme dans /matches"""
+    matches = selectinload(Event.matches)
+    return match_team_loaders(matches.joinedload(Match.team1), matches.joinedload(Match.team2), lean)
+
+def map_event_to_response(event: Event, lean: bool = False) -> EventResponse:
+    return EventResponse(
+        id=event.id,
+        date=event.date,
+        start_time=event.start_time,
+        end_time=event.end_time,
+        matches=[
+            MatchInEventResponse(
+                id=m.id,
+                court_number=m.court_number,
+                status=m.status,
+                score_team1=m.score_team1,
+                score_team2=m.score_team2,
+                team1=map_team_to_info(m.team1, lean),
+                team2=map_team_to_info(m.team2, lean)
+            )
+            for m in event.matches
+        ]
+    )
+
+def event_window(start_date: Optional[date], end_date: Optional[date]) -> Tuple[date, date]:
+    """Période de GET /planning (défaut : début du mois courant -> fin du mois suivant)"""
     if not start_date:
         start_date = date.today().replace(day=1) # Début du mois courant
     if not end_date:
         # Fin du mois suivant par défaut pour avoir une bonne vue
         next_month = start_date.replace(day=28) + timedelta(days=4)
         end_date = (next_month.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start_date, end_date
 
-    query = db.query(Event).options(
-        joinedload(Event.matches).joinedload(Match.team1).joinedload(Team.players),
-        joinedload(Event.matches).joinedload(Match.team2).joinedload(Team.players)
-    ).filter(
+def events_statement(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    lean: bool = False,
+    cursor: Optional[str] = None,
+    page_size: int = settings.max_page_size
+):
+    """Requête de GET /planning (partagée par les versions sync et async)"""
+    start_date, end_date = event_window(start_date, end_date)
+    query = select(Event).options(*event_loaders(lean)).where(
         Event.date >= start_date,
         Event.date <= end_date
-    ).order_by(Event.date, Event.start_time)
+    )
+
+    if cursor:
+        query = query.where(tuple_(Event.date, Event.start_time, Event.id) > decode_cursor(cursor))
 
-    events = query.all()
+    return query.order_by(Event.date, Event.start_time, Event.id).limit(page_size + 1)
+
+def events_page(events: list, page_size: int, response: Response, lean: bool) -> Response:
+    events = paginate(events, page_size, response, lambda e: (e.date, e.start_time, e.id))
     
     # Filtrage pour les joueurs : voir seulement leurs événements ?
     # Requirement 2.3.5: "Voir uniquement les événements où ils sont impliqués (filtre automatique)"
@@ -50,69 +95,152 @@ def get_events(
     # Le requirement dit "Option pour voir tous les événements", donc l'API doit pouvoir tout renvoyer.
     # On va tout renvoyer par défaut et laisser le front filtrer, sauf si c'est trop lourd.
     # Vu la taille probable, tout renvoyer est OK.
-    
-    return events
+
+    if lean:
+        return json_response(EVENT_LIST, [map_event_to_response(e, lean=True) for e in events], response)
+    return json_response(EVENT_LIST, events, response, from_orm=True)
+
+def get_events(
+    request: Request,
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    lean: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Récupère le planning des événements.
+    lean=True : équipes renvoyées sans leurs joueurs (pas de jointure sur players).
+    Pagination par curseur : si la page est pleine, l'en-tête X-Next-Cursor
+    donne la valeur de `cursor` pour la page suivante.
+    Réponse mise en cache (ETag, 304) jusqu'à la prochaine écriture sur le planning.
+    """
+    page_size = page_limit(limit)
+    # Période résolue dans la clé : la période par défaut change avec le mois
+    start_date, end_date = event_window(start_date, end_date)
+
+    def build():
+        events = db.scalars(events_statement(start_date, end_date, lean, cursor, page_size)).all()
+        return events_page(events, page_size, response, lean)
+
+    return serve_cached(request, EVENT_LIST_TAGS, build, (start_date, end_date))
+
+async def get_events_async(
+    request: Request,
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    lean: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    """
+    Récupère le planning des événements (moteur async, ASYNC_DB=true).
+    Mêmes paramètres et même réponse que la version synchrone.
+    """
+    page_size = page_limit(limit)
+    start_date, end_date = event_window(start_date, end_date)
+
+    async def build():
+        events = (await db.scalars(events_statement(start_date, end_date, lean, cursor, page_size))).all()
+        return events_page(events, page_size, response, lean)
+
+    return await serve_cached_async(request, EVENT_LIST_TAGS, build, (start_date, end_date))
+
+router.add_api_route(
+    "/", get_events_async if settings.async_db else get_events,
+    methods=["GET"], response_model=List[EventResponse]
+)
 
 @router.post("/", response_model=EventResponse)
 def create_event(
     event_in: EventCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """Crée un événement avec ses matchs (Admin uniquement)"""
     
-    # 1. Vérifier conflits de pistes
-    requested_courts = [m.court_number for m in event_in.matches]
-    
-    conflicts = db.query(Match).join(Event).filter(
-        Event.date == event_in.date,
-        Event.start_time == event_in.start_time,
-        Match.court_number.in_(requested_courts),
-        Match.status != MatchStatus.ANNULE
-    ).first()
-    
-    if conflicts:
-        raise HTTPException(
-            status_code=400,
-            detail=f"La piste {conflicts.court_number} est déjà occupée à ce créneau"
-        )
+    try:
+        end_time = slot_end(event_in.start_time, event_in.duration_minutes)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
-    # 2. Créer l'événement
     event = Event(
         date=event_in.date,
-        start_time=event_in.start_time
+        start_time=event_in.start_time,
+        end_time=end_time
     )
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    
-    # 3. Créer les matchs
-    for match_in in event_in.matches:
-        match = Match(
-            event_id=event.id,
+    event.matches = [
+        Match(
             court_number=match_in.court_number,
             team1_id=match_in.team1_id,
             team2_id=match_in.team2_id,
-            status=MatchStatus.A_VENIR
+            status=MatchStatus.A_VENIR,
+            slot_date=event_in.date,
+            slot_time=event_in.start_time,
+            slot_end_time=end_time
+        )
+        for match_in in event_in.matches
+    ]
+    courts = [m.court_number for m in event_in.matches]
+    
+    # Événement et matchs insérés puis vérifiés (départ identique ou chevauchement)
+    # dans un même savepoint, en une seule transaction
+    try:
+        with reserve_slots(db):
+            db.add(event)
+            db.flush()
+            court = find_court_conflict(db, event_in.date, event_in.start_time, end_time,
+                                        courts, exclude_event_id=event.id)
+            if court is not None:
+                raise SlotConflict(court)
+    except SlotConflict as e:
+        # Violation de l'index unique : retrouver la piste pour le message
+        court = e.court or find_court_conflict(db, event_in.date, event_in.start_time, end_time, courts)
+        raise HTTPException(
+            status_code=400,
+            detail=f"La piste {court} est déjà occupée à ce créneau"
         )
-        db.add(match)
     
     db.commit()
-    db.refresh(event)
     
-    # Recharger avec les relations pour la réponse
-    # (Astuce: on peut refaire une query ou laisser SQLAlchemy lazy loader, 
-    # mais joinedload est mieux pour la perf si on renvoie tout)
-    return db.query(Event).options(
-        joinedload(Event.matches).joinedload(Match.team1),
-        joinedload(Event.matches).joinedload(Match.team2)
-    ).filter(Event.id == event.id).first()
+    # Recharger avec les relations pour la réponse (joueurs compris, sans lazy load)
+    return db.query(Event).options(*event_loaders()).filter(Event.id == event.id).first()
+
+@router.post("/bulk", response_model=BulkPlanningResponse)
+def create_events_bulk(
+    bulk_in: BulkPlanningCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    Crée un lot d'événements avec leurs matchs en une transaction (Admin uniquement).
+    Les événements en conflit sont ignorés et listés dans `errors` ;
+    avec all_or_nothing, la moindre erreur annule tout le lot.
+    """
+    try:
+        event_ids, errors = bulk_create_events(db, bulk_in.events, bulk_in.all_or_nothing)
+    except SlotConflict:
+        raise HTTPException(409, "Le planning a changé pendant l'import, veuillez réessayer")
+
+    db.commit()
+
+    return BulkPlanningResponse(
+        created=len(event_ids),
+        event_ids=event_ids,
+        errors=[BulkItemError(index=i, detail=detail) for i, detail in errors]
+    )
 
 @router.delete("/{event_id}")
 def delete_event(
     event_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """Supprime un événement (Admin uniquement)"""
     event = db.query(Event).filter(Event.id == event_id).first()
@@ -2,14 +2,19 @@
 # FICHIER : backend/app/api/results.py
 # ============================================
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from typing import List
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
-from app.database import get_db
-from app.models.models import Match, MatchStatus, Team
-from app.api.deps import get_current_user
+from app.core.config import settings
+from app.database import get_db, get_async_db
+from app.models.models import Team, TeamStanding
+from app.api.deps import get_current_principal, get_current_principal_async
+from app.api.serialization import json_response
+from app.core.response_cache import serve_cached, serve_cached_async
 
 router = APIRouter()
 
@@ -24,113 +29,59 @@ class RankingEntry(BaseModel):
     sets_won: int
     sets_lost: int
 
-@router.get("/ranking", response_model=List[RankingEntry])
-def get_ranking(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+RANKING = TypeAdapter(List[RankingEntry])
+RANKING_TAGS = ("ranking", "teams")
+
+def ranking_statement():
+    """Classement trié : Points DESC, Victoires DESC, Diff Sets DESC, Nom ASC"""
+    return (
+        select(
+            Team.name.label("team_name"),
+            func.coalesce(Team.company, "Inconnu").label("company"),
+            TeamStanding.matches_played,
+            TeamStanding.wins,
+            TeamStanding.losses,
+            TeamStanding.points,
+            TeamStanding.sets_won,
+            TeamStanding.sets_lost,
+        )
+        .join(Team, Team.id == TeamStanding.team_id)
+        .order_by(
+            TeamStanding.points.desc(),
+            TeamStanding.wins.desc(),
+            (TeamStanding.sets_won - TeamStanding.sets_lost).desc(),
+            Team.name,
+        )
+    )
+
+def ranking_entries(rows) -> List[RankingEntry]:
+    return [
+        RankingEntry(position=i + 1, **row._mapping)
+        for i, row in enumerate(rows)
+    ]
+
+def get_ranking(request: Request, db: Session = Depends(get_db), current_user = Depends(get_current_principal)):
     """
-    Calcule et retourne le classement général des équipes.
+    Retourne le classement général des équipes.
+    Les statistiques sont maintenues dans team_standings à chaque écriture sur un match :
+    la lecture se résume à un ORDER BY, mise en cache (ETag, 304) jusqu'à la suivante.
     """
-    # Récupérer tous les matchs terminés
-    matches = db.query(Match).options(
-        joinedload(Match.team1),
-        joinedload(Match.team2)
-    ).filter(Match.status == MatchStatus.TERMINE).all()
-    
-    # Récupérer toutes les équipes pour initialiser le classement
-    teams = db.query(Team).options(joinedload(Team.players)).all()
-    
-    stats = {} # team_id -> {team_name, company, played, wins, losses, points, sets_won, sets_lost}
-    
-    for team in teams:
-        company = team.players[0].company if team.players else "Inconnu"
-        stats[team.id] = {
-            "team_name": team.name,
-            "company": company,
-            "matches_played": 0,
-            "wins": 0,
-            "losses": 0,
-            "points": 0,
-            "sets_won": 0,
-            "sets_lost": 0
-        }
-        
-    for match in matches:
-        if not match.score_team1:
-            continue
-            
-        try:
-            sets = match.score_team1.split(", ")
-            t1_sets = 0
-            t2_sets = 0
-            
-            for s in sets:
-                g1, g2 = map(int, s.split("-"))
-                if g1 > g2:
-                    t1_sets += 1
-                else:
-                    t2_sets += 1
-            
-            # Déterminer le vainqueur du match
-            winner_id = None
-            loser_id = None
-            
-            if t1_sets > t2_sets:
-                winner_id = match.team1_id
-                loser_id = match.team2_id
-            else:
-                winner_id = match.team2_id
-                loser_id = match.team1_id
-                
-            # Mise à jour stats Team 1
-            if match.team1_id in stats:
-                stats[match.team1_id]["matches_played"] += 1
-                stats[match.team1_id]["sets_won"] += t1_sets
-                stats[match.team1_id]["sets_lost"] += t2_sets
-                if match.team1_id == winner_id:
-                    stats[match.team1_id]["wins"] += 1
-                    stats[match.team1_id]["points"] += 3
-                else:
-                    stats[match.team1_id]["losses"] += 1
-            
-            # Mise à jour stats Team 2
-            if match.team2_id in stats:
-                stats[match.team2_id]["matches_played"] += 1
-                stats[match.team2_id]["sets_won"] += t2_sets
-                stats[match.team2_id]["sets_lost"] += t1_sets
-                if match.team2_id == winner_id:
-                    stats[match.team2_id]["wins"] += 1
-                    stats[match.team2_id]["points"] += 3
-                else:
-                    stats[match.team2_id]["losses"] += 1
-                    
-        except ValueError:
-            continue # Ignorer les scores mal formés
-            
-    # Convertir en liste et trier
-    ranking = []
-    for team_id, data in stats.items():
-        ranking.append(data)
-        
-    # Tri : Points DESC, Victoires DESC, Diff Sets DESC, Nom ASC
-    ranking.sort(key=lambda x: (
-        -x["points"],
-        -x["wins"],
-        -(x["sets_won"] - x["sets_lost"]),
-        x["team_name"]
-    ))
-    
-    # Assigner les positions
-    result = []
-    for i, data in enumerate(ranking):
-        result.append(RankingEntry(
-            position=i + 1,
-            team_name=data["team_name"],
-            company=data["company"],
-            matches_played=data["matches_played"],
-            wins=data["wins"],
-            losses=data["losses"],
-            points=data["points"],
-            sets_won=data["sets_won"],
-            sets_lost=data["sets_lost"]
-        ))
-        
-    return result
+    return serve_cached(
+        request, RANKING_TAGS, lambda: json_response(RANKING, ranking_entries(db.execute(ranking_statement()).all()))
+    )
+
+async def get_ranking_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_principal_async)
+):
+    """Classement général des équipes (moteur async, ASYNC_DB=true)"""
+    async def build():
+        return json_response(RANKING, ranking_entries((await db.execute(ranking_statement())).all()))
+
+    return await serve_cached_async(request, RANKING_TAGS, build)
+
+router.add_api_route(
+    "/ranking", get_ranking_async if settings.async_db else get_ranking,
+    methods=["GET"], response_model=List[RankingEntry]
+)
@@ -0,0 +1,24 @@
+# ============================================
+# FICHIER : backend/app/api/serialization.py
+# ============================================
+
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+def json_response(adapter: TypeAdapter, content: Any, response: Optional[Response] = None,
+                  from_orm: bool = False) -> Response:
+    """
+    Réponse JSON encodée en une passe par le sérialiseur de pydantic (TypeAdapter créé une
+    fois au niveau du module), sans la seconde validation de response_model ni le passage
+    par jsonable_encoder et json.dumps. Octets identiques à la réponse FastAPI standard.
+
+    from_orm=True : `content` contient des objets ORM, validés une seule fois.
+    `response` : en-têtes posés sur la réponse injectée dans la route (ex : X-Next-Cursor),
+    que FastAPI ne reporte pas sur une Response renvoyée directement.
+    """
+    if from_orm:
+        content = adapter.validate_python(content, from_attributes=True)
+    headers = dict(response.headers) if response is not None else None
+    return Response(adapter.dump_json(content, by_alias=True), media_type="application/json", headers=headers)
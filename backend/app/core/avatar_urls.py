@@ -0,0 +1,24 @@
+# ============================================
+# FICHIER : backend/app/core/avatar_urls.py
+# ============================================
+# URL des photos de profil stockées par empreinte : utilisées par les schémas
+# (tailles renvoyées au client) et par le stockage (app.services.avatars).
+
+import re
+from typing import Dict, Optional
+
+UPLOAD_URL_PREFIX = "/static/uploads/"
+AVATAR_URL_PREFIX = UPLOAD_URL_PREFIX + "avatars/"
+AVATAR_SIZES = (64, 128, 256)
+
+_VARIANT = re.compile(r"^/static/uploads/avatars/([0-9a-f]{64})-(\d+)\.webp$")
+
+def avatar_url(digest: str, size: int) -> str:
+    return f"{AVATAR_URL_PREFIX}{digest}-{size}.webp"
+
+def avatar_variants(profile_picture: Optional[str]) -> Dict[int, str]:
+    """URL de chaque taille pour une photo stockée par empreinte (vide pour les anciennes photos)"""
+    match = _VARIANT.match(profile_picture or "")
+    if not match:
+        return {}
+    return {size: avatar_url(match.group(1), size) for size in AVATAR_SIZES}
@@ -0,0 +1,165 @@
+# ============================================
+# FICHIER : backend/app/core/compression.py
+# ============================================
+
+import zlib
+from typing import Iterable, Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # Optionnel : sans le paquet brotli, gzip seul
+    brotli = None
+
+# Par ordre de préférence du serveur, à qualité égale côté client
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/javascript", "application/xml", "image/svg+xml", "text/",
+)
+
+def negotiate(accept_encoding: Optional[str], available: Iterable[str] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    """
+    Encodage à utiliser d'après Accept-Encoding (valeurs q comprises, "*" pour les autres),
+    ou None pour une réponse non compressée
+    """
+    if not accept_encoding:
+        return None
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[coding.strip().lower()] = q
+    default = qualities.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in available:  # Ordre du serveur : départage les qualités égales
+        q = qualities.get(coding, default)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+class _Compressor:
+    """Compression en flux (gzip ou brotli) ; chaque appel rend les octets déjà produits"""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.compression_brotli_quality)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self._brotli is not None:
+            out = self._brotli.process(data)
+            return out + self._brotli.finish() if final else out + self._brotli.flush()
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+    async def run(self, data: bytes, final: bool) -> bytes:
+        """Les gros blocs sont compressés dans un thread, sans bloquer la boucle d'événements"""
+        if len(data) >= settings.compression_thread_min_size:
+            return await anyio.to_thread.run_sync(self.compress, data, final)
+        return self.compress(data, final)
+
+def is_compressible(headers: Headers) -> bool:
+    return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag d'une représentation compressée : "abc" -> "abc-gzip" (reste fort : autres octets, autre ETag)"""
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return f"{etag}-{encoding}"
+
+def strip_encoding(etag: str) -> str:
+    """ETag de la représentation non compressée, suffixe d'encodage retiré"""
+    for encoding in ("br", "gzip"):
+        for suffix in (f'-{encoding}"', f"-{encoding}"):
+            if etag.endswith(suffix):
+                return etag[:-len(suffix)] + suffix[len(encoding) + 1:]
+    return etag
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI pur : compresse en gzip ou brotli (selon Accept-Encoding) les réponses
+    JSON et texte d'au moins COMPRESSION_MIN_SIZE octets. Les réponses en flux (fichiers)
+    sont compressées bloc par bloc ; les réponses déjà encodées (fichiers statiques
+    précompressés), partielles (206) ou vides passent telles quelles.
+
+    Une réponse compressée garde un ETag fort, suffixé par l'encodage. Un 304 ne passe
+    pas par la compression : il reprend le suffixe si le client revalide la
+    représentation compressée qu'il a reçue.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or settings.compression_min_size <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate(request_headers.get("accept-encoding"))
+        start = None
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                start = message  # Retenu jusqu'au premier bloc : la décision dépend de sa taille
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if start is None:  # Blocs suivants d'une réponse en flux
+                if compressor is not None:
+                    more_body = message.get("more_body", False)
+                    body = await compressor.run(message.get("body", b""), final=not more_body)
+                    message = {"type": "http.response.body", "body": body, "more_body": more_body}
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            etag = headers.get("etag")
+            if start["status"] == 304 and etag and encoding is not None:
+                revalidated = encoded_etag(etag, encoding)
+                if revalidated in (tag.strip() for tag in request_headers.get("if-none-match", "").split(",")):
+                    headers["ETag"] = revalidated
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            eligible = (
+                200 <= start["status"] < 300 and start["status"] not in (204, 206)
+                and "content-encoding" not in headers and is_compressible(headers)
+            )
+            if eligible:
+                headers.add_vary_header("Accept-Encoding")
+                size = len(body) if not more_body else int(headers.get("content-length", settings.compression_min_size))
+                if encoding is None or size < settings.compression_min_size:
+                    eligible = False
+            if eligible:
+                compressor = _Compressor(encoding)
+                body = await compressor.run(body, final=not more_body)
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["content-length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                if etag:  # Autres octets : autre ETag
+                    headers["ETag"] = encoded_etag(etag, encoding)
+                message = {"type": "http.response.body", "body": body, "more_body": more_body}
+
+            await send({**start, "headers": headers.raw})
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./padel_corpo.db"
@@ -8,6 +8,35 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 1440
     allowed_origins: str = "http://localhost:5173"
     testing: bool = False
+    match_duration_minutes: int = 90  # Durée d'un match quand elle n'est pas précisée
+    max_page_size: int = 500  # Nombre maximum d'éléments par page sur /matches et /planning
+    principal_cache_size: int = 10000  # Utilisateurs gardés en cache pour l'authentification
+    principal_cache_ttl_seconds: float = 60  # Durée de vie d'une entrée (0 = pas de cache)
+    response_cache_size: int = 256  # Réponses de /matches, /planning et /results/ranking gardées en cache
+    response_cache_ttl_seconds: float = 300  # Durée de vie d'une entrée (0 = pas de cache)
+    single_flight: bool = True  # Requêtes de lecture identiques simultanées : un seul calcul partagé
+    hashing_workers: Optional[int] = None  # Threads dédiés à bcrypt (défaut : la moitié des CPU, au moins 1)
+    hashing_queue_size: int = 16  # Calculs bcrypt en attente au-delà desquels on répond 429
+    login_attempts_backend: str = "memory"  # Suivi des échecs de connexion : memory ou database
+    upload_sweep_interval_minutes: int = 60  # Ménage des avatars orphelins (0 = désactivé)
+    # Profil SQLite appliqué à chaque connexion (voir app.database.apply_sqlite_profile)
+    sqlite_journal_mode: str = "WAL"  # Lectures non bloquées par les écritures
+    sqlite_synchronous: str = "NORMAL"  # Suffisant en WAL : pas de corruption, au pire la dernière transaction perdue
+    sqlite_busy_timeout_ms: int = 5000  # Attente d'un verrou d'écriture avant "database is locked"
+    sqlite_cache_size_kib: int = 20000  # Cache de pages par connexion
+    sqlite_mmap_size_mb: int = 256  # Lecture du fichier par mmap (0 = désactivé)
+    sqlite_temp_store: str = "MEMORY"  # Tables temporaires (tris, GROUP BY) en mémoire
+    sqlite_foreign_keys: bool = True
+    slow_query_threshold_ms: float = 200  # Requêtes SQL journalisées avec leur plan au-delà (0 = désactivé)
+    slow_query_log_size: int = 200  # Requêtes lentes gardées pour GET /admin/metrics/slow-queries
+    server_timing_header: bool = False  # En-tête Server-Timing (durée de traitement) sur chaque réponse
+    request_id_header: bool = False  # En-tête X-Request-ID (repris du client ou généré)
+    query_stats_headers: bool = False  # En-têtes X-DB-Queries / X-DB-Time sur chaque réponse
+    async_db: bool = False  # Routes de lecture principales en async (aiosqlite / asyncpg)
+    compression_min_size: int = 1024  # Réponses JSON/texte compressées (gzip, brotli) à partir de cette taille en octets (0 = désactivé)
+    compression_gzip_level: int = 6  # 1 (rapide) à 9 (compact)
+    compression_brotli_quality: int = 4  # 0 à 11 ; au-delà de 5, trop lent pour compresser à la volée
+    compression_thread_min_size: int = 65536  # Blocs plus gros compressés dans un thread, hors boucle d'événements
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,120 @@
+# ============================================
+# FICHIER : backend/app/core/hashing.py
+# ============================================
+
+import asyncio
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Iterable
+
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder
+from app.core import security
+
+class HashingPoolSaturated(Exception):
+    """Toutes les places du pool bcrypt (calcul et file d'attente) sont prises"""
+
+class HashingPool:
+    """
+    Pool dédié aux calculs bcrypt, séparé du threadpool qui sert les routes synchrones.
+    bcrypt relâche le GIL : des threads suffisent, et leur nombre borne le CPU consommé.
+    Au-delà de `workers + queue_size` appels en cours, submit() échoue immédiatement
+    (HashingPoolSaturated, renvoyé en 429) au lieu d'immobiliser d'autres threads.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.wait = LatencyRecorder()
+        self.latency = defaultdict(LatencyRecorder)  # opération -> durée totale (attente comprise)
+
+    def submit(self, operation: str, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingPoolSaturated()
+        return self._start(operation, fn, args)
+
+    def _start(self, operation: str, fn, args) -> Future:
+        """Lance le calcul ; la place dans le pool est déjà prise"""
+        with self._lock:
+            self._in_flight += 1
+        queued_at = time.perf_counter()
+
+        def task():
+            self.wait.record(time.perf_counter() - queued_at)
+            try:
+                return fn(*args)
+            finally:
+                self.latency[operation].record(time.perf_counter() - queued_at)
+
+        def release(_):
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+        try:
+            future = self._executor.submit(task)
+        except BaseException:
+            release(None)
+            raise
+        future.add_done_callback(release)
+        return future
+
+    def run(self, operation: str, fn, *args):
+        """Soumet le calcul et attend son résultat"""
+        return self.submit(operation, fn, *args).result()
+
+    def imap_unordered(self, operation: str, fn, items: Iterable):
+        """
+        Traitements de masse : rend (élément, fn(élément)) dans l'ordre de fin des calculs.
+        Au plus `workers` calculs du lot en cours ; on attend une place au lieu d'échouer,
+        la file d'attente reste ainsi disponible pour les connexions.
+        """
+        pending = set()
+        for item in items:
+            if len(pending) >= self.workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            self._slots.acquire()
+            pending.add(self._start(operation, lambda item=item: (item, fn(item)), ()))
+        for future in as_completed(pending):
+            yield future.result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight, rejected = self._in_flight, self.rejected
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": in_flight,
+            "rejected": rejected,
+            "queue_wait": self.wait.snapshot(),
+            "operations": {op: recorder.snapshot() for op, recorder in list(self.latency.items())}
+        }
+
+hashing_pool = HashingPool(
+    settings.hashing_workers or max(1, (os.cpu_count() or 2) // 2),
+    settings.hashing_queue_size
+)
+
+def hash_password(password: str) -> str:
+    """get_password_hash exécuté dans le pool bcrypt"""
+    return hashing_pool.run("hash", security.get_password_hash, password)
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password exécuté dans le pool bcrypt"""
+    return hashing_pool.run("verify", security.verify_password, plain_password, hashed_password)
+
+async def check_password_async(plain_password: str, hashed_password: str) -> bool:
+    """check_password pour les routes async : le résultat est attendu sans occuper de thread"""
+    future = hashing_pool.submit("verify", security.verify_password, plain_password, hashed_password)
+    return await asyncio.wrap_future(future)
@@ -0,0 +1,193 @@
+# ============================================
+# FICHIER : backend/app/core/login_attempts.py
+# ============================================
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import delete, or_, and_
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.models import LoginAttempt
+
+MAX_ATTEMPTS = 5
+LOCKOUT_MINUTES = 30
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+class AttemptStore(ABC):
+    """
+    Suivi des échecs de connexion par email : MAX_ATTEMPTS échecs bloquent le compte
+    LOCKOUT_MINUTES minutes. Les échecs sont oubliés LOCKOUT_MINUTES après le dernier,
+    et le compteur repart de zéro à la fin d'un blocage.
+    Une connexion réussie sans échec préalable n'écrit rien.
+    """
+
+    @abstractmethod
+    def locked_until(self, email: str) -> Optional[datetime]:
+        """Fin du blocage en cours, ou None"""
+
+    @abstractmethod
+    def record_failure(self, email: str) -> Tuple[int, Optional[datetime]]:
+        """Compte un échec ; renvoie (échecs, fin du blocage s'il vient d'être posé)"""
+
+    @abstractmethod
+    def reset(self, email: str):
+        """Connexion réussie ou déblocage manuel : oublie les échecs"""
+
+    @abstractmethod
+    def clear(self):
+        """Oublie tous les échecs"""
+
+class MemoryAttemptStore(AttemptStore):
+    """
+    Stockage en mémoire, réparti en shards ayant chacun leur verrou.
+    Les entrées expirées d'un shard sont purgées lors des écritures, au plus une fois
+    par `prune_interval` secondes. Propre au processus : un redémarrage débloque tout,
+    et avec plusieurs workers chacun compte ses propres échecs.
+    """
+
+    def __init__(self, shards: int = 16, prune_interval: float = 60, clock: Callable[[], datetime] = _utcnow):
+        self._shards = [{} for _ in range(shards)]  # email -> [échecs, expiration, fin du blocage]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._pruned_at = [0.0] * shards
+        self.prune_interval = prune_interval
+        self._clock = clock
+
+    def _shard(self, email: str) -> int:
+        return hash(email) % len(self._shards)
+
+    def _live_entry(self, shard: dict, email: str, now: datetime):
+        entry = shard.get(email)
+        if entry is not None and entry[1] <= now:
+            del shard[email]
+            return None
+        return entry
+
+    def _prune(self, i: int, now: datetime):
+        if time.monotonic() - self._pruned_at[i] < self.prune_interval:
+            return
+        self._pruned_at[i] = time.monotonic()
+        shard = self._shards[i]
+        for email in [e for e, entry in shard.items() if entry[1] <= now]:
+            del shard[email]
+
+    def locked_until(self, email: str) -> Optional[datetime]:
+        i, now = self._shard(email), self._clock()
+        with self._locks[i]:
+            entry = self._live_entry(self._shards[i], email, now)
+            if entry is not None and entry[2] is not None and entry[2] > now:
+                return entry[2]
+            return None
+
+    def record_failure(self, email: str) -> Tuple[int, Optional[datetime]]:
+        i, now = self._shard(email), self._clock()
+        with self._locks[i]:
+            self._prune(i, now)
+            shard = self._shards[i]
+            entry = self._live_entry(shard, email, now)
+            if entry is None or (entry[2] is not None and entry[2] <= now):
+                entry = shard[email] = [0, now, None]
+            entry[0] += 1
+            entry[1] = now + timedelta(minutes=LOCKOUT_MINUTES)
+            if entry[0] >= MAX_ATTEMPTS:
+                entry[2] = entry[1]
+            return entry[0], entry[2]
+
+    def reset(self, email: str):
+        i = self._shard(email)
+        with self._locks[i]:
+            self._shards[i].pop(email, None)
+
+    def clear(self):
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                shard.clear()
+
+class DatabaseAttemptStore(AttemptStore):
+    """
+    Stockage persistant dans la table login_attempts (survit aux redémarrages,
+    partagé entre workers). Les lignes expirées sont supprimées lors des échecs,
+    au plus une fois par `prune_interval` secondes.
+    """
+
+    def __init__(self, session_factory=None, prune_interval: float = 60, clock: Callable[[], datetime] = _utcnow):
+        self._session_factory = session_factory or SessionLocal
+        self.prune_interval = prune_interval
+        self._pruned_at = 0.0
+        self._clock = clock
+
+    @staticmethod
+    def _aware(value: Optional[datetime]) -> Optional[datetime]:
+        # SQLite renvoie des dates naïves
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    def _find(self, db, email: str):
+        return db.query(LoginAttempt).filter(LoginAttempt.email == email).first()
+
+    def locked_until(self, email: str) -> Optional[datetime]:
+        with self._session_factory() as db:
+            attempt = self._find(db, email)
+            locked_until = self._aware(attempt.locked_until) if attempt else None
+        if locked_until is not None and locked_until > self._clock():
+            return locked_until
+        return None
+
+    def record_failure(self, email: str) -> Tuple[int, Optional[datetime]]:
+        now = self._clock()
+        window_start = now - timedelta(minutes=LOCKOUT_MINUTES)
+        with self._session_factory() as db:
+            if time.monotonic() - self._pruned_at >= self.prune_interval:
+                self._pruned_at = time.monotonic()
+                db.execute(delete(LoginAttempt).where(or_(
+                    LoginAttempt.locked_until <= now,
+                    and_(LoginAttempt.locked_until.is_(None), LoginAttempt.last_attempt <= window_start)
+                )))
+
+            attempt = self._find(db, email)
+            if attempt is None:
+                attempt = LoginAttempt(email=email, attempts_count=0)
+                db.add(attempt)
+            else:
+                locked_until = self._aware(attempt.locked_until)
+                last_attempt = self._aware(attempt.last_attempt)
+                if (locked_until is not None and locked_until <= now) or (
+                    locked_until is None and last_attempt is not None and last_attempt <= window_start
+                ):
+                    attempt.attempts_count, attempt.locked_until = 0, None
+
+            attempt.attempts_count = (attempt.attempts_count or 0) + 1
+            attempt.last_attempt = now
+            if attempt.attempts_count >= MAX_ATTEMPTS:
+                attempt.locked_until = now + timedelta(minutes=LOCKOUT_MINUTES)
+            count, locked_until = attempt.attempts_count, self._aware(attempt.locked_until)
+            db.commit()
+        return count, locked_until
+
+    def reset(self, email: str):
+        with self._session_factory() as db:
+            # Lecture d'abord : une connexion sans échec préalable n'écrit rien
+            if self._find(db, email) is not None:
+                db.execute(delete(LoginAttempt).where(LoginAttempt.email == email))
+                db.commit()
+
+    def clear(self):
+        with self._session_factory() as db:
+            db.execute(delete(LoginAttempt))
+            db.commit()
+
+def build_attempt_store(backend: str) -> AttemptStore:
+    if backend == "memory":
+        return MemoryAttemptStore()
+    if backend == "database":
+        return DatabaseAttemptStore()
+    raise ValueError(f"Stockage des tentatives inconnu : {backend}")
+
+login_attempts = build_attempt_store(settings.login_attempts_backend)
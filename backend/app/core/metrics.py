@@ -0,0 +1,39 @@
+# ============================================
+# FICHIER : backend/app/core/metrics.py
+# ============================================
+
+import threading
+from collections import deque
+
+class LatencyRecorder:
+    """Compteur et percentiles des durées récentes (fenêtre glissante bornée)"""
+
+    def __init__(self, window: int = 1024):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.max = max(self.max, seconds)
+
+    def snapshot(self) -> dict:
+        """Durées en millisecondes ; les percentiles portent sur la fenêtre"""
+        with self._lock:
+            samples = sorted(self._samples)
+            count, max_seconds = self.count, self.max
+
+        def percentile(p):
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3)
+
+        return {
+            "count": count,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(max_seconds * 1000, 3)
+        }
@@ -0,0 +1,57 @@
+# ============================================
+# FICHIER : backend/app/core/middleware.py
+# ============================================
+
+import re
+import time
+import uuid
+
+from app.core.config import settings
+
+SECURITY_HEADERS = (
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+)
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(rb"^[A-Za-z0-9._-]{1,128}$")
+
+class SecurityHeadersMiddleware:
+    """
+    Middleware ASGI pur : ajoute les en-têtes de sécurité au message http.response.start,
+    sans tâche ni flux intermédiaire (contrairement à @app.middleware("http")) ;
+    les réponses en streaming passent telles quelles.
+
+    Optionnellement :
+    - Server-Timing (SERVER_TIMING_HEADER) : durée de traitement jusqu'aux en-têtes ;
+    - X-Request-ID (REQUEST_ID_HEADER) : identifiant repris du client s'il est valide,
+      sinon généré ; disponible pour les routes dans request.state.request_id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        extra = []
+        if settings.request_id_header:
+            request_id = next((value for name, value in scope["headers"] if name == b"x-request-id"), None)
+            if request_id is None or not _VALID_REQUEST_ID.match(request_id):
+                request_id = uuid.uuid4().hex.encode()
+            scope.setdefault("state", {})["request_id"] = request_id.decode()
+            extra.append((b"x-request-id", request_id))
+        started = time.perf_counter() if settings.server_timing_header else None
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", []), *SECURITY_HEADERS, *extra]
+                if started is not None:
+                    duration = (time.perf_counter() - started) * 1000
+                    headers.append((b"server-timing", f"app;dur={duration:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
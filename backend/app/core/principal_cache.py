@@ -0,0 +1,137 @@
+# ============================================
+# FICHIER : backend/app/core/principal_cache.py
+# ============================================
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Player, User
+
+@dataclass(frozen=True)
+class Principal:
+    """Ce qu'il faut savoir d'un utilisateur pour l'autoriser, sans objet ORM"""
+    id: int
+    role: str
+    is_active: bool
+    player_id: Optional[int] = None
+    team_id: Optional[int] = None
+
+class PrincipalCache:
+    """
+    Cache LRU à durée de vie limitée des Principal, par identifiant d'utilisateur.
+    Propre au processus : la durée de vie borne le décalage entre plusieurs workers.
+
+    Comme pour le cache de réponses, une version relevée avant la lecture en base
+    (version()) est vérifiée par put() : un principal lu avant une invalidation
+    n'est pas remis en cache après elle.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()  # user_id -> (expiration, Principal)
+        self._user_versions = {}  # user_id -> nombre d'invalidations
+        self._player_generation = 0  # Invalidations par joueur (joueur inconnu avant la lecture)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def version(self, user_id: int) -> tuple:
+        """À relever avant de lire le principal en base, puis à passer à put()"""
+        with self._lock:
+            return self._user_versions.get(user_id, 0), self._player_generation
+
+    def put(self, principal: Principal, version: tuple):
+        """Ignoré si l'utilisateur (ou un joueur) a été invalidé depuis version()"""
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            if version != (self._user_versions.get(principal.id, 0), self._player_generation):
+                return
+            self._entries[principal.id] = (self._clock() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_ids=(), player_ids=()):
+        """Oublie les utilisateurs donnés et ceux liés aux joueurs donnés"""
+        user_ids, player_ids = set(user_ids), set(player_ids)
+        with self._lock:
+            if player_ids:
+                self._player_generation += 1
+                user_ids.update(
+                    uid for uid, (_, p) in self._entries.items() if p.player_id in player_ids
+                )
+            for user_id in user_ids:
+                self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+principal_cache = PrincipalCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
+
+# --- Invalidation ---
+# Les changements de rôle, d'activation, de joueur lié ou d'équipe sont relevés au flush
+# et appliqués au commit. Un thread qui a lu l'ancienne valeur avant le commit ne peut pas
+# la remettre en cache ensuite : invalidate() change la version que put() vérifie.
+# Une invalidation de trop (transaction annulée) est sans conséquence.
+
+_USER_FIELDS = ("role", "is_active", "player_id")
+_STALE_KEY = "stale_principals"
+
+def _changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[f].history.has_changes() for f in fields)
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_principals(session, flush_context):
+    user_ids, player_ids = session.info.setdefault(_STALE_KEY, (set(), set()))
+    for obj in session.dirty:
+        if isinstance(obj, User) and _changed(obj, _USER_FIELDS):
+            user_ids.add(obj.id)
+        elif isinstance(obj, Player) and _changed(obj, ("team_id",)):
+            player_ids.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            user_ids.add(obj.id)
+        elif isinstance(obj, Player):
+            player_ids.add(obj.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session):
+    stale = session.info.pop(_STALE_KEY, None)
+    if stale:
+        principal_cache.invalidate(*stale)
@@ -0,0 +1,114 @@
+# ============================================
+# FICHIER : backend/app/core/query_stats.py
+# ============================================
+
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUERIES_HEADER = "X-DB-Queries"
+TIME_HEADER = "X-DB-Time"
+N_PLUS_ONE_THRESHOLD = 5  # Une même requête répétée autant de fois signale un chargement paresseux en boucle
+
+class QueryStats:
+    """Requêtes SQL exécutées pendant une requête HTTP (ou un bloc track_queries)"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()  # Texte SQL -> nombre d'exécutions
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        """Requêtes exécutées au moins `threshold` fois (N+1 probable)"""
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+def current_route() -> Optional[str]:
+    """Méthode et route (gabarit, ex : GET /api/v1/matches/{match_id}) de la requête HTTP en cours"""
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")  # Posée par le routeur sur le même scope
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+@contextmanager
+def track_queries():
+    """
+    Compte les requêtes SQL exécutées dans le contexte courant (threads de
+    run_in_threadpool et moteur async compris, le contexte leur étant copié).
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+# Écoute de tous les moteurs (synchrones, async via leur sync_engine, moteurs de test)
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context.query_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+class QueryStatsMiddleware:
+    """
+    Middleware ASGI : rend la route courante visible aux écouteurs SQL (current_route),
+    et si QUERY_STATS_HEADERS est activé, ajoute à chaque réponse X-DB-Queries (nombre
+    de requêtes SQL) et X-DB-Time (temps passé en base, en ms), et journalise les
+    requêtes répétées (N+1 probable).
+    Les requêtes exécutées pendant l'envoi d'un corps en streaming ne sont pas comptées.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            if settings.query_stats_headers:
+                await self._call_with_stats(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+    async def _call_with_stats(self, scope, receive, send):
+        with track_queries() as stats:
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((QUERIES_HEADER.lower().encode(), str(stats.count).encode()))
+                    headers.append((TIME_HEADER.lower().encode(), f"{stats.seconds * 1000:.1f}".encode()))
+                    message = {**message, "headers": headers}
+                    for statement, n in stats.repeated():
+                        logger.warning("N+1 probable sur %s : %d x %s", current_route(), n, statement)
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
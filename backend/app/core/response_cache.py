@@ -0,0 +1,214 @@
+# ============================================
+# FICHIER : backend/app/core/response_cache.py
+# ============================================
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.compression import strip_encoding
+from app.core.config import settings
+from app.core.single_flight import single_flight
+
+CACHE_CONTROL = "private, no-cache"  # Le navigateur garde la réponse mais revalide (ETag) à chaque fois
+
+# Tables écrites -> tags des réponses à invalider
+TAGS_BY_TABLE = {
+    "matches": ("matches", "ranking"),  # Le classement (team_standings) suit les scores
+    "events": ("events",),
+    "teams": ("teams",),
+    "players": ("teams",),  # Joueurs renvoyés avec leur équipe
+    "team_standings": ("ranking",),
+}
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Comparaison faible de If-None-Match (préfixes W/ ignorés). Les suffixes d'encodage
+    (-gzip, -br) posés par la compression sont tolérés : même contenu, autres octets.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return opaque in (strip_encoding(tag.strip().removeprefix("W/")) for tag in if_none_match.split(","))
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Corps JSON et en-têtes (ex : X-Next-Cursor) d'une réponse, avec son ETag fort"""
+    body: bytes
+    headers: Tuple[Tuple[str, str], ...]
+    etag: str
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CachedResponse":
+        headers = tuple(
+            (name, value) for name, value in response.headers.items()
+            if name not in ("content-length", "content-type")
+        )
+        etag = '"%s"' % hashlib.blake2b(response.body, digest_size=16).hexdigest()
+        return cls(response.body, headers, etag)
+
+    def respond(self, request: Request) -> Response:
+        headers = {**dict(self.headers), "ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            response_cache.count_not_modified()
+            return Response(status_code=304, headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+class ResponseCache:
+    """
+    Cache LRU des réponses de lecture, par clé (route, paramètres, portée de l'utilisateur),
+    étiquetées par tags (matches, events, teams, ranking).
+
+    Invalidation précise : à chaque commit, les tags des tables écrites sont invalidés.
+    Une version par tag empêche de mettre en cache une réponse calculée pendant une
+    écriture. Propre au processus : la durée de vie borne le décalage entre workers.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()  # clé -> (expiration, tags, CachedResponse)
+        self._versions = {}  # tag -> nombre d'invalidations
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def versions(self, tags: Iterable[str]) -> tuple:
+        """À relever avant de lire la base, puis à passer à put()"""
+        with self._lock:
+            return tuple(self._versions.get(tag, 0) for tag in tags)
+
+    def put(self, key: Hashable, tags: Tuple[str, ...], versions: tuple, cached: CachedResponse):
+        """Ignoré si un des tags a été invalidé depuis versions()"""
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            if versions != tuple(self._versions.get(tag, 0) for tag in tags):
+                return
+            self._entries[key] = (self._clock() + self.ttl_seconds, frozenset(tags), cached)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tags: Iterable[str]):
+        tags = set(tags)
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+            stale = [key for key, (_, entry_tags, _) in self._entries.items() if entry_tags & tags]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def count_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.not_modified = self.invalidations = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "invalidations": self.invalidations
+            }
+
+response_cache = ResponseCache(settings.response_cache_size, settings.response_cache_ttl_seconds)
+
+def cache_key(request: Request, scope: Hashable = None) -> tuple:
+    """Route, paramètres de requête triés et portée (ex : rôle et équipe de l'utilisateur)"""
+    return request.url.path, tuple(sorted(request.query_params.multi_items())), scope
+
+def serve_cached(request: Request, tags: Tuple[str, ...], build: Callable[[], Response],
+                 scope: Hashable = None) -> Response:
+    """
+    Réponse en cache pour cette requête, ou build() (qui lit la base) mise en cache.
+    Les requêtes identiques simultanées partagent un seul appel à build() (SINGLE_FLIGHT).
+    304 sans corps si If-None-Match correspond à l'ETag.
+    """
+    key = cache_key(request, scope)
+    cached = response_cache.get(key)
+    if cached is None:
+        versions = response_cache.versions(tags)
+
+        def compute() -> CachedResponse:
+            computed = CachedResponse.from_response(build())
+            response_cache.put(key, tags, versions, computed)
+            return computed
+
+        # Versions dans la clé : une requête arrivée après une écriture ne reprend pas un calcul antérieur
+        cached = single_flight.do((key, versions), compute) if settings.single_flight else compute()
+    return cached.respond(request)
+
+async def serve_cached_async(request: Request, tags: Tuple[str, ...], build: Callable[[], Awaitable[Response]],
+                             scope: Hashable = None) -> Response:
+    """serve_cached pour les routes async"""
+    key = cache_key(request, scope)
+    cached = response_cache.get(key)
+    if cached is None:
+        versions = response_cache.versions(tags)
+
+        async def compute() -> CachedResponse:
+            computed = CachedResponse.from_response(await build())
+            response_cache.put(key, tags, versions, computed)
+            return computed
+
+        cached = await single_flight.do_async((key, versions), compute) if settings.single_flight else await compute()
+    return cached.respond(request)
+
+# --- Invalidation ---
+# Comme pour principal_cache : tables écrites relevées au flush (objets ORM) ou à
+# l'exécution (insert/update/delete en masse), tags invalidés au commit.
+
+_TAGS_KEY = "stale_response_tags"
+
+def _mark_written(session, table_name: str):
+    session.info.setdefault(_TAGS_KEY, set()).update(TAGS_BY_TABLE.get(table_name, ()))
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        _mark_written(session, type(obj).__table__.name)
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_executed_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_written(orm_execute_state.session, orm_execute_state.statement.table.name)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_responses(session):
+    tags = session.info.pop(_TAGS_KEY, None)
+    if tags:
+        response_cache.invalidate(tags)
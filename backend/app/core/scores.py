@@ -0,0 +1,79 @@
+# ============================================
+# FICHIER : backend/app/core/scores.py
+# ============================================
+# Codec des scores "6-4, 3-6, 7-5" : utilisé par la validation des schémas,
+# le stockage par set (match_sets) et le classement.
+
+import re
+from typing import List, Optional, Tuple
+
+SetScore = Tuple[int, int]
+
+SCORE_PATTERN = re.compile(r"^\d+-\d+(?:, \d+-\d+){1,2}$")
+LENIENT_SCORE_PATTERN = re.compile(r"^\d+-\d+(?:, \d+-\d+)*$")
+SET_PATTERN = re.compile(r"(\d+)-(\d+)")
+
+def _split_sets(score: str) -> List[SetScore]:
+    return [(int(g1), int(g2)) for g1, g2 in SET_PATTERN.findall(score)]
+
+def parse_score(score: str) -> List[SetScore]:
+    """Découpe un score au format strict de l'API (2 ou 3 sets), lève ValueError sinon"""
+    if not SCORE_PATTERN.match(score):
+        raise ValueError("Format de score invalide")
+    return _split_sets(score)
+
+def decode_score(score: Optional[str]) -> Optional[List[SetScore]]:
+    """Découpe un score déjà stocké ; retourne None s'il est vide ou mal formé"""
+    if not score or not LENIENT_SCORE_PATTERN.match(score):
+        return None
+    return _split_sets(score)
+
+def format_score(sets: List[SetScore]) -> str:
+    return ", ".join(f"{g1}-{g2}" for g1, g2 in sets)
+
+def count_sets(sets: List[SetScore]) -> Tuple[int, int]:
+    """Retourne (sets gagnés équipe 1, sets gagnés équipe 2)"""
+    t1_sets = sum(1 for g1, g2 in sets if g1 > g2)
+    return t1_sets, len(sets) - t1_sets
+
+def validate_score(score: str) -> List[SetScore]:
+    """Vérifie un score selon les règles du padel et retourne ses sets"""
+    sets = parse_score(score)
+
+    for games_1, games_2 in sets:
+        # Le vainqueur d'un set doit avoir au moins 6 jeux
+        if max(games_1, games_2) < 6:
+            raise ValueError("Le vainqueur d'un set doit avoir au moins 6 jeux")
+
+        # Si un set se termine 7-X, X doit être <= 5 (sauf tie-break 7-6)
+        if games_1 == 7 and games_2 > 6:
+            raise ValueError("Score de set invalide (7-X avec X > 6 impossible)")
+        if games_2 == 7 and games_1 > 6:
+            raise ValueError("Score de set invalide (X-7 avec X > 6 impossible)")
+
+        # Ecart de 2 jeux minimum sauf si 7-6
+        diff = abs(games_1 - games_2)
+        if diff < 2 and not (games_1 == 7 and games_2 == 6) and not (games_1 == 6 and games_2 == 7):
+            raise ValueError("Il faut 2 jeux d'écart pour gagner un set (sauf tie-break 7-6)")
+
+        if max(games_1, games_2) > 7:
+            raise ValueError("Impossible d'avoir plus de 7 jeux dans un set")
+
+    # Vérifier qu'une équipe a gagné au moins 2 sets
+    sets_won_1 = 0
+    sets_won_2 = 0
+
+    for i, (g1, g2) in enumerate(sets):
+        if g1 > g2:
+            sets_won_1 += 1
+        elif g2 > g1:
+            sets_won_2 += 1
+
+        # Si une équipe a déjà gagné 2 sets et qu'il reste des sets à jouer
+        if (sets_won_1 == 2 or sets_won_2 == 2) and i < len(sets) - 1:
+            raise ValueError("Le match est déjà terminé après 2 sets gagnants")
+
+    if sets_won_1 < 2 and sets_won_2 < 2:
+        raise ValueError("Il faut au moins 2 sets gagnants pour terminer un match")
+
+    return sets
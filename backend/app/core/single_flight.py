@@ -0,0 +1,105 @@
+# ============================================
+# FICHIER : backend/app/core/single_flight.py
+# ============================================
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+class _Flight:
+    """Calcul en cours, partagé entre le thread qui l'exécute et ceux qui l'attendent"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Regroupe les calculs identiques simultanés : pour une même clé, le premier appel
+    exécute la fonction, les suivants attendent et reçoivent son résultat (ou son
+    exception). Rien n'est gardé une fois le calcul terminé : c'est le rôle du cache.
+
+    do() pour les routes synchrones (threads), do_async() pour les routes async.
+    """
+
+    def __init__(self):
+        self._flights = {}  # clé -> _Flight
+        self._async_flights = {}  # clé -> asyncio.Future
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            future = self._async_flights.get(key)
+            if future is None:
+                break
+            with self._lock:
+                self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # Cette requête-ci est annulée
+                with self._lock:
+                    self.coalesced -= 1  # Calcul partagé annulé : on le relance
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())  # Exception lue même sans attente
+        self._async_flights[key] = future
+        with self._lock:
+            self.executed += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._async_flights[key]
+
+    def clear(self):
+        with self._lock:
+            self.executed = self.coalesced = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._flights) + len(self._async_flights),
+                "executed": self.executed,
+                "coalesced": self.coalesced
+            }
+
+single_flight = SingleFlight()
@@ -0,0 +1,106 @@
+# ============================================
+# FICHIER : backend/app/core/slow_queries.py
+# ============================================
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.query_stats import current_route
+
+logger = logging.getLogger(__name__)
+
+def parameter_shape(parameters, executemany: bool = False):
+    """Types des paramètres liés, sans leurs valeurs (ni données personnelles dans les journaux)"""
+    if executemany:
+        parameters = list(parameters)
+        return f"{len(parameters)} x {parameter_shape(parameters[0]) if parameters else '()'}"
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    return tuple(type(value).__name__ for value in parameters or ())
+
+class SlowQueryLog:
+    """
+    Requêtes SQL plus longues que `threshold_ms` (0 = désactivé) : journalisées et gardées
+    dans un tampon circulaire de `size` entrées. Le plan d'exécution SQLite
+    (EXPLAIN QUERY PLAN) est relevé une seule fois par texte de requête distinct.
+    """
+
+    def __init__(self, threshold_ms: float, size: int = 200, max_plans: int = 512):
+        self.threshold_ms = threshold_ms
+        self._entries = deque(maxlen=size)
+        self._plans = OrderedDict()  # Texte SQL -> plan (LRU borné)
+        self.max_plans = max_plans
+        self._lock = threading.Lock()
+
+    def _plan(self, dbapi_connection, statement: str, parameters) -> Optional[List[str]]:
+        with self._lock:
+            if statement in self._plans:
+                self._plans.move_to_end(statement)
+                return self._plans[statement]
+        # Hors verrou : EXPLAIN s'exécute sur la connexion de la requête lente
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plan = [row[-1] for row in cursor.fetchall()]
+        except Exception as e:  # Instruction non explicable (PRAGMA, DDL...) : on garde la raison
+            plan = [f"Plan indisponible : {e}"]
+        finally:
+            cursor.close()
+        with self._lock:
+            self._plans[statement] = plan
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return plan
+
+    def record(self, conn, statement: str, parameters, executemany: bool, seconds: float):
+        plan = None
+        if conn.dialect.name == "sqlite" and not executemany:
+            plan = self._plan(conn.connection.dbapi_connection, statement, parameters)
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(seconds * 1000, 3),
+            "route": current_route(),
+            "statement": statement,
+            "parameters": parameter_shape(parameters, executemany),
+            "plan": plan,
+        }
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning(
+            "Requête lente (%.1f ms) sur %s : %s | paramètres %s | plan %s",
+            entry["duration_ms"], entry["route"], statement, entry["parameters"], plan
+        )
+
+    def entries(self) -> List[dict]:
+        """Requêtes lentes récentes, de la plus récente à la plus ancienne"""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+
+slow_query_log = SlowQueryLog(settings.slow_query_threshold_ms, settings.slow_query_log_size)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if slow_query_log.threshold_ms > 0:
+        context.slow_query_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "slow_query_started", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    if seconds * 1000 >= slow_query_log.threshold_ms:
+        slow_query_log.record(conn, statement, parameters, executemany, seconds)
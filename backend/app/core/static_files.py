@@ -0,0 +1,73 @@
+# ============================================
+# FICHIER : backend/app/core/static_files.py
+# ============================================
+
+import os
+import stat
+from mimetypes import guess_type
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+
+from app.core.compression import negotiate
+from app.core.response_cache import etag_matches
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+class AppStaticFiles(StaticFiles):
+    """
+    StaticFiles avec cache long pour les fichiers nommés par leur contenu
+    (vignettes d'avatars) : leur URL change dès que le contenu change.
+
+    Si le client l'accepte, une variante précompressée (`fichier.br`, `fichier.gz`)
+    posée à côté du fichier est servie à sa place, avec le type du fichier d'origine.
+    """
+
+    immutable_prefixes = ("uploads/avatars/",)
+
+    def lookup_precompressed(self, path: str, scope):
+        """Première variante précompressée existante acceptée par le client, ou None"""
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        available = list(PRECOMPRESSED_SUFFIXES)
+        while available:
+            encoding = negotiate(accept_encoding, available)
+            if encoding is None:
+                return None
+            full_path, stat_result = self.lookup_path(path + PRECOMPRESSED_SUFFIXES[encoding])
+            if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                return encoding, full_path, stat_result
+            available.remove(encoding)
+        return None
+
+    async def get_response(self, path: str, scope) -> Response:
+        if scope["method"] in ("GET", "HEAD"):
+            variant = await anyio.to_thread.run_sync(self.lookup_precompressed, path, scope)
+            if variant is not None:
+                encoding, full_path, stat_result = variant
+                response = self.file_response(full_path, stat_result, scope)
+                if isinstance(response, FileResponse):
+                    media_type = guess_type(path)[0] or "text/plain"  # Comme FileResponse
+                    if media_type.startswith("text/"):
+                        media_type += "; charset=utf-8"
+                    response.headers["Content-Type"] = media_type
+                    response.headers["Content-Encoding"] = encoding
+                response.headers["Vary"] = "Accept-Encoding"
+                return response
+        return await super().get_response(path, scope)
+
+    def is_not_modified(self, response_headers: Headers, request_headers: Headers) -> bool:
+        # Comparaison faible : Starlette exige l'égalité exacte, qui échoue sur l'ETag d'une version compressée
+        etag = response_headers.get("etag")
+        if etag and etag_matches(request_headers.get("if-none-match"), etag):
+            return True
+        return super().is_not_modified(response_headers, request_headers)
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        if relative.startswith(self.immutable_prefixes):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE
+        return response
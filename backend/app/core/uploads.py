@@ -0,0 +1,157 @@
+# ============================================
+# FICHIER : backend/app/core/uploads.py
+# ============================================
+
+import os
+import uuid
+from typing import Optional, Tuple
+
+from anyio import to_thread
+from fastapi import Request
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+# Signatures reconnues -> extension du fichier enregistré
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+)
+SIGNATURE_LENGTH = max(len(signature) for signature, _ in IMAGE_SIGNATURES)
+MULTIPART_OVERHEAD = 16 * 1024  # En-têtes des parties et délimiteurs tolérés en plus du fichier
+
+class UploadRejected(Exception):
+    """Fichier refusé ; le message est destiné à l'utilisateur"""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+def sniff_image(head: bytes) -> Optional[str]:
+    """Extension correspondant aux premiers octets, ou None si le format n'est pas accepté"""
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    return None
+
+class _FieldCollector:
+    """Callbacks du parseur multipart : ne garde que les octets du champ voulu"""
+
+    def __init__(self, field_name: str):
+        self.field_name = field_name.encode()
+        self.found = False
+        self.chunks = []  # Morceaux reçus depuis la dernière écriture
+        self._in_field = False
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_header_field": self._header_field,
+            "on_header_value": self._header_value_cb,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+        }
+
+    def _part_begin(self):
+        self._in_field = False
+        self._disposition = b""
+
+    def _header_field(self, data, start, end):
+        self._header_name += data[start:end]
+
+    def _header_value_cb(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def _header_end(self):
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = self._header_value = b""
+
+    def _headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        self._in_field = options.get(b"name") == self.field_name and not self.found
+        self.found = self.found or self._in_field
+
+    def _part_data(self, data, start, end):
+        if self._in_field:
+            self.chunks.append(data[start:end])
+
+    def _part_end(self):
+        self._in_field = False
+
+async def receive_image(request: Request, field_name: str, directory: str, max_bytes: int) -> Tuple[str, str]:
+    """
+    Reçoit l'image du champ multipart `field_name` morceau par morceau, sans passer par
+    UploadFile : seul le morceau en cours est en mémoire, l'écriture disque se fait dans
+    un thread, et la réception s'arrête dès que le fichier dépasse `max_bytes` ou le corps
+    entier `max_bytes + MULTIPART_OVERHEAD`. Le format est
+    déterminé par les premiers octets (le Content-Type du client est ignoré).
+
+    Renvoie (chemin du fichier temporaire dans `directory`, extension) ; à l'appelant de
+    le renommer (os.replace, atomique sur un même système de fichiers) ou de le supprimer.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadRejected("Requête multipart/form-data attendue")
+
+    too_large = UploadRejected(f"La taille du fichier ne doit pas dépasser {max_bytes // (1024 * 1024)}MB")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD:
+        raise too_large
+
+    await to_thread.run_sync(lambda: os.makedirs(directory, exist_ok=True))
+    temp_path = os.path.join(directory, f".{uuid.uuid4()}.part")
+    target = await to_thread.run_sync(open, temp_path, "wb")
+    collector = _FieldCollector(field_name)
+    parser = MultipartParser(boundary, collector.callbacks())
+    head, received, total, extension = b"", 0, 0, None
+
+    try:
+        async for chunk in request.stream():
+            # Tout le corps compte (autres parties, préambule) : sans Content-Length, seule borne
+            total += len(chunk)
+            if total > max_bytes + MULTIPART_OVERHEAD:
+                raise too_large
+            try:
+                parser.write(chunk)
+            except MultipartParseError:
+                raise UploadRejected("Requête multipart invalide")
+            data, collector.chunks = b"".join(collector.chunks), []
+            if not data:
+                continue
+            received += len(data)
+            if received > max_bytes:
+                raise too_large
+            if extension is None:
+                head += data[:SIGNATURE_LENGTH - len(head)]
+                if len(head) >= SIGNATURE_LENGTH:
+                    extension = sniff_image(head)
+                    if extension is None:
+                        raise UploadRejected("Format de fichier non supporté (JPG/JPEG/PNG uniquement)")
+            await to_thread.run_sync(target.write, data)
+        try:
+            parser.finalize()
+        except MultipartParseError:
+            raise UploadRejected("Requête multipart invalide")
+
+        if not collector.found or received == 0:
+            raise UploadRejected("Aucun fichier reçu")
+        if extension is None:
+            extension = sniff_image(head)
+            if extension is None:
+                raise UploadRejected("Format de fichier non supporté (JPG/JPEG/PNG uniquement)")
+        await to_thread.run_sync(target.close)
+        return temp_path, extension
+    except BaseException:
+        await to_thread.run_sync(_discard, target, temp_path)
+        raise
+
+def _discard(target, temp_path: str):
+    target.close()
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
@@ -1,12 +1,38 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text, func, select, update, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 engine = create_engine(
     settings.database_url,
     connect_args={"check_same_thread": False}  # Nécessaire pour SQLite
 )
 
+def apply_sqlite_profile(dbapi_connection, connection_record=None):
+    """
+    Réglages SQLite posés à l'ouverture de chaque connexion (événement "connect").
+    journal_mode est persistant dans le fichier, les autres PRAGMA valent pour la connexion.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA cache_size={-int(settings.sqlite_cache_size_kib)}")  # Négatif : en Kio
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_mb) * 1024 * 1024}")
+        cursor.execute(f"PRAGMA temp_store={settings.sqlite_temp_store}")
+        cursor.execute(f"PRAGMA foreign_keys={'ON' if settings.sqlite_foreign_keys else 'OFF'}")
+    finally:
+        cursor.close()
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", apply_sqlite_profile)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -19,6 +45,34 @@ def get_db():
     finally:
         db.close()
 
+# Pilotes async équivalents aux pilotes synchrones par défaut
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+def async_database_url(url: str) -> str:
+    """URL de la même base via le pilote async (sqlite:///x.db -> sqlite+aiosqlite:///x.db)"""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+def create_async_db_engine(url: str):
+    """Moteur async ; reçoit le même profil SQLite que le moteur synchrone"""
+    async_engine = create_async_engine(async_database_url(url))
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_profile)
+    return async_engine
+
+# Optionnel (ASYNC_DB=true) : les routes de lecture principales passent par ce moteur.
+# Les modèles ORM sont partagés ; les relations doivent être chargées explicitement
+# (pas de chargement paresseux en async).
+async_engine = create_async_db_engine(settings.database_url) if settings.async_db else None
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False) if async_engine else None
+
+async def get_async_db():
+    """Générateur de session async (ASYNC_DB=true)"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Moteur async désactivé (ASYNC_DB=false)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def init_db():
     """Initialise la base de données avec un admin par défaut"""
     from app.models.models import User, Base
@@ -46,6 +100,99 @@ def init_db():
     finally:
         db.close()
 
+def migrate_db():
+    """Met à niveau les données d'une base existante après create_all"""
+    from app.models.models import Event, Match, Player, Team, TeamStanding, build_match_sets, add_minutes, search_key
+    from app.services.standings import recompute_standings
+
+    with engine.begin() as connection:
+        # create_all n'ajoute pas les colonnes (nullables) apparues sur des tables existantes
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=connection.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+        # Donner une heure de fin (durée standard) aux événements qui n'en ont pas
+        matches, events = Match.__table__, Event.__table__
+        missing_end = connection.execute(
+            select(events.c.id, events.c.start_time).where(events.c.end_time.is_(None))
+        ).all()
+        for event_id, start_time in missing_end:
+            connection.execute(
+                update(events)
+                .where(events.c.id == event_id)
+                .values(end_time=add_minutes(start_time, settings.match_duration_minutes))
+            )
+
+        # Renseigner le créneau réservé des matchs existants avant de poser l'index unique
+        of_event = events.c.id == matches.c.event_id
+        connection.execute(
+            update(matches)
+            .where(or_(matches.c.slot_date.is_(None), matches.c.slot_end_time.is_(None)))
+            .values(
+                slot_date=select(events.c.date).where(of_event).scalar_subquery(),
+                slot_time=select(events.c.start_time).where(of_event).scalar_subquery(),
+                slot_end_time=select(events.c.end_time).where(of_event).scalar_subquery()
+            )
+        )
+
+    # Index lower() remplacés par les colonnes name_key / company_key (LOWER ne plie que l'ASCII)
+    with engine.begin() as connection:
+        for index_name in ("ix_teams_company_lower", "ix_teams_name_lower"):
+            connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+    # create_all ne crée pas non plus les index ajoutés sur des tables existantes
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(CreateIndex(index, if_not_exists=True))
+            except IntegrityError:
+                # Données existantes incompatibles (ex : deux matchs sur la même piste au même créneau)
+                logger.warning("Index %s non créé : données en conflit à corriger", index.name)
+
+    db = SessionLocal()
+    try:
+        # Découper en match_sets les scores saisis avant le stockage par set
+        legacy_matches = db.query(Match).filter(
+            Match.score_team1.isnot(None),
+            ~Match.sets.any()
+        ).all()
+        for match in legacy_matches:
+            match.sets = build_match_sets(match.score_team1)
+        if legacy_matches:
+            db.commit()
+
+        # Renseigner Team.company depuis les joueurs pour les équipes existantes
+        company = (
+            db.query(func.min(Player.company))
+            .filter(Player.team_id == Team.id)
+            .correlate(Team)
+            .scalar_subquery()
+        )
+        if db.query(Team).filter(Team.company.is_(None), Team.players.any()).update(
+            {Team.company: company}, synchronize_session=False
+        ):
+            db.commit()
+
+        # Clés de recherche (casefold) des équipes créées avant les colonnes name_key / company_key
+        stale_keys = db.query(Team).filter(
+            Team.name_key.is_(None) | (Team.company.isnot(None) & Team.company_key.is_(None))
+        ).all()
+        for team in stale_keys:
+            team.name_key, team.company_key = search_key(team.name), search_key(team.company)
+        if stale_keys:
+            db.commit()
+
+        # Remplir team_standings s'il vient d'être créé ou s'il manque des équipes
+        if db.query(TeamStanding).count() < db.query(Team).count():
+            recompute_standings(db)
+    finally:
+        db.close()
+
 def init_db_test():
     """Initialise la base de données avec des données de test"""
     init_db()
@@ -1,26 +1,60 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
+from app.core.hashing import HashingPoolSaturated
+from app.core.compression import CompressionMiddleware
+from app.core.middleware import SecurityHeadersMiddleware, REQUEST_ID_HEADER
+from app.core.query_stats import QueryStatsMiddleware, QUERIES_HEADER, TIME_HEADER
+from app.core.static_files import AppStaticFiles
 from app.api import auth, admin, matches, results, planning, test
-from app.database import engine
+from app.database import engine, migrate_db, SessionLocal
 from app.models import models
+from app.services import standings  # noqa: F401 - enregistre la synchro du classement
+from app.services import avatars
+import asyncio
+from contextlib import asynccontextmanager
+import logging
 import os
 
 # Créer les tables
 models.Base.metadata.create_all(bind=engine)
+migrate_db()
+
+def sweep_orphan_uploads() -> list:
+    with SessionLocal() as db:
+        return avatars.sweep_orphan_uploads(db)
+
+async def sweep_orphan_uploads_periodically():
+    """Ménage des avatars que plus aucun utilisateur ne référence"""
+    while True:
+        try:
+            await asyncio.to_thread(sweep_orphan_uploads)
+        except Exception:
+            logging.getLogger(__name__).exception("Échec du ménage de static/uploads")
+        await asyncio.sleep(settings.upload_sweep_interval_minutes * 60)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sweep = None
+    if settings.upload_sweep_interval_minutes > 0:
+        sweep = asyncio.create_task(sweep_orphan_uploads_periodically())
+    yield
+    if sweep:
+        sweep.cancel()
 
 app = FastAPI(
     title="Corpo Padel API",
     description="API pour la gestion de tournois corporatifs de padel",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Créer le dossier static s'il n'existe pas
 os.makedirs("static/uploads", exist_ok=True)
 
-# Servir les fichiers statiques
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Servir les fichiers statiques (cache long pour les avatars nommés par empreinte)
+app.mount("/static", AppStaticFiles(directory="static"), name="static")
 
 # Configuration CORS
 app.add_middleware(
@@ -29,16 +63,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", QUERIES_HEADER, TIME_HEADER, REQUEST_ID_HEADER],
 )
 
-# Middleware de sécurité
-@app.middleware("http")
-async def add_security_headers(request, call_next):
-    response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    return response
+# Nombre de requêtes SQL et temps passé en base par requête (QUERY_STATS_HEADERS)
+app.add_middleware(QueryStatsMiddleware)
+
+# Compression gzip / brotli selon Accept-Encoding (COMPRESSION_MIN_SIZE)
+app.add_middleware(CompressionMiddleware)
+
+# Middleware de sécurité (ASGI pur, ajouté en dernier : enveloppe toutes les réponses)
+app.add_middleware(SecurityHeadersMiddleware)
+
+@app.exception_handler(HashingPoolSaturated)
+async def hashing_pool_saturated(request: Request, exc: HashingPoolSaturated):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Trop de connexions simultanées, réessayez dans un instant"},
+        headers={"Retry-After": "1"}
+    )
 
 # Routes
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
@@ -60,7 +103,19 @@ def health_check():
 
 if __name__ == "__main__":
     import sys
-    from app.database import init_db
+    from app.database import init_db, SessionLocal
     
     if len(sys.argv) > 1 and sys.argv[1] == "init_db":
-        init_db()
\ No newline at end of file
+        init_db()
+    elif len(sys.argv) > 1 and sys.argv[1] == "sweep_uploads":
+        removed = sweep_orphan_uploads()
+        print(f"{len(removed)} fichier(s) orphelin(s) supprimé(s)")
+    elif len(sys.argv) > 1 and sys.argv[1] == "recompute_standings":
+        db = SessionLocal()
+        try:
+            report = standings.recompute_standings(db)
+        finally:
+            db.close()
+        print(f"{report['teams_checked']} équipes vérifiées, {len(report['mismatches'])} écart(s) corrigé(s)")
+        for mismatch in report["mismatches"]:
+            print(f"  Équipe {mismatch['team_id']} : {mismatch['stored']} -> {mismatch['expected']}")
\ No newline at end of file
@@ -2,10 +2,14 @@
 # FICHIER : backend/app/models/models.py
 # ============================================
 
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Date, Time, Enum as SQLAlchemyEnum
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Date, Time, Index, Enum as SQLAlchemyEnum
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy import event, inspect, update, select, or_, text
+from sqlalchemy.orm import relationship, Session, validates
 from app.database import Base
+from app.core.config import settings
+from datetime import date, datetime, time, timedelta
+from app.core.scores import decode_score
 import enum
 
 class User(Base):
@@ -52,18 +56,29 @@ class Player(Base):
     user = relationship("User", back_populates="player", uselist=False)
     
     # Relation avec Team
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True, index=True)
     team = relationship("Team", back_populates="players")
 
     @property
     def user_role(self):
         return self.user.role if self.user else None
 
+def search_key(value):
+    """
+    Forme comparable d'un nom ou d'une entreprise pour le filtre des matchs : casefold()
+    de Python, car LOWER() de SQLite ne plie que l'ASCII ("École" resterait "École")
+    """
+    return value.casefold() if value is not None else None
+
 class Team(Base):
     __tablename__ = "teams"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
+    company = Column(String, nullable=True)  # Entreprise commune aux deux joueurs (dénormalisée)
+    # search_key(name) / search_key(company), tenus à jour en Python et indexés
+    name_key = Column(String, nullable=True, index=True)
+    company_key = Column(String, nullable=True, index=True)
     
     # Relation avec Player
     players = relationship("Player", back_populates="team")
@@ -76,6 +91,33 @@ class Team(Base):
     matches_as_team1 = relationship("Match", foreign_keys="[Match.team1_id]", back_populates="team1")
     matches_as_team2 = relationship("Match", foreign_keys="[Match.team2_id]", back_populates="team2")
 
+    @validates("name")
+    def _set_name_key(self, key, value):
+        self.name_key = search_key(value)
+        return value
+
+    @validates("company")
+    def _set_company_key(self, key, value):
+        self.company_key = search_key(value)
+        return value
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_team_company(session, flush_context):
+    """Une équipe prend l'entreprise de ses joueurs, quel que soit le chemin d'écriture"""
+    teams = Team.__table__
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Player) or obj.team_id is None:
+            continue
+        state = inspect(obj)
+        if obj in session.new or state.attrs.team_id.history.has_changes() or state.attrs.company.history.has_changes():
+            session.connection().execute(
+                update(teams)
+                .where(teams.c.id == obj.team_id)
+                .where(or_(teams.c.company.is_(None), teams.c.company != obj.company))
+                .values(company=obj.company, company_key=search_key(obj.company))
+            )
+
 class Pool(Base):
     __tablename__ = "pools"
     
@@ -100,6 +142,21 @@ class Event(Base):
     
     matches = relationship("Match", back_populates="event", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_events_date_start_time", "date", "start_time"),
+    )
+
+def add_minutes(start: time, minutes: int) -> time:
+    """Heure de fin d'un créneau, bornée à la fin de journée"""
+    end = datetime.combine(date.min, start) + timedelta(minutes=minutes)
+    return end.time() if end.date() == date.min else time.max
+
+@event.listens_for(Event, "before_insert")
+def _default_end_time(mapper, connection, target):
+    """Un événement sans heure de fin dure la durée standard d'un match"""
+    if target.end_time is None:
+        target.end_time = add_minutes(target.start_time, settings.match_duration_minutes)
+
 class Match(Base):
     __tablename__ = "matches"
     
@@ -107,13 +164,102 @@ class Match(Base):
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     court_number = Column(Integer, nullable=False)
     
-    team1_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
-    team2_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    team1_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
+    team2_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
     
     status = Column(SQLAlchemyEnum(MatchStatus), default=MatchStatus.A_VENIR, nullable=False)
     score_team1 = Column(String, nullable=True)
     score_team2 = Column(String, nullable=True)
+
+    # Créneau réservé (copie de Event.date / Event.start_time) : la base interdit
+    # deux matchs non annulés sur la même piste au même créneau
+    slot_date = Column(Date, nullable=True)
+    slot_time = Column(Time, nullable=True)
+    slot_end_time = Column(Time, nullable=True)
     
     event = relationship("Event", back_populates="matches")
     team1 = relationship("Team", foreign_keys=[team1_id], back_populates="matches_as_team1")
     team2 = relationship("Team", foreign_keys=[team2_id], back_populates="matches_as_team2")
+    sets = relationship(
+        "MatchSet",
+        back_populates="match",
+        order_by="MatchSet.set_number",
+        cascade="all, delete-orphan"
+    )
+
+    __table_args__ = (
+        Index(
+            "uq_matches_court_slot", "slot_date", "slot_time", "court_number",
+            unique=True,
+            sqlite_where=text("status != 'ANNULE'"),
+            postgresql_where=text("status != 'ANNULE'")
+        ),
+        # Recherche de chevauchement : même jour, même piste, plage d'heures
+        Index("ix_matches_court_day", "slot_date", "court_number", "slot_time"),
+    )
+
+@event.listens_for(Session, "after_flush")
+def _sync_match_slots(session, flush_context):
+    """Recopie la date/heure de l'événement sur les matchs créés sans créneau ou déplacés"""
+    match_ids = [
+        obj.id for obj in session.new
+        if isinstance(obj, Match) and None in (obj.slot_date, obj.slot_time, obj.slot_end_time)
+    ]
+    event_ids = [
+        obj.id for obj in session.dirty
+        if isinstance(obj, Event) and session.is_modified(obj, include_collections=False)
+    ]
+    if not (match_ids or event_ids):
+        return
+
+    matches = Match.__table__
+    events = Event.__table__
+    of_event = events.c.id == matches.c.event_id
+    session.connection().execute(
+        update(matches)
+        .where(or_(matches.c.id.in_(match_ids), matches.c.event_id.in_(event_ids)))
+        .values(
+            slot_date=select(events.c.date).where(of_event).scalar_subquery(),
+            slot_time=select(events.c.start_time).where(of_event).scalar_subquery(),
+            slot_end_time=select(events.c.end_time).where(of_event).scalar_subquery()
+        )
+    )
+
+class MatchSet(Base):
+    """Jeux d'un set, du point de vue de l'équipe 1 (score_team1 en forme structurée)"""
+    __tablename__ = "match_sets"
+
+    match_id = Column(Integer, ForeignKey("matches.id", ondelete="CASCADE"), primary_key=True)
+    set_number = Column(Integer, primary_key=True)
+    games_team1 = Column(Integer, nullable=False)
+    games_team2 = Column(Integer, nullable=False)
+
+    match = relationship("Match", back_populates="sets")
+
+def build_match_sets(score_team1):
+    """Convertit un score texte en lignes match_sets (aucune si vide ou mal formé)"""
+    return [
+        MatchSet(set_number=i + 1, games_team1=g1, games_team2=g2)
+        for i, (g1, g2) in enumerate(decode_score(score_team1) or [])
+    ]
+
+@event.listens_for(Match.score_team1, "set")
+def _sync_match_sets(match, value, oldvalue, initiator):
+    """Garde match_sets aligné sur le score texte reçu par l'API"""
+    match.sets = build_match_sets(value)
+
+class TeamStanding(Base):
+    """Classement d'une équipe, maintenu à chaque écriture sur un match"""
+    __tablename__ = "team_standings"
+
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True)
+    matches_played = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    losses = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+    sets_won = Column(Integer, nullable=False, default=0)
+    sets_lost = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_team_standings_order", points.desc(), wins.desc()),
+    )
@@ -2,8 +2,10 @@
 # FICHIER : backend/app/schemas/admin.py
 # ============================================
 
-from pydantic import BaseModel, EmailStr, Field, field_validator, ConfigDict
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator, ConfigDict
 from typing import List, Optional
+from datetime import date, time
+from app.schemas.planning import EventCreate
 import re
 
 # --- Players ---
@@ -97,10 +99,55 @@ class PoolResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+class PoolScheduleCreate(BaseModel):
+    pool_ids: List[int] = Field(..., min_length=1)
+    dates: List[date] = Field(..., min_length=1)  # Jours disponibles
+    start_times: List[time] = Field(..., min_length=1)  # Heures de début possibles chaque jour
+    courts: List[int] = Field(default_factory=lambda: list(range(1, 11)), min_length=1)
+    duration_minutes: Optional[int] = Field(None, ge=15, le=240)
+    dry_run: bool = False  # Renvoie le planning sans l'enregistrer
+
+    @field_validator('dates')
+    @classmethod
+    def validate_dates(cls, v):
+        if min(v) < date.today():
+            raise ValueError("La date ne peut pas être dans le passé")
+        return v
+
+    @field_validator('courts')
+    @classmethod
+    def validate_courts(cls, v):
+        if any(not 1 <= c <= 10 for c in v):
+            raise ValueError("Les pistes sont numérotées de 1 à 10")
+        if len(v) != len(set(v)):
+            raise ValueError("Une piste ne peut apparaître qu'une fois")
+        return v
+
+class UnscheduledPairing(BaseModel):
+    pool_id: int
+    team1_id: int
+    team2_id: int
+
+class PoolScheduleResponse(BaseModel):
+    matches_planned: int
+    event_ids: List[int]
+    events: List[EventCreate]
+    unscheduled: List[UnscheduledPairing]
+
 # --- Accounts ---
 class AccountCreate(BaseModel):
     player_id: int
 
+class BulkAccountCreate(BaseModel):
+    player_ids: Optional[List[int]] = None
+    all_without_account: bool = False  # Tous les joueurs qui n'ont pas encore de compte
+
+    @model_validator(mode='after')
+    def validate_selection(self):
+        if (self.player_ids is None) == (not self.all_without_account):
+            raise ValueError("Indiquer soit player_ids, soit all_without_account")
+        return self
+
 class AccountResponse(BaseModel):
     email: str
     temp_password: str
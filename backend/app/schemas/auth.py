@@ -2,9 +2,10 @@
 # FICHIER : backend/app/schemas/auth.py
 # ============================================
 
-from pydantic import BaseModel, EmailStr, Field, field_validator, ValidationInfo, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field, field_validator, computed_field, ValidationInfo, ConfigDict
+from typing import Dict, Optional
 from datetime import date
+from app.core.avatar_urls import avatar_variants
 import re
 
 class LoginRequest(BaseModel):
@@ -62,6 +63,12 @@ class UserResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+    @computed_field
+    @property
+    def profile_picture_sizes(self) -> Dict[int, str]:
+        """URL de la photo par taille en pixels (64, 128, 256)"""
+        return avatar_variants(self.profile_picture)
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str
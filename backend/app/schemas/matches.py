@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field, field_validator, ValidationInfo, ConfigDi
 from typing import Optional, List
 from datetime import date as date_type, time as time_type
 from enum import Enum
+from app.core import scores
 
 class MatchStatus(str, Enum):
     A_VENIR = "A_VENIR"
@@ -49,6 +50,7 @@ class MatchCreate(BaseModel):
     court_number: int = Field(..., ge=1, le=10)
     team1_id: int
     team2_id: int
+    duration_minutes: Optional[int] = Field(None, ge=15, le=240)  # Durée standard si absent
 
     @field_validator('team2_id')
     @classmethod
@@ -65,8 +67,6 @@ class MatchCreate(BaseModel):
             raise ValueError("La date ne peut pas être dans le passé")
         return v
 
-import re
-
 class MatchUpdate(BaseModel):
     date: Optional[date_type] = None
     time: Optional[time_type] = None
@@ -80,59 +80,7 @@ class MatchUpdate(BaseModel):
     def validate_score(cls, v):
         if v is None or (isinstance(v, str) and v.strip() == ""):
             return None
-        
-        if not re.match(r"^\d+-\d+(, \d+-\d+){1,2}$", v):
-            raise ValueError("Format de score invalide")
-        
-        sets = v.split(", ")
-        if len(sets) > 3:
-            raise ValueError("Un match se joue au meilleur de 3 sets maximum")
-            
-        for s in sets:
-            try:
-                games_1, games_2 = map(int, s.split("-"))
-            except ValueError:
-                raise ValueError("Les scores doivent être des nombres entiers")
-                
-            if games_1 < 0 or games_2 < 0:
-                raise ValueError("Les scores ne peuvent pas être négatifs")
-                
-            # Le vainqueur d'un set doit avoir au moins 6 jeux
-            if max(games_1, games_2) < 6:
-                raise ValueError("Le vainqueur d'un set doit avoir au moins 6 jeux")
-                
-            # Si un set se termine 7-X, X doit être <= 5 (sauf tie-break 7-6)
-            if games_1 == 7 and games_2 > 6:
-                raise ValueError("Score de set invalide (7-X avec X > 6 impossible)")
-            if games_2 == 7 and games_1 > 6:
-                raise ValueError("Score de set invalide (X-7 avec X > 6 impossible)")
-                
-            # Ecart de 2 jeux minimum sauf si 7-6
-            diff = abs(games_1 - games_2)
-            if diff < 2 and not (games_1 == 7 and games_2 == 6) and not (games_1 == 6 and games_2 == 7):
-                 raise ValueError("Il faut 2 jeux d'écart pour gagner un set (sauf tie-break 7-6)")
-                 
-            if max(games_1, games_2) > 7:
-                 raise ValueError("Impossible d'avoir plus de 7 jeux dans un set")
-
-        # Vérifier qu'une équipe a gagné au moins 2 sets
-        sets_won_1 = 0
-        sets_won_2 = 0
-        
-        for i, s in enumerate(sets):
-            g1, g2 = map(int, s.split("-"))
-            if g1 > g2:
-                sets_won_1 += 1
-            elif g2 > g1:
-                sets_won_2 += 1
-            
-            # Si une équipe a déjà gagné 2 sets et qu'il reste des sets à jouer
-            if (sets_won_1 == 2 or sets_won_2 == 2) and i < len(sets) - 1:
-                 raise ValueError("Le match est déjà terminé après 2 sets gagnants")
-        
-        if sets_won_1 < 2 and sets_won_2 < 2:
-            raise ValueError("Il faut au moins 2 sets gagnants pour terminer un match")
-            
+        scores.validate_score(v)
         return v
     
     @field_validator('date')
@@ -149,6 +97,7 @@ class MatchResponse(BaseModel):
     id: int
     date: date_type
     time: time_type
+    end_time: Optional[time_type] = None
     court_number: int
     status: MatchStatus
     score_team1: Optional[str] = None
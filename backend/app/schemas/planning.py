@@ -22,6 +22,7 @@ class MatchCreationInEvent(BaseModel):
 class EventCreate(BaseModel):
     date: date
     start_time: time
+    duration_minutes: Optional[int] = Field(None, ge=15, le=240)  # Durée standard si absent
     matches: List[MatchCreationInEvent]
 
     @field_validator('date')
@@ -65,6 +66,20 @@ class EventResponse(BaseModel):
     id: int
     date: date
     start_time: time
+    end_time: Optional[time] = None
     matches: List[MatchInEventResponse]
     
     model_config = ConfigDict(from_attributes=True)
+
+class BulkPlanningCreate(BaseModel):
+    events: List[EventCreate] = Field(..., min_length=1, max_length=1000)
+    all_or_nothing: bool = False  # Si vrai, une seule erreur annule tout le lot
+
+class BulkItemError(BaseModel):
+    index: int  # Position de l'événement dans la requête
+    detail: str
+
+class BulkPlanningResponse(BaseModel):
+    created: int
+    event_ids: List[int]
+    errors: List[BulkItemError]
@@ -0,0 +1,115 @@
+# ============================================
+# FICHIER : backend/app/services/avatars.py
+# ============================================
+
+import hashlib
+import logging
+import os
+import time
+from typing import List, Optional
+
+from PIL import Image, ImageOps
+from sqlalchemy.orm import Session
+
+from app.core.avatar_urls import AVATAR_SIZES, AVATAR_URL_PREFIX, UPLOAD_URL_PREFIX, avatar_url, avatar_variants
+from app.core.uploads import UploadRejected
+from app.models.models import User
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = "static/uploads"  # Lu à chaque appel (les tests le redirigent vers un dossier temporaire)
+MAX_IMAGE_PIXELS = 25_000_000  # Au-delà, refus (image compressée qui exploserait en mémoire)
+ORPHAN_GRACE_SECONDS = 3600  # Un fichier plus récent peut appartenir à un upload en cours
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _write_variant(image, size: int, path: str):
+    """Recadrage carré centré, redimensionnement et écriture WebP (fichier temporaire puis renommage)"""
+    variant = ImageOps.fit(image, (size, size), Image.LANCZOS)
+    temp_path = f"{path}.part"
+    variant.save(temp_path, "WEBP", quality=85, method=4)
+    os.replace(temp_path, path)
+
+def store_avatar(temp_path: str) -> str:
+    """
+    Normalise l'image reçue en vignettes WebP carrées (AVATAR_SIZES), nommées par l'empreinte
+    SHA-256 du fichier d'origine : une image déjà connue n'est ni recalculée ni dupliquée.
+    Le fichier temporaire est consommé. Renvoie l'URL de la plus grande taille.
+    Appel bloquant (disque, décodage) : à exécuter hors de la boucle d'événements.
+    """
+    avatar_dir = os.path.join(UPLOAD_DIR, "avatars")
+    os.makedirs(avatar_dir, exist_ok=True)
+    digest = _file_digest(temp_path)
+
+    try:
+        paths = {size: os.path.join(avatar_dir, f"{digest}-{size}.webp") for size in AVATAR_SIZES}
+        if all(os.path.exists(p) for p in paths.values()):
+            # Déjà stockée : rafraîchir la date pour que le ménage ne la supprime pas
+            for p in paths.values():
+                os.utime(p)
+        else:
+            try:
+                with Image.open(temp_path) as image:
+                    width, height = image.size
+                    if width * height > MAX_IMAGE_PIXELS:
+                        raise UploadRejected("Image trop grande")
+                    image = ImageOps.exif_transpose(image)
+                    image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+                    for size, path in paths.items():
+                        _write_variant(image, size, path)
+            except (OSError, Image.DecompressionBombError) as e:
+                logger.info("Avatar illisible : %s", e)
+                raise UploadRejected("Image illisible")
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return avatar_url(digest, max(AVATAR_SIZES))
+
+def remove_legacy_avatar(profile_picture: Optional[str]):
+    """
+    Supprime une ancienne photo propre à un utilisateur ({user_id}_{uuid}.ext).
+    Les fichiers stockés par empreinte peuvent être partagés : le ménage s'en charge.
+    """
+    if not profile_picture or profile_picture.startswith(AVATAR_URL_PREFIX):
+        return
+    # On suppose que profile_picture est stocké comme "/static/uploads/filename"
+    old_path = profile_picture.lstrip("/")
+    if os.path.exists(old_path):
+        os.remove(old_path)
+
+def sweep_orphan_uploads(db: Session, grace_seconds: float = ORPHAN_GRACE_SECONDS) -> List[str]:
+    """
+    Supprime les fichiers de static/uploads qu'aucun User.profile_picture ne référence plus
+    (toutes les tailles d'une photo référencée sont conservées). Les fichiers modifiés
+    depuis moins de `grace_seconds` sont épargnés : ils peuvent appartenir à un upload
+    dont le commit n'est pas encore fait. Renvoie les chemins supprimés.
+    """
+    # Chemins relatifs à UPLOAD_DIR encore utilisés
+    referenced = set()
+    for (picture,) in db.query(User.profile_picture).filter(User.profile_picture.isnot(None)):
+        for url in [picture, *avatar_variants(picture).values()]:
+            if url.startswith(UPLOAD_URL_PREFIX):
+                referenced.add(url[len(UPLOAD_URL_PREFIX):])
+
+    removed = []
+    cutoff = time.time() - grace_seconds
+    for root, _, files in os.walk(UPLOAD_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.relpath(path, UPLOAD_DIR).replace(os.sep, "/") in referenced:
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed.append(path)
+            except FileNotFoundError:
+                pass
+    if removed:
+        logger.info("%d fichier(s) orphelin(s) supprimé(s) dans %s", len(removed), UPLOAD_DIR)
+    return removed
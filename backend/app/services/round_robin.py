@@ -0,0 +1,156 @@
+# ============================================
+# FICHIER : backend/app/services/round_robin.py
+# ============================================
+
+from collections import defaultdict
+from datetime import date, time
+from math import ceil
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.models import Match, MatchStatus, Team
+from app.schemas.planning import EventCreate, MatchCreationInEvent
+from app.services.scheduling import CourtSchedule, TeamSchedule, slot_end
+
+MAX_MATCHES_PER_EVENT = 3
+
+Pairing = Tuple[int, int, int]  # (poule, équipe 1, équipe 2)
+
+def round_robin_rounds(team_ids: Sequence[int]) -> List[List[Tuple[int, int]]]:
+    """
+    Méthode du cercle : n-1 journées où chaque équipe joue une fois (exempte si n est impair).
+    Les domiciles alternent pour l'équipe fixe comme pour les autres.
+    """
+    teams = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)
+    n = len(teams)
+    rounds = []
+    for r in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            home, away = teams[i], teams[n - 1 - i]
+            if home is None or away is None:
+                continue
+            pairs.append((home, away) if (r + i) % 2 == 0 else (away, home))
+        rounds.append(pairs)
+        # L'équipe en tête reste fixe, les autres tournent d'un cran
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
+
+def pending_pairings(db: Session, pools: Dict[int, List[int]]) -> List[Pairing]:
+    """
+    Rencontres à planifier, journée par journée en alternant les poules : chaque équipe
+    joue une fois par journée, l'ordre de la liste étale donc ses matchs dans le temps.
+    Les rencontres déjà programmées (non annulées) sont ignorées, ce qui permet de relancer
+    la génération après un calendrier insuffisant.
+    """
+    team_ids = [t for teams in pools.values() for t in teams]
+    existing = db.execute(
+        select(Match.team1_id, Match.team2_id).where(
+            Match.team1_id.in_(team_ids),
+            Match.team2_id.in_(team_ids),
+            Match.status != MatchStatus.ANNULE
+        )
+    ).all()
+    played = {frozenset(pair) for pair in existing}
+
+    rounds_by_pool = {pool_id: round_robin_rounds(teams) for pool_id, teams in pools.items()}
+    max_rounds = max((len(r) for r in rounds_by_pool.values()), default=0)
+    pairings = []
+    for r in range(max_rounds):
+        for pool_id, rounds in rounds_by_pool.items():
+            if r < len(rounds):
+                pairings.extend(
+                    (pool_id, t1, t2) for t1, t2 in rounds[r] if frozenset((t1, t2)) not in played
+                )
+    return pairings
+
+def plan_round_robin(
+    db: Session,
+    pools: Dict[int, List[int]],
+    dates: Sequence[date],
+    start_times: Sequence[time],
+    courts: Sequence[int],
+    duration_minutes: Optional[int] = None
+) -> Tuple[List[EventCreate], List[Pairing]]:
+    """
+    Répartit les rencontres des poules sur le calendrier (dates x heures de début x pistes).
+
+    Glouton chronologique : pour chaque créneau, on prend dans l'ordre des journées les
+    rencontres dont aucune équipe n'est déjà engagée sur un créneau qui chevauche, en
+    plafonnant le nombre de matchs d'une équipe par jour (au plus juste selon le calendrier)
+    pour étaler la saison. Les matchs d'un créneau sont regroupés par événements de 3 au plus,
+    chacun sur une piste distincte et libre (réservations existantes comprises).
+
+    Renvoie les événements à créer et les rencontres qui n'ont pas trouvé de place.
+    """
+    pairings = pending_pairings(db, pools)
+    days = sorted(set(dates))
+    slots = [(day, start) for day in days for start in sorted(set(start_times))]
+    if not pairings or not slots:
+        return [], pairings
+
+    end_times = {start: slot_end(start, duration_minutes) for start in set(start_times)}
+    team_ids = {t for teams in pools.values() for t in teams}
+    court_schedule = CourtSchedule.load(db, days)
+    team_schedule = TeamSchedule.load(db, days, team_ids)
+
+    # Plafond journalier : le minimum permettant de caser tous les matchs d'une équipe
+    matches_per_team = defaultdict(int)
+    for _, t1, t2 in pairings:
+        matches_per_team[t1] += 1
+        matches_per_team[t2] += 1
+    daily_cap = max(1, ceil(max(matches_per_team.values()) / len(days)))
+    played_on = defaultdict(int)  # (jour, équipe) -> matchs planifiés
+
+    events = []
+    pending = pairings
+    for day, start in slots:
+        if not pending:
+            break
+        end = end_times[start]
+        free_courts = [c for c in courts if not court_schedule.find_overlap(day, c, start, end)]
+        selected, remaining = [], []
+        for pairing in pending:
+            _, t1, t2 = pairing
+            if (
+                len(selected) < len(free_courts)
+                and played_on[(day, t1)] < daily_cap
+                and played_on[(day, t2)] < daily_cap
+                and team_schedule.find_busy(day, (t1, t2), start, end) is None
+            ):
+                team_schedule.add(day, (t1, t2), start, end)
+                played_on[(day, t1)] += 1
+                played_on[(day, t2)] += 1
+                selected.append(pairing)
+            else:
+                remaining.append(pairing)
+        pending = remaining
+
+        for i in range(0, len(selected), MAX_MATCHES_PER_EVENT):
+            chunk = selected[i:i + MAX_MATCHES_PER_EVENT]
+            matches = []
+            for (_, t1, t2), court in zip(chunk, free_courts[i:i + MAX_MATCHES_PER_EVENT]):
+                court_schedule.add(day, court, start, end)
+                matches.append(MatchCreationInEvent(court_number=court, team1_id=t1, team2_id=t2))
+            events.append(EventCreate(
+                date=day,
+                start_time=start,
+                duration_minutes=duration_minutes,
+                matches=matches
+            ))
+
+    return events, pending
+
+def load_pools(db: Session, pool_ids: Sequence[int]) -> Dict[int, List[int]]:
+    """Équipes de chaque poule demandée, triées par identifiant (poules vides exclues)"""
+    pools = defaultdict(list)
+    rows = db.execute(
+        select(Team.pool_id, Team.id).where(Team.pool_id.in_(list(pool_ids))).order_by(Team.pool_id, Team.id)
+    )
+    for pool_id, team_id in rows:
+        pools[pool_id].append(team_id)
+    return dict(pools)
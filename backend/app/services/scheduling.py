@@ -0,0 +1,256 @@
+# ============================================
+# FICHIER : backend/app/services/scheduling.py
+# ============================================
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, time
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Event, Match, MatchStatus, Team, add_minutes
+
+MINUTES_PER_DAY = 24 * 60
+
+def minutes_of(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+def slot_end(start: time, duration_minutes: Optional[int] = None) -> time:
+    """Heure de fin d'un créneau ; lève ValueError s'il déborde sur le lendemain"""
+    duration = duration_minutes or settings.match_duration_minutes
+    if minutes_of(start) + duration > MINUTES_PER_DAY:
+        raise ValueError("Le match doit se terminer avant minuit")
+    return add_minutes(start, duration)
+
+class SlotConflict(Exception):
+    """Piste déjà occupée sur le créneau demandé"""
+
+    def __init__(self, court: Optional[int] = None):
+        super().__init__(court)
+        self.court = court
+
+def is_slot_conflict(error: IntegrityError) -> bool:
+    """Indique si une IntegrityError vient de l'index unique piste/créneau"""
+    message = str(error.orig)
+    return "uq_matches_court_slot" in message or "matches.slot_date" in message
+
+@contextmanager
+def reserve_slots(db: Session):
+    """
+    Savepoint de réservation : les matchs sont insérés puis vérifiés dans le même savepoint.
+    L'index unique rejette un même départ, find_court_conflict un chevauchement ; l'insertion
+    prend le verrou d'écriture SQLite, une réservation concurrente ne peut pas passer entre les deux.
+    Toute violation de l'index est convertie en SlotConflict.
+    """
+    try:
+        with db.begin_nested():
+            yield
+    except IntegrityError as e:
+        if not is_slot_conflict(e):
+            raise
+        raise SlotConflict() from e
+
+def find_court_conflict(
+    db: Session,
+    day: date,
+    start: time,
+    end: time,
+    courts: Iterable[int],
+    exclude_event_id: Optional[int] = None
+) -> Optional[int]:
+    """
+    Première piste parmi `courts` déjà occupée sur [start, end[ ce jour-là.
+    Requête par intervalle sur l'index (slot_date, court_number, slot_time).
+    """
+    query = db.query(Match.court_number).filter(
+        Match.slot_date == day,
+        Match.court_number.in_(list(courts)),
+        Match.slot_time < end,
+        Match.slot_end_time > start,
+        Match.status != MatchStatus.ANNULE
+    )
+    if exclude_event_id is not None:
+        query = query.filter(Match.event_id != exclude_event_id)
+    return query.order_by(Match.court_number).limit(1).scalar()
+
+class CourtSchedule:
+    """
+    Index en mémoire des réservations, par (jour, piste).
+    Sur une piste donnée les créneaux ne se chevauchent pas : triés par début, ils le sont
+    aussi par fin, et un chevauchement se détecte par dichotomie en O(log n).
+    """
+
+    def __init__(self):
+        self._bookings = defaultdict(list)  # (jour, piste) -> [(début, fin, match_id)] triés
+
+    @classmethod
+    def load(cls, db: Session, days: Iterable[date], exclude_event_ids: Iterable[int] = ()) -> "CourtSchedule":
+        """Charge en une requête les réservations non annulées des jours donnés"""
+        schedule = cls()
+        rows = db.query(
+            Match.slot_date, Match.court_number, Match.slot_time, Match.slot_end_time, Match.id
+        ).filter(
+            Match.slot_date.in_(list(set(days))),
+            Match.status != MatchStatus.ANNULE
+        )
+        exclude_event_ids = list(exclude_event_ids)
+        if exclude_event_ids:
+            rows = rows.filter(Match.event_id.notin_(exclude_event_ids))
+        for day, court, start, end, match_id in rows:
+            if start is not None and end is not None:
+                schedule.add(day, court, start, end, match_id)
+        return schedule
+
+    def find_overlap(self, day: date, court: int, start: time, end: time):
+        """Réservation qui chevauche [start, end[ sur cette piste, ou None"""
+        bookings = self._bookings[(day, court)]
+        start_min, end_min = minutes_of(start), minutes_of(end)
+        # Dernière réservation commençant avant la fin demandée
+        i = bisect_left(bookings, (end_min,)) - 1
+        if i >= 0 and bookings[i][1] > start_min:
+            return bookings[i]
+        return None
+
+    def add(self, day: date, court: int, start: time, end: time, match_id: int = 0):
+        insort(self._bookings[(day, court)], (minutes_of(start), minutes_of(end), match_id))
+
+class TeamSchedule:
+    """
+    Créneaux déjà pris par chaque équipe, par (jour, équipe).
+    Une équipe joue peu de matchs par jour : un parcours linéaire suffit, et reste juste
+    même si des matchs existants se chevauchent (rien ne l'interdisait avant).
+    """
+
+    def __init__(self):
+        self._bookings = defaultdict(list)  # (jour, équipe) -> [(début, fin)]
+
+    @classmethod
+    def load(cls, db: Session, days: Iterable[date], team_ids: Iterable[int]) -> "TeamSchedule":
+        """Charge en une requête les matchs non annulés de ces équipes sur les jours donnés"""
+        schedule = cls()
+        team_ids = list(set(team_ids))
+        rows = db.query(
+            Match.slot_date, Match.team1_id, Match.team2_id, Match.slot_time, Match.slot_end_time
+        ).filter(
+            Match.slot_date.in_(list(set(days))),
+            Match.status != MatchStatus.ANNULE,
+            or_(Match.team1_id.in_(team_ids), Match.team2_id.in_(team_ids))
+        )
+        for day, team1_id, team2_id, start, end in rows:
+            if start is not None and end is not None:
+                schedule.add(day, (team1_id, team2_id), start, end)
+        return schedule
+
+    def find_busy(self, day: date, team_ids: Iterable[int], start: time, end: time) -> Optional[int]:
+        """Première équipe déjà engagée sur un créneau qui chevauche [start, end[, ou None"""
+        start_min, end_min = minutes_of(start), minutes_of(end)
+        for team_id in team_ids:
+            for booked_start, booked_end in self._bookings[(day, team_id)]:
+                if booked_start < end_min and booked_end > start_min:
+                    return team_id
+        return None
+
+    def add(self, day: date, team_ids: Iterable[int], start: time, end: time):
+        for team_id in team_ids:
+            self._bookings[(day, team_id)].append((minutes_of(start), minutes_of(end)))
+
+def bulk_create_events(
+    db: Session,
+    events: list,
+    all_or_nothing: bool = False
+) -> Tuple[List[int], List[Tuple[int, str]]]:
+    """
+    Planifie un lot d'événements (schémas EventCreate) dans la transaction courante.
+
+    Les conflits sont vérifiés pour tout le lot en mémoire, après deux requêtes ensemblistes
+    (réservations des pistes et matchs des équipes sur les jours concernés) : piste occupée,
+    équipe déjà engagée sur un créneau qui chevauche, équipe inconnue, débordement après minuit.
+    Les éléments valides sont insérés par executemany (événements puis matchs) ;
+    les autres sont renvoyés sous forme (index, message). Avec all_or_nothing,
+    rien n'est inséré dès qu'un élément est en erreur.
+
+    Après insertion le verrou d'écriture est pris : les réservations sont relues (hors lot)
+    et revérifiées, pour ne rien rater de ce qui a été validé entre-temps. Un conflit à ce
+    stade annule tout le lot (SlotConflict), de même qu'une violation de l'index unique.
+    Le commit reste à la charge de l'appelant.
+    """
+    errors = []
+    if not events:
+        return [], errors
+
+    days = {e.date for e in events}
+    team_ids = {t for e in events for m in e.matches for t in (m.team1_id, m.team2_id)}
+    known_teams = set(db.scalars(select(Team.id).where(Team.id.in_(team_ids))))
+    courts = CourtSchedule.load(db, days)
+    teams = TeamSchedule.load(db, days, team_ids)
+
+    accepted = []  # (index, événement, heure de fin)
+    for index, event_in in enumerate(events):
+        try:
+            end_time = slot_end(event_in.start_time, event_in.duration_minutes)
+        except ValueError as e:
+            errors.append((index, str(e)))
+            continue
+
+        unknown = [t for m in event_in.matches for t in (m.team1_id, m.team2_id) if t not in known_teams]
+        if unknown:
+            errors.append((index, f"Équipe {unknown[0]} introuvable"))
+            continue
+
+        busy_court = next((
+            m.court_number for m in event_in.matches
+            if courts.find_overlap(event_in.date, m.court_number, event_in.start_time, end_time)
+        ), None)
+        if busy_court is not None:
+            errors.append((index, f"La piste {busy_court} est déjà occupée à ce créneau"))
+            continue
+
+        event_teams = [t for m in event_in.matches for t in (m.team1_id, m.team2_id)]
+        busy_team = teams.find_busy(event_in.date, event_teams, event_in.start_time, end_time)
+        if busy_team is not None:
+            errors.append((index, f"L'équipe {busy_team} joue déjà sur ce créneau"))
+            continue
+
+        for m in event_in.matches:
+            courts.add(event_in.date, m.court_number, event_in.start_time, end_time)
+        teams.add(event_in.date, event_teams, event_in.start_time, end_time)
+        accepted.append((index, event_in, end_time))
+
+    if not accepted or (errors and all_or_nothing):
+        return [], errors
+
+    with reserve_slots(db):
+        event_ids = db.scalars(
+            insert(Event).returning(Event.id, sort_by_parameter_order=True),
+            [
+                {"date": e.date, "start_time": e.start_time, "end_time": end_time}
+                for _, e, end_time in accepted
+            ]
+        ).all()
+        db.execute(insert(Match), [
+            {
+                "event_id": event_id,
+                "court_number": m.court_number,
+                "team1_id": m.team1_id,
+                "team2_id": m.team2_id,
+                "status": MatchStatus.A_VENIR,
+                "slot_date": e.date,
+                "slot_time": e.start_time,
+                "slot_end_time": end_time
+            }
+            for event_id, (_, e, end_time) in zip(event_ids, accepted)
+            for m in e.matches
+        ])
+
+        current = CourtSchedule.load(db, days, exclude_event_ids=event_ids)
+        for _, e, end_time in accepted:
+            for m in e.matches:
+                if current.find_overlap(e.date, m.court_number, e.start_time, end_time):
+                    raise SlotConflict(m.court_number)
+
+    return list(event_ids), errors
@@ -0,0 +1,227 @@
+# ============================================
+# FICHIER : backend/app/services/standings.py
+# ============================================
+
+from typing import Optional
+
+from sqlalchemy import event, inspect, update, insert, delete, select, func, case, union_all
+from sqlalchemy.orm import Session
+
+from app.core.scores import decode_score, count_sets
+from app.models.models import Match, MatchSet, MatchStatus, Team, TeamStanding
+
+STAT_FIELDS = ("matches_played", "wins", "losses", "points", "sets_won", "sets_lost")
+POINTS_PER_WIN = 3
+
+def empty_stats() -> dict:
+    return {field: 0 for field in STAT_FIELDS}
+
+def match_contribution(status, score_team1, team1_id, team2_id) -> dict:
+    """Calcule l'apport d'un match au classement : team_id -> stats"""
+    if status != MatchStatus.TERMINE or not score_team1:
+        return {}
+
+    sets = decode_score(score_team1)
+    if not sets:
+        return {}  # Ignorer les scores mal formés
+
+    t1_sets, t2_sets = count_sets(sets)
+    team1_wins = t1_sets > t2_sets
+    result = {}
+    for team_id, won, sets_won, sets_lost in (
+        (team1_id, team1_wins, t1_sets, t2_sets),
+        (team2_id, not team1_wins, t2_sets, t1_sets),
+    ):
+        result[team_id] = {
+            "matches_played": 1,
+            "wins": 1 if won else 0,
+            "losses": 0 if won else 1,
+            "points": POINTS_PER_WIN if won else 0,
+            "sets_won": sets_won,
+            "sets_lost": sets_lost,
+        }
+    return result
+
+CONTRIBUTION_FIELDS = ("status", "score_team1", "team1_id", "team2_id")
+_BEFORE_KEY = "standings_before"
+
+def _contribution_from_history(match: Match) -> Optional[dict]:
+    """Apport d'avant le flush d'après l'historique des attributs, ou None s'il est incomplet"""
+    state = inspect(match)
+    values = []
+    for attr in CONTRIBUTION_FIELDS:
+        history = state.attrs[attr].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        else:
+            return None
+    return match_contribution(*values)
+
+def _committed_contribution(session: Session, match: Match) -> dict:
+    """
+    Apport au classement de la ligne telle qu'en base, à appeler avant le flush.
+    L'historique ne connaît pas l'ancienne valeur d'un attribut expiré (après un
+    commit) puis modifié, ni celle d'un match expiré supprimé : la ligne est relue.
+    """
+    contribution = _contribution_from_history(match)
+    if contribution is not None:
+        return contribution
+    table = Match.__table__
+    row = session.connection().execute(
+        select(*(table.c[attr] for attr in CONTRIBUTION_FIELDS)).where(table.c.id == inspect(match).identity[0])
+    ).first()
+    return match_contribution(*row) if row is not None else {}
+
+def _snapshot(match: Match) -> dict:
+    return match_contribution(*(getattr(match, attr) for attr in CONTRIBUTION_FIELDS))
+
+def _apply_delta(connection, team_id: int, delta: dict):
+    """Ajoute un delta à la ligne de classement d'une équipe (la crée si besoin)"""
+    table = TeamStanding.__table__
+    result = connection.execute(
+        update(table)
+        .where(table.c.team_id == team_id)
+        .values({field: table.c[field] + delta[field] for field in STAT_FIELDS})
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(team_id=team_id, **delta))
+
+@event.listens_for(Session, "before_flush")
+def _capture_standings(session: Session, flush_context, instances):
+    """Relève l'apport actuel des matchs modifiés ou supprimés, pour le retirer après le flush"""
+    before = session.info.setdefault(_BEFORE_KEY, {})
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, Match) and inspect(obj).persistent and obj not in before:
+            if obj in session.deleted or session.is_modified(obj, include_collections=False):
+                before[obj] = _committed_contribution(session, obj)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_captured_standings(session: Session):
+    session.info.pop(_BEFORE_KEY, None)
+
+@event.listens_for(Session, "after_flush")
+def _sync_standings(session: Session, flush_context):
+    """Répercute les écritures sur les matchs dans team_standings, dans la même transaction"""
+    deltas = {}
+
+    def accumulate(contribution: dict, sign: int):
+        for team_id, stats in contribution.items():
+            if team_id is None:
+                continue
+            delta = deltas.setdefault(team_id, empty_stats())
+            for field in STAT_FIELDS:
+                delta[field] += sign * stats[field]
+
+    before = session.info.pop(_BEFORE_KEY, {})
+    new_teams = []
+    deleted_teams = []
+
+    for obj in session.new:
+        if isinstance(obj, Match):
+            accumulate(_snapshot(obj), 1)
+        elif isinstance(obj, Team):
+            new_teams.append(obj.id)
+
+    for obj in session.dirty:
+        if isinstance(obj, Match) and session.is_modified(obj, include_collections=False):
+            accumulate(before[obj] if obj in before else _contribution_from_history(obj) or {}, -1)
+            accumulate(_snapshot(obj), 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Match):
+            accumulate(before[obj] if obj in before else _contribution_from_history(obj) or {}, -1)
+        elif isinstance(obj, Team):
+            deleted_teams.append(obj.id)
+
+    if not (deltas or new_teams or deleted_teams):
+        return
+
+    connection = session.connection()
+    table = TeamStanding.__table__
+
+    for team_id in new_teams:
+        deltas.setdefault(team_id, empty_stats())
+
+    for team_id, delta in deltas.items():
+        if team_id not in deleted_teams:
+            _apply_delta(connection, team_id, delta)
+
+    if deleted_teams:
+        connection.execute(delete(table).where(table.c.team_id.in_(deleted_teams)))
+
+def compute_standings(db: Session) -> dict:
+    """Recalcule le classement complet en SQL depuis match_sets : team_id -> stats"""
+    stats = {team_id: empty_stats() for team_id, in db.execute(select(Team.id))}
+
+    # Sets gagnés par chaque équipe, match par match
+    team1_won_set = MatchSet.games_team1 > MatchSet.games_team2
+    per_match = (
+        select(
+            Match.team1_id,
+            Match.team2_id,
+            func.sum(case((team1_won_set, 1), else_=0)).label("sets_1"),
+            func.sum(case((team1_won_set, 0), else_=1)).label("sets_2"),
+        )
+        .join(MatchSet, MatchSet.match_id == Match.id)
+        .where(Match.status == MatchStatus.TERMINE)
+        .group_by(Match.id, Match.team1_id, Match.team2_id)
+        .subquery()
+    )
+
+    # Une ligne par équipe et par match, puis agrégat par équipe
+    sides = union_all(
+        select(
+            per_match.c.team1_id.label("team_id"),
+            per_match.c.sets_1.label("won"),
+            per_match.c.sets_2.label("lost"),
+        ),
+        select(per_match.c.team2_id, per_match.c.sets_2, per_match.c.sets_1),
+    ).subquery()
+    win = case((sides.c.won > sides.c.lost, 1), else_=0)
+
+    rows = db.execute(
+        select(
+            sides.c.team_id,
+            func.count().label("matches_played"),
+            func.sum(win).label("wins"),
+            func.sum(1 - win).label("losses"),
+            func.sum(win * POINTS_PER_WIN).label("points"),
+            func.sum(sides.c.won).label("sets_won"),
+            func.sum(sides.c.lost).label("sets_lost"),
+        ).group_by(sides.c.team_id)
+    )
+    for row in rows:
+        if row.team_id in stats:
+            stats[row.team_id] = {field: int(getattr(row, field)) for field in STAT_FIELDS}
+    return stats
+
+def recompute_standings(db: Session) -> dict:
+    """
+    Reconstruit team_standings depuis zéro et compare avec le contenu actuel.
+    Retourne la liste des équipes dont la ligne était incorrecte.
+    """
+    expected = compute_standings(db)
+
+    table = TeamStanding.__table__
+    current = {
+        row.team_id: {field: getattr(row, field) for field in STAT_FIELDS}
+        for row in db.execute(select(table))
+    }
+
+    mismatches = []
+    for team_id in sorted(set(expected) | set(current)):
+        if expected.get(team_id) != current.get(team_id):
+            mismatches.append({
+                "team_id": team_id,
+                "stored": current.get(team_id),
+                "expected": expected.get(team_id),
+            })
+
+    db.execute(delete(table))
+    if expected:
+        db.execute(insert(table), [{"team_id": team_id, **stats} for team_id, stats in expected.items()])
+    db.commit()
+
+    return {"teams_checked": len(expected), "mismatches": mismatches}
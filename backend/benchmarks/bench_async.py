@@ -0,0 +1,127 @@
+# ============================================
+# FICHIER : backend/benchmarks/bench_async.py
+# ============================================
+"""
+Routes de lecture synchrones (threadpool) contre routes async (ASYNC_DB=true) sous forte concurrence.
+
+Remplit une base SQLite temporaire, puis pour chaque mode lance l'API (uvicorn, processus
+séparé) et fait tourner `--clients` clients simultanés sur /matches, /planning,
+/results/ranking et /auth/me.
+
+    cd backend
+    python -m benchmarks.bench_async --clients 500 --duration 15
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+ENDPOINTS = ("/matches/?all_matches=true", "/planning/", "/results/ranking", "/auth/me")
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000 if samples else 0.0
+
+def seed(workdir):
+    """Base de démonstration : 20 équipes, un mois de planning, un utilisateur ; renvoie un token"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    from app.database import SessionLocal, Base, engine
+    from app.models.models import Event, Match, Player, Team, User
+    from app.core.security import create_access_token
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        teams = []
+        for i in range(20):
+            team = Team(name=f"Équipe {i}")
+            team.players = [
+                Player(firstname="P", lastname=f"{i}{j}", company=f"Entreprise {i}",
+                       email=f"p{i}{j}@bench.com", license_number=f"L{i:03d}{j:03d}")
+                for j in range(2)
+            ]
+            teams.append(team)
+        db.add_all(teams)
+        db.flush()
+        for day in range(30):
+            event = Event(date=date.today() + timedelta(days=day), start_time=dtime(19, 0))
+            event.matches = [
+                Match(court_number=court + 1, team1_id=teams[(day + 2 * court) % 20].id,
+                      team2_id=teams[(day + 2 * court + 1) % 20].id)
+                for court in range(3)
+            ]
+            db.add(event)
+        user = User(email="bench@example.com", password_hash="-", role="ADMINISTRATEUR", is_active=True)
+        db.add(user)
+        db.commit()
+        return create_access_token({"sub": str(user.id)})
+
+async def load(base, token, clients, duration):
+    import httpx
+
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base, headers={"Authorization": f"Bearer {token}"},
+                                 limits=limits, timeout=60) as client:
+        async def worker(n):
+            nonlocal errors
+            i = n
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(ENDPOINTS[i % len(ENDPOINTS)])
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+                i += 1
+
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+    return latencies, errors
+
+def run_mode(async_db, args, token):
+    env = {**os.environ, "ASYNC_DB": "true" if async_db else "false", "UPLOAD_SWEEP_INTERVAL_MINUTES": "0"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--log-level", "warning", "--backlog", str(4 * args.clients)],
+        env=env
+    )
+    try:
+        import httpx
+        base = f"http://127.0.0.1:{args.port}/api/v1"
+        for _ in range(200):
+            try:
+                httpx.get(f"http://127.0.0.1:{args.port}/docs")
+                break
+            except httpx.HTTPError:
+                time.sleep(0.05)
+        latencies, errors = asyncio.run(load(base, token, args.clients, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+    return latencies, errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500, help="Clients simultanés")
+    parser.add_argument("--duration", type=float, default=15, help="Durée de chaque mesure (s)")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    workdir = tempfile.mkdtemp(prefix="bench_async_")
+    token = seed(workdir)
+
+    for name, async_db in (("sync ", False), ("async", True)):
+        latencies, errors = run_mode(async_db, args, token)
+        print(f"{name}: {len(latencies) / args.duration:7.1f} req/s, p50 {percentile(latencies, 0.5):.0f} ms, "
+              f"p99 {percentile(latencies, 0.99):.0f} ms, {errors} erreurs ({args.clients} clients)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# ============================================
+# FICHIER : backend/benchmarks/bench_compression.py
+# ============================================
+"""
+Taille sur le réseau des principales réponses JSON d'une saison, sans compression,
+en gzip et en brotli (si le paquet est installé), avec le temps de réponse moyen.
+
+La saison générée compte une soirée par semaine de septembre à juin, avec un match
+par terrain entre équipes de deux joueurs.
+
+    cd backend
+    python -m benchmarks.bench_compression --teams 24 --courts 6 --repeat 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+SEASON_START = date(2026, 9, 1)
+SEASON_WEEKS = 40
+FIRSTNAMES = ("Camille", "Julien", "Sophie", "Thomas", "Claire", "Nicolas", "Laura", "Antoine")
+
+def seed(teams: int, courts: int):
+    from app.database import Base, SessionLocal, engine
+    from app.models.models import Event, Match, Player, Team, User
+    from app.core.security import create_access_token
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        season_teams = []
+        for i in range(teams):
+            team = Team(name=f"Équipe {i}")
+            team.players = [
+                Player(firstname=FIRSTNAMES[(2 * i + j) % 8], lastname=f"Martin {chr(65 + i % 26)}{chr(65 + j)}",
+                       company=f"Société {i % 8}", email=f"p{i}-{j}@bench.com", license_number=f"L{i:03d}{j:03d}")
+                for j in range(2)
+            ]
+            season_teams.append(team)
+        db.add_all(season_teams)
+        db.flush()
+        for week in range(SEASON_WEEKS):
+            event = Event(date=SEASON_START + timedelta(weeks=week), start_time=dtime(19, 0))
+            event.matches = [
+                Match(court_number=c + 1,
+                      team1_id=season_teams[(week + 2 * c) % teams].id,
+                      team2_id=season_teams[(week + 2 * c + 1 + week // teams) % teams].id)
+                for c in range(courts)
+            ]
+            db.add(event)
+        user = User(email="bench@example.com", password_hash="-", role="ADMINISTRATEUR", is_active=True)
+        db.add(user)
+        db.commit()
+        return create_access_token({"sub": str(user.id)})
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=24)
+    parser.add_argument("--courts", type=int, default=6, help="Matchs par soirée")
+    parser.add_argument("--repeat", type=int, default=20, help="Requêtes par mesure de temps")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_compression_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.core.compression import SUPPORTED_ENCODINGS
+
+    token = seed(args.teams, args.courts)
+    client = TestClient(app)
+    auth = {"Authorization": f"Bearer {token}"}
+    season_end = SEASON_START + timedelta(weeks=SEASON_WEEKS)
+    month_end = SEASON_START + timedelta(days=30)
+    routes = {
+        "matchs (saison)": ("/api/v1/matches/", {"all_matches": True, "start_date": SEASON_START, "end_date": season_end}),
+        "matchs lean": ("/api/v1/matches/", {"all_matches": True, "lean": True, "start_date": SEASON_START, "end_date": season_end}),
+        "planning (mois)": ("/api/v1/planning/", {"start_date": SEASON_START, "end_date": month_end}),
+        "planning (saison)": ("/api/v1/planning/", {"start_date": SEASON_START, "end_date": season_end}),
+        "classement": ("/api/v1/results/ranking", {}),
+        "joueurs": ("/api/v1/admin/players", {}),
+    }
+    encodings = ("identity", *SUPPORTED_ENCODINGS)
+    if "br" not in SUPPORTED_ENCODINGS:
+        print("(paquet brotli non installé : gzip seul)")
+
+    totals = dict.fromkeys(encodings, 0)
+    print(f"{'':18}" + "".join(f"{e:>22}" for e in encodings))
+    for name, (path, params) in routes.items():
+        line = f"{name:18}"
+        for encoding in encodings:
+            headers = {**auth, "Accept-Encoding": encoding}
+            with client.stream("GET", path, params=params, headers=headers) as response:
+                assert response.status_code == 200, response.status_code
+                size = len(b"".join(response.iter_raw()))
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                client.get(path, params=params, headers=headers)
+            ms = (time.perf_counter() - started) * 1000 / args.repeat
+            totals[encoding] += size
+            line += f"{size / 1024:9.1f} Kio {ms:6.1f} ms"
+        print(line)
+    print(f"{'total':18}" + "".join(
+        f"{totals[e] / 1024:9.1f} Kio {totals[e] / totals['identity'] - 1:+6.0%}   " for e in encodings
+    ))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# ============================================
+# FICHIER : backend/benchmarks/bench_login.py
+# ============================================
+"""
+Débit de connexion et latence de GET /matches pendant une rafale de connexions.
+
+Lance l'API (uvicorn, base SQLite temporaire) dans le processus, mesure d'abord
+/matches seul, puis pendant que des clients enchaînent les connexions.
+
+    cd backend
+    python -m benchmarks.bench_login --duration 10 --logins 32
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000 if samples else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10, help="Durée de chaque phase (s)")
+    parser.add_argument("--logins", type=int, default=32, help="Clients qui se connectent en parallèle")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_login_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    import httpx
+    import uvicorn
+    from app.main import app
+    from app.database import SessionLocal
+    from app.models.models import User
+    from app.core.security import get_password_hash
+
+    password = "BenchP@ssw0rd123"
+    with SessionLocal() as db:
+        db.add(User(email="bench@example.com", password_hash=get_password_hash(password), role="JOUEUR", is_active=True))
+        db.commit()
+
+    server = uvicorn.Server(uvicorn.Config(app, port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base = f"http://127.0.0.1:{args.port}/api/v1"
+    credentials = {"email": "bench@example.com", "password": password}
+    token = httpx.post(f"{base}/auth/login", json=credentials).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def read_matches(stop):
+        latencies = []
+        with httpx.Client(headers=headers) as client:
+            while not stop.is_set():
+                started = time.perf_counter()
+                client.get(f"{base}/matches/?all_matches=true")
+                latencies.append(time.perf_counter() - started)
+        return latencies
+
+    # Phase 1 : lectures seules
+    stop = threading.Event()
+    timer = threading.Timer(args.duration, stop.set)
+    timer.start()
+    idle = read_matches(stop)
+
+    # Phase 2 : lectures pendant la rafale de connexions
+    results = {"ok": 0, "rejected": 0, "other": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def login_loop():
+        with httpx.Client(timeout=30) as client:
+            while not stop.is_set():
+                try:
+                    status = client.post(f"{base}/auth/login", json=credentials).status_code
+                except httpx.HTTPError:
+                    status = None
+                key = "ok" if status == 200 else "rejected" if status == 429 else "other"
+                with lock:
+                    results[key] += 1
+
+    loggers = [threading.Thread(target=login_loop) for _ in range(args.logins)]
+    for t in loggers:
+        t.start()
+    started = time.perf_counter()
+    threading.Timer(args.duration, stop.set).start()
+    busy = read_matches(stop)
+    for t in loggers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    server.should_exit = True
+
+    print(f"/matches seul           : {len(idle)} requêtes, p50 {percentile(idle, 0.5):.1f} ms, p99 {percentile(idle, 0.99):.1f} ms")
+    print(f"/matches sous connexions: {len(busy)} requêtes, p50 {percentile(busy, 0.5):.1f} ms, p99 {percentile(busy, 0.99):.1f} ms")
+    print(f"Connexions              : {results['ok'] / elapsed:.1f}/s réussies, "
+          f"{results['rejected']} refusées (429), {results['other']} autres erreurs")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# ============================================
+# FICHIER : backend/benchmarks/bench_middleware.py
+# ============================================
+"""
+Coût du middleware d'en-têtes de sécurité : ASGI pur contre @app.middleware("http").
+
+Appelle l'application ASGI directement (sans serveur ni réseau, pour isoler le coût
+des middlewares) sur /health et /api/v1/matches/, d'abord avec l'ancien
+add_security_headers (BaseHTTPMiddleware), puis avec SecurityHeadersMiddleware.
+
+    cd backend
+    python -m benchmarks.bench_middleware --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+async def add_security_headers(request, call_next):
+    """Ancienne version, via BaseHTTPMiddleware"""
+    response = await call_next(request)
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    response.headers["X-Frame-Options"] = "DENY"
+    response.headers["X-XSS-Protection"] = "1; mode=block"
+    return response
+
+def seed():
+    from app.database import SessionLocal
+    from app.models.models import Event, Match, Team, User
+    from app.core.security import create_access_token
+
+    with SessionLocal() as db:
+        teams = [Team(name=f"Équipe {i}") for i in range(6)]
+        db.add_all(teams)
+        db.flush()
+        for day in range(10):
+            event = Event(date=date.today() + timedelta(days=day), start_time=dtime(19, 0))
+            event.matches = [
+                Match(court_number=c + 1, team1_id=teams[2 * c].id, team2_id=teams[2 * c + 1].id) for c in range(3)
+            ]
+            db.add(event)
+        user = User(email="bench@example.com", password_hash="-", role="ADMINISTRATEUR", is_active=True)
+        db.add(user)
+        db.commit()
+        return create_access_token({"sub": str(user.id)})
+
+async def call(app, path: str, headers: list):
+    """Une requête GET complète sur l'application ASGI ; renvoie le statut"""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "headers": headers, "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)  # Pas de déconnexion pendant la mesure
+
+    status = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+async def measure(app, path: str, headers: list, requests: int) -> float:
+    for _ in range(20):  # Échauffement (caches, pool de connexions)
+        assert await call(app, path, headers) == 200
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path, headers)
+    return requests / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requêtes par mesure")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_middleware_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from starlette.middleware import Middleware
+    from starlette.middleware.base import BaseHTTPMiddleware
+    from app.main import app
+    from app.core.middleware import SecurityHeadersMiddleware
+
+    token = seed()
+    headers = [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())]
+    paths = ("/health", "/api/v1/matches/?all_matches=true")
+
+    pure_asgi = list(app.user_middleware)
+    legacy = [
+        Middleware(BaseHTTPMiddleware, dispatch=add_security_headers) if m.cls is SecurityHeadersMiddleware else m
+        for m in pure_asgi
+    ]
+
+    results = {}
+    for name, stack in (("@app.middleware", legacy), ("ASGI pur", pure_asgi)):
+        app.user_middleware = stack
+        app.middleware_stack = None  # Reconstruit au prochain appel
+        for path in paths:
+            results[name, path] = asyncio.run(measure(app, path, headers, args.requests))
+
+    for path in paths:
+        before, after = results["@app.middleware", path], results["ASGI pur", path]
+        print(f"{path:36} @app.middleware {before:7.0f} req/s   ASGI pur {after:7.0f} req/s   ({after / before - 1:+.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
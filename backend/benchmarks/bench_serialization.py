@@ -0,0 +1,116 @@
+# ============================================
+# FICHIER : backend/benchmarks/bench_serialization.py
+# ============================================
+"""
+Temps CPU de sérialisation des listes de matchs et d'événements, pour 1 000 matchs.
+
+Compare l'encodage standard de FastAPI (validation response_model, sérialisation,
+json.dumps) à json_response (TypeAdapter du module, une seule passe), sur les mêmes
+objets chargés depuis une base SQLite temporaire. Les octets produits sont vérifiés
+identiques.
+
+    cd backend
+    python -m benchmarks.bench_serialization --matches 1000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+def seed(matches: int):
+    from app.database import Base, SessionLocal, engine
+    from app.models.models import Event, Match, Player, Team
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        teams = []
+        for i in range(20):
+            team = Team(name=f"Équipe {i}")
+            team.players = [
+                Player(firstname="Prénom", lastname=f"Joueur {i}{j}", company=f"Société {i}",
+                       email=f"p{i}{j}@bench.com", license_number=f"L{i:03d}{j:03d}")
+                for j in range(2)
+            ]
+            teams.append(team)
+        db.add_all(teams)
+        db.flush()
+        for n in range(0, matches, 3):
+            event = Event(date=date.today() + timedelta(days=n // 30), start_time=dtime(8 + (n // 3) % 10, 0))
+            event.matches = [
+                Match(court_number=c + 1, team1_id=teams[(n + 2 * c) % 20].id, team2_id=teams[(n + 2 * c + 1) % 20].id)
+                for c in range(min(3, matches - n))
+            ]
+            db.add(event)
+        db.commit()
+
+def cpu_ms(fn, repeat: int) -> float:
+    fn()  # Échauffement
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - started) * 1000 / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_serialization_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from typing import List
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from app.database import SessionLocal
+    from app.core.principal_cache import Principal
+    from app.api.matches import MATCH_LIST, map_match_to_response, matches_statement
+    from app.api.planning import EVENT_LIST, events_statement
+    from app.api.serialization import json_response
+    from app.schemas.matches import MatchResponse
+    from app.schemas.planning import EventResponse
+
+    seed(args.matches)
+    admin = Principal(id=0, role="ADMINISTRATEUR", is_active=True)
+    end = date.today() + timedelta(days=args.matches)
+    with SessionLocal() as db:
+        matches = db.scalars(matches_statement(admin, date.today(), end, page_size=args.matches)).all()
+        events = db.scalars(events_statement(date.today(), end, page_size=args.matches)).all()
+
+    loop = asyncio.new_event_loop()
+    match_field = create_response_field(name="Response", type_=List[MatchResponse])
+    event_field = create_response_field(name="Response", type_=List[EventResponse])
+
+    def fastapi_encode(field, content):
+        return JSONResponse(loop.run_until_complete(serialize_response(field=field, response_content=content))).body
+
+    def fast_matches():
+        team_infos = {}  # Comme matches_page : une TeamMatchInfo par équipe
+        return json_response(MATCH_LIST, [map_match_to_response(m, team_infos=team_infos) for m in matches]).body
+
+    cases = {
+        # Avant : une TeamMatchInfo par match et par équipe, puis encodage FastAPI
+        "matches": (
+            lambda: fastapi_encode(match_field, [map_match_to_response(m) for m in matches]),
+            fast_matches,
+        ),
+        "événements": (
+            lambda: fastapi_encode(event_field, events),
+            lambda: json_response(EVENT_LIST, events, from_orm=True).body,
+        ),
+    }
+    scale = 1000 / len(matches)
+    for name, (standard, fast) in cases.items():
+        assert standard() == fast(), f"{name} : octets différents"
+        before, after = cpu_ms(standard, args.repeat) * scale, cpu_ms(fast, args.repeat) * scale
+        print(f"{name:11} FastAPI {before:6.1f} ms CPU / 1 000 matchs   json_response {after:6.1f} ms   ({after / before - 1:+.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
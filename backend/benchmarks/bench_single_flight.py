@@ -0,0 +1,77 @@
+# ============================================
+# FICHIER : backend/benchmarks/bench_single_flight.py
+# ============================================
+"""
+Rafale de requêtes identiques juste après une saisie de scores, avec et sans single-flight.
+
+Sur la saison de bench_compression, chaque tour vide le cache de réponses (comme le
+ferait un commit) puis envoie en même temps `--clients` requêtes sur /results/ranking
+et sur le planning de la saison. Mesure la durée de la rafale et le nombre de calculs
+réellement exécutés (application ASGI appelée directement, sans réseau).
+
+    cd backend
+    python -m benchmarks.bench_single_flight --clients 50 --rounds 5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50, help="Requêtes simultanées par rafale")
+    parser.add_argument("--rounds", type=int, default=5, help="Rafales par mesure")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_single_flight_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "0")  # Rafales sans single-flight : requêtes lentes attendues
+
+    from app.main import app
+    from app.core.config import settings
+    from app.core.response_cache import response_cache
+    from app.core.single_flight import single_flight
+    from benchmarks.bench_compression import SEASON_START, SEASON_WEEKS, seed
+    from benchmarks.bench_middleware import call
+
+    token = seed(teams=24, courts=6)
+    headers = [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())]
+    season_end = SEASON_START + timedelta(weeks=SEASON_WEEKS)
+    paths = {
+        "classement": "/api/v1/results/ranking",
+        "planning (saison)": f"/api/v1/planning/?start_date={SEASON_START}&end_date={season_end}",
+    }
+
+    async def burst(path: str) -> float:
+        response_cache.clear()
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*(call(app, path, headers) for _ in range(args.clients)))
+        assert set(statuses) == {200}, statuses
+        return time.perf_counter() - started
+
+    async def measure(path: str):
+        await burst(path)  # Échauffement
+        single_flight.clear()
+        durations = [await burst(path) for _ in range(args.rounds)]
+        executed = single_flight.stats()["executed"] if settings.single_flight else args.clients * args.rounds
+        return sum(durations) / len(durations) * 1000, executed / args.rounds
+
+    results = {}
+    for enabled in (False, True):
+        settings.single_flight = enabled
+        for name, path in paths.items():
+            results[enabled, name] = asyncio.run(measure(path))
+
+    for name in paths:
+        (before, runs_before), (after, runs_after) = results[False, name], results[True, name]
+        print(f"{name:18} sans {before:7.0f} ms / rafale ({runs_before:.0f} calculs)   "
+              f"single-flight {after:6.0f} ms ({runs_after:.0f} calcul)   ({after / before - 1:+.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
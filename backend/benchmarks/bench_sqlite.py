@@ -0,0 +1,133 @@
+# ============================================
+# FICHIER : backend/benchmarks/bench_sqlite.py
+# ============================================
+"""
+Débit de lecture SQLite pendant la saisie de scores, avec et sans le profil de connexion.
+
+Pour chaque profil, une base temporaire est remplie (équipes, matchs), puis des threads
+lisent les matchs et le classement pendant que d'autres enregistrent des scores
+(ce qui met aussi à jour team_standings). Le profil "aucun" reproduit l'ancien moteur
+(journal rollback, réglages SQLite par défaut).
+
+    cd backend
+    python -m benchmarks.bench_sqlite --duration 10 --readers 4 --writers 2
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, time as dtime
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000 if samples else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10, help="Durée de chaque mesure (s)")
+    parser.add_argument("--readers", type=int, default=4, help="Threads de lecture")
+    parser.add_argument("--writers", type=int, default=2, help="Threads de saisie de scores")
+    parser.add_argument("--matches", type=int, default=500, help="Matchs dans la base")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import sessionmaker, joinedload
+    from app.database import Base, apply_sqlite_profile
+    from app.models.models import Event, Match, MatchStatus, Team, TeamStanding
+    from app.services import standings  # noqa: F401 - synchro du classement, comme dans l'API
+
+    def build(path, profile):
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        if profile:
+            event.listen(engine, "connect", apply_sqlite_profile)
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with session_factory() as db:
+            teams = [Team(name=f"Équipe {i}") for i in range(40)]
+            db.add_all(teams)
+            db.flush()
+            for i in range(args.matches):
+                db.add(Event(
+                    date=date(2026, 1, 1 + i // 100),
+                    start_time=dtime(8 + (i // 10) % 10, 0),
+                    matches=[Match(
+                        court_number=1 + i % 10,
+                        team1_id=teams[i % 40].id,
+                        team2_id=teams[(i + 1 + i // 40) % 40].id
+                    )]
+                ))
+            db.commit()
+        return engine, session_factory
+
+    def run(profile):
+        workdir = tempfile.mkdtemp(prefix="bench_sqlite_")
+        engine, session_factory = build(os.path.join(workdir, "bench.db"), profile)
+        stop = threading.Event()
+        lock = threading.Lock()
+        reads, writes, locked = [], [], [0]
+
+        def reader():
+            latencies = []
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    with session_factory() as db:
+                        db.query(Match).options(joinedload(Match.team1), joinedload(Match.team2)).limit(100).all()
+                        db.query(TeamStanding).order_by(TeamStanding.points.desc()).all()
+                except OperationalError:
+                    with lock:
+                        locked[0] += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+            with lock:
+                reads.extend(latencies)
+
+        def writer(offset):
+            latencies, i = [], offset
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    with session_factory() as db:
+                        match = db.get(Match, 1 + i % args.matches)
+                        won = i % 2 == 0
+                        match.score_team1 = "6-4 6-3" if won else "4-6 3-6"
+                        match.score_team2 = "4-6 3-6" if won else "6-4 6-3"
+                        match.status = MatchStatus.TERMINE
+                        db.commit()
+                except OperationalError:
+                    with lock:
+                        locked[0] += 1
+                    continue
+                finally:
+                    i += args.writers
+                latencies.append(time.perf_counter() - started)
+            with lock:
+                writes.extend(latencies)
+
+        threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+        threads += [threading.Thread(target=writer, args=(n,)) for n in range(args.writers)]
+        for t in threads:
+            t.start()
+        time.sleep(args.duration)
+        stop.set()
+        for t in threads:
+            t.join()
+        engine.dispose()
+        return reads, writes, locked[0]
+
+    for name, profile in (("aucun", False), ("profil", True)):
+        reads, writes, locked = run(profile)
+        print(f"{name:7}: lectures {len(reads) / args.duration:7.1f}/s "
+              f"(p50 {percentile(reads, 0.5):.1f} ms, p99 {percentile(reads, 0.99):.1f} ms), "
+              f"scores {len(writes) / args.duration:6.1f}/s "
+              f"(p99 {percentile(writes, 0.99):.1f} ms), \"database is locked\" : {locked}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
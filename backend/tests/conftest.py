@@ -4,22 +4,27 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, apply_sqlite_profile
 from app.models.models import User
 from app.core.security import get_password_hash
+from app.core.principal_cache import principal_cache
+from app.core.login_attempts import login_attempts
+from app.core.response_cache import response_cache
 
 # Base de données de test en mémoire
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+event.listen(engine, "connect", apply_sqlite_profile)  # Mêmes réglages qu'en production (clés étrangères comprises)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 @pytest.fixture(scope="function")
 def test_db():
     """Crée une base de données de test"""
     Base.metadata.create_all(bind=engine)
+    response_cache.clear()  # Réponses d'une base précédente
     yield
     Base.metadata.drop_all(bind=engine)
 
@@ -46,6 +51,9 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    # Les identifiants sont réutilisés d'un test à l'autre : repartir d'un cache vide
+    principal_cache.clear()
+    login_attempts.clear()
     yield TestClient(app)
     app.dependency_overrides.clear()
 
@@ -96,3 +104,20 @@ def admin_token_headers(client, test_admin):
     })
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def max_queries(monkeypatch):
+    """
+    Borne le nombre de requêtes SQL d'un appel à l'API (en-tête X-DB-Queries) :
+        max_queries(client.get(...), 4)
+    """
+    from app.core.config import settings
+    from app.core.query_stats import QUERIES_HEADER
+    monkeypatch.setattr(settings, "query_stats_headers", True)
+
+    def check(response, limit: int):
+        count = int(response.headers[QUERIES_HEADER])
+        assert count <= limit, f"{count} requêtes SQL pour {response.request.method} {response.request.url.path} (maximum {limit})"
+        return response
+
+    return check
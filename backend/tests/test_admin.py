@@ -3,8 +3,9 @@
 # ============================================
 
 import pytest
+from datetime import date, time, timedelta
 from fastapi import status
-from app.models.models import Player, Team, Pool, User
+from app.models.models import Player, Team, Pool, User, Event, Match
 from app.core.security import verify_password
 
 # --- Players Tests ---
@@ -90,6 +91,35 @@ def test_create_team_success(client, admin_token_headers, db_session):
     assert response.status_code == status.HTTP_200_OK
     assert response.json()["name"] == "CorpA"
 
+    team = db_session.query(Team).filter(Team.id == response.json()["id"]).first()
+    assert team.company == "CorpA"
+
+def test_update_player_company_syncs_team(client, admin_token_headers, db_session):
+    """L'entreprise de l'équipe suit la modification d'un joueur, sans séparer les coéquipiers"""
+    p1 = Player(firstname="Pierre", lastname="LeGrand", company="CorpA", email="p1@sync.com", license_number="L000005")
+    p2 = Player(firstname="Paul", lastname="LePetit", company="CorpA", email="p2@sync.com", license_number="L000006")
+    team = Team(name="Sync")
+    team.players = [p1, p2]
+    db_session.add(team)
+    db_session.commit()
+    assert team.company == "CorpA"
+    p1_id, p2_id, team_id = p1.id, p2.id, team.id
+
+    # Le coéquipier est encore chez CorpA : refusé, rien n'est modifié
+    response = client.put(f"/api/v1/admin/players/{p1_id}", json={"company": "CorpZ"}, headers=admin_token_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    db_session.expire_all()
+    assert db_session.get(Player, p1_id).company == "CorpA"
+    assert db_session.get(Team, team_id).company == "CorpA"
+
+    # Seul joueur restant de l'équipe : l'équipe suit
+    db_session.get(Player, p2_id).team_id = None
+    db_session.commit()
+    response = client.put(f"/api/v1/admin/players/{p1_id}", json={"company": "CorpZ"}, headers=admin_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    db_session.expire_all()
+    assert db_session.get(Team, team_id).company == "CorpZ"
+
 def test_create_team_different_companies(client, admin_token_headers, db_session):
     """Test création équipe avec entreprises différentes"""
     p1 = Player(firstname="Pierre", lastname="LeGrand", company="CorpA", email="p1@diff.com", license_number="L000003")
@@ -145,6 +175,50 @@ def test_create_pool_invalid_count(client, admin_token_headers):
     response = client.post("/api/v1/admin/pools", json=data, headers=admin_token_headers)
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+def test_round_robin_rounds():
+    from app.services.round_robin import round_robin_rounds
+    rounds = round_robin_rounds([1, 2, 3, 4, 5, 6])
+    assert len(rounds) == 5
+    for pairs in rounds:
+        assert sorted(t for pair in pairs for t in pair) == [1, 2, 3, 4, 5, 6]
+    assert len({frozenset(pair) for pairs in rounds for pair in pairs}) == 15
+
+def test_schedule_pools(client, admin_token_headers, db_session):
+    """Deux poules de 6 équipes sur 5 jours : 30 matchs, un par équipe et par jour"""
+    pool_ids = []
+    for p in range(2):
+        pool = Pool(name=f"Poule RR{p}")
+        pool.teams = [Team(name=f"RR{p}-{i}") for i in range(6)]
+        db_session.add(pool)
+        db_session.commit()
+        pool_ids.append(pool.id)
+
+    data = {
+        "pool_ids": pool_ids,
+        "dates": [(date.today() + timedelta(days=20 + d)).isoformat() for d in range(5)],
+        "start_times": ["18:00:00", "19:30:00"],
+        "courts": [1, 2, 3, 4]
+    }
+    response = client.post("/api/v1/admin/pools/schedule", json=data, headers=admin_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["matches_planned"] == 30
+    assert body["unscheduled"] == []
+    assert all(1 <= len(e["matches"]) <= 3 for e in body["events"])
+
+    matches = db_session.query(Match).join(Event).filter(Event.id.in_(body["event_ids"])).all()
+    assert len(matches) == 30
+    per_day = {}
+    for m in matches:
+        for team_id in (m.team1_id, m.team2_id):
+            per_day[(m.slot_date, team_id)] = per_day.get((m.slot_date, team_id), 0) + 1
+    assert set(per_day.values()) == {1}
+    assert len({(m.slot_date, m.slot_time, m.court_number) for m in matches}) == 30
+
+    # Relancer ne duplique pas les rencontres déjà programmées
+    response = client.post("/api/v1/admin/pools/schedule", json=data, headers=admin_token_headers)
+    assert response.json()["matches_planned"] == 0
+
 # --- Accounts Tests ---
 
 def test_create_account(client, admin_token_headers, db_session):
@@ -160,9 +234,59 @@ def test_create_account(client, admin_token_headers, db_session):
     assert "temp_password" in response.json()
     assert response.json()["email"] == "acc@tech.com"
 
+def test_create_accounts_bulk(client, admin_token_headers, db_session):
+    """Comptes créés pour tous les joueurs sans compte, identifiants en CSV"""
+    import csv
+    players = [
+        Player(firstname=f"Bulk{i}", lastname="Test", company="Tech", email=f"bulk{i}@tech.com", license_number=f"L55555{i}")
+        for i in range(3)
+    ]
+    db_session.add_all(players)
+    db_session.commit()
+    db_session.add(User(email="bulk0@tech.com", password_hash="hash", role="JOUEUR", player_id=players[0].id))
+    db_session.commit()
+
+    response = client.post("/api/v1/admin/accounts/bulk", json={"all_without_account": True}, headers=admin_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(response.text.splitlines()))
+    assert sorted(r["email"] for r in rows) == ["bulk1@tech.com", "bulk2@tech.com"]
+
+    user = db_session.query(User).filter(User.email == rows[0]["email"]).first()
+    assert user.must_change_password
+    assert user.player_id is not None
+    assert verify_password(rows[0]["temp_password"], user.password_hash)
+
+    # Rien à créer la seconde fois
+    response = client.post("/api/v1/admin/accounts/bulk", json={"player_ids": [p.id for p in players]}, headers=admin_token_headers)
+    assert response.text.splitlines() == ["email,temp_password"]
+
+def test_create_accounts_bulk_conflict(client, admin_token_headers, db_session, monkeypatch):
+    """Email pris pendant les hachages : 409, aucun mot de passe envoyé, aucun compte créé"""
+    from app.api import admin
+    player = Player(firstname="Race", lastname="Test", company="Tech", email="race@tech.com", license_number="L555559")
+    db_session.add(player)
+    db_session.commit()
+    player_id = player.id
+
+    def concurrent_signup():
+        db_session.add(User(email="race@tech.com", password_hash="hash", role="JOUEUR"))
+        db_session.flush()
+        return "Temp0r@ryPassw0rd"
+
+    monkeypatch.setattr(admin, "generate_secure_password", concurrent_signup)
+    response = client.post("/api/v1/admin/accounts/bulk", json={"all_without_account": True}, headers=admin_token_headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert "Temp0r@ryPassw0rd" not in response.text
+    assert db_session.query(User).filter(User.player_id == player_id).count() == 0
+
+def test_create_accounts_bulk_selection_required(client, admin_token_headers):
+    response = client.post("/api/v1/admin/accounts/bulk", json={}, headers=admin_token_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
 # --- Role Management Tests ---
 
-def test_change_player_role(client, admin_token_headers, db_session):
+def test_change_player_role(client, admin_token_headers, db_session, max_queries):
     """Test promotion d'un joueur en admin"""
     # Créer un joueur avec un compte
     player = Player(firstname="Role", lastname="Test", company="Test", email="role@test.com", license_number="L888888")
@@ -186,6 +310,7 @@ def test_change_player_role(client, admin_token_headers, db_session):
         headers=admin_token_headers
     )
     assert response.status_code == status.HTTP_200_OK
+    max_queries(response, 3)  # Principal, joueur et compte en une requête, mise à jour
     
     db_session.refresh(user)
     assert user.role == "ADMINISTRATEUR"
@@ -262,3 +387,21 @@ def test_account_creation_force_password_change(client, admin_token_headers, db_
     })
     assert login_response_2.status_code == status.HTTP_200_OK
     assert login_response_2.json()["user"]["must_change_password"] is False
+
+def test_delete_team_with_matches(client, admin_token_headers, db_session, max_queries):
+    """Une équipe qui a des matchs est refusée sans charger ses matchs"""
+    teams = [Team(name=f"Suppression {i}") for i in range(2)]
+    db_session.add_all(teams)
+    db_session.flush()
+    event = Event(date=date.today() + timedelta(days=1), start_time=time(19, 0))
+    event.matches = [Match(court_number=1, team1_id=teams[0].id, team2_id=teams[1].id)]
+    db_session.add(event)
+    db_session.commit()
+
+    response = client.delete(f"/api/v1/admin/teams/{teams[0].id}", headers=admin_token_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    max_queries(response, 3)  # Principal, équipe, existence d'un match
+
+    response = client.delete(f"/api/v1/admin/teams/{teams[0].id}", headers=admin_token_headers)
+    assert response.headers["X-DB-Queries"] == "2"  # Principal en cache
+    assert float(response.headers["X-DB-Time"]) >= 0
@@ -0,0 +1,94 @@
+# ============================================
+# FICHIER : backend/tests/test_async_db.py
+# ============================================
+
+import pytest
+from datetime import date, time, timedelta
+from typing import List
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.main import app
+from app.api import auth, matches, planning, results
+from app.database import get_db, get_async_db, create_async_db_engine
+from app.models.models import User, Player, Team, Event, Match
+from app.core.security import create_access_token
+from app.core.principal_cache import principal_cache
+from app.core.response_cache import response_cache
+from tests.conftest import SQLALCHEMY_DATABASE_URL, TestingSessionLocal
+
+DAYS = 3
+
+@pytest.fixture
+def seeded(test_db):
+    """
+    Administrateur, deux équipes et quelques soirées, validés dans la base : le moteur
+    async ouvre ses propres connexions et ne voit pas la transaction de db_session
+    """
+    session = TestingSessionLocal()
+    admin = User(email="admin@example.com", password_hash="-", role="ADMINISTRATEUR", is_active=True)
+    teams = []
+    for i in range(2):
+        team = Team(name=f"Team {i}")
+        team.players = [
+            Player(firstname="P", lastname=f"{i}{j}", company=f"Company {i}",
+                   email=f"p{i}{j}@test.com", license_number=f"L{i}{j:05d}")
+            for j in range(2)
+        ]
+        teams.append(team)
+    session.add_all([admin, *teams])
+    session.commit()
+
+    start = date.today() + timedelta(days=1)
+    for day in range(DAYS):
+        event_ = Event(date=start + timedelta(days=day), start_time=time(19, 0))
+        event_.matches = [Match(court_number=1, team1_id=teams[0].id, team2_id=teams[1].id)]
+        session.add(event_)
+    session.commit()
+
+    def override_get_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    principal_cache.clear()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+    params = {"start_date": start.isoformat(), "end_date": (start + timedelta(days=DAYS - 1)).isoformat()}
+
+    yield TestClient(app), headers, params
+
+    app.dependency_overrides.clear()
+    session.close()
+
+def test_async_reads_match_sync(seeded):
+    """Les routes de lecture async (ASYNC_DB=true) renvoient exactement les réponses synchrones"""
+    client, headers, params = seeded
+    async_engine = create_async_db_engine(SQLALCHEMY_DATABASE_URL)
+    async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with async_session() as db:
+            yield db
+
+    async_app = FastAPI()
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    async_app.add_api_route("/api/v1/auth/me", auth.read_users_me_async, response_model=auth.UserResponse)
+    async_app.add_api_route("/api/v1/matches/", matches.get_matches_async, response_model=List[matches.MatchResponse])
+    async_app.add_api_route("/api/v1/planning/", planning.get_events_async, response_model=List[planning.EventResponse])
+    async_app.add_api_route("/api/v1/results/ranking", results.get_ranking_async, response_model=List[results.RankingEntry])
+
+    with TestClient(async_app) as async_client:
+        for path, query in (
+            ("/api/v1/auth/me", {}),
+            ("/api/v1/matches/", params),
+            ("/api/v1/matches/", {**params, "lean": True, "limit": 2}),
+            ("/api/v1/planning/", params),
+            ("/api/v1/results/ranking", {}),
+        ):
+            expected = client.get(path, params=query, headers=headers)
+            principal_cache.clear()  # Passer aussi par la lecture async du principal
+            response_cache.clear()  # ... et par la route async elle-même
+            actual = async_client.get(path, params=query, headers=headers)
+            assert actual.status_code == expected.status_code == 200
+            assert actual.content == expected.content
+            assert actual.headers.get("x-next-cursor") == expected.headers.get("x-next-cursor")
+        async_client.portal.call(async_engine.dispose)
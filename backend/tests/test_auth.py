@@ -115,4 +115,54 @@ def test_invalid_token(client):
     headers = {"Authorization": "Bearer invalid_token"}
     response = client.post("/api/v1/auth/logout", headers=headers)
     
-    assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_memory_attempt_store_expiry():
+    """Blocage de 30 minutes après 5 échecs, puis compteur remis à zéro"""
+    from datetime import datetime, timedelta, timezone
+    from app.core.login_attempts import MemoryAttemptStore
+    now = [datetime(2025, 1, 1, tzinfo=timezone.utc)]
+    store = MemoryAttemptStore(shards=1, prune_interval=0, clock=lambda: now[0])
+    for i in range(4):
+        assert store.record_failure("a@b.com") == (i + 1, None)
+    count, locked_until = store.record_failure("a@b.com")
+    assert count == 5 and locked_until == now[0] + timedelta(minutes=30)
+    assert store.locked_until("a@b.com") == locked_until
+
+    now[0] += timedelta(minutes=31)
+    assert store.locked_until("a@b.com") is None
+    assert store.record_failure("a@b.com") == (1, None)
+
+    # Les échecs isolés sont oubliés et purgés
+    store.record_failure("c@d.com")
+    now[0] += timedelta(minutes=31)
+    store.record_failure("e@f.com")
+    assert sum(len(shard) for shard in store._shards) == 1
+
+def test_database_attempt_store(db_session, test_user):
+    """Stockage persistant : mêmes règles, aucune écriture sur une connexion réussie"""
+    from sqlalchemy import event
+    from sqlalchemy.orm import sessionmaker
+    from app.core.login_attempts import DatabaseAttemptStore
+    from app.models.models import LoginAttempt
+    store = DatabaseAttemptStore(sessionmaker(bind=db_session.connection()))
+
+    writes = []
+
+    def listener(conn, cursor, statement, *args):
+        if not statement.lstrip().upper().startswith("SELECT"):
+            writes.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        store.reset("test@example.com")
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+    assert writes == []
+
+    for _ in range(4):
+        store.record_failure("test@example.com")
+    assert store.locked_until("test@example.com") is None
+    assert store.record_failure("test@example.com")[1] is not None
+    assert store.locked_until("test@example.com") is not None
+    store.reset("test@example.com")
+    assert db_session.query(LoginAttempt).count() == 0
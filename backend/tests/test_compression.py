@@ -0,0 +1,131 @@
+# ============================================
+# FICHIER : backend/tests/test_compression.py
+# ============================================
+
+import gzip
+import pytest
+from datetime import date, time, timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.models.models import Team, Event, Match
+from app.core import compression
+from app.core.compression import CompressionMiddleware, encoded_etag, negotiate, strip_encoding
+from app.core.config import settings
+from app.core.static_files import AppStaticFiles
+
+DAYS = 10
+
+@pytest.fixture
+def season(db_session):
+    """Dix soirées d'un match : un planning de quelques Kio, paramètres de la période"""
+    team1, team2 = Team(name="Team A"), Team(name="Team B")
+    db_session.add_all([team1, team2])
+    db_session.flush()
+    start = date.today() + timedelta(days=1)
+    for day in range(DAYS):
+        event_ = Event(date=start + timedelta(days=day), start_time=time(19, 0))
+        event_.matches = [Match(court_number=1, team1_id=team1.id, team2_id=team2.id)]
+        db_session.add(event_)
+    db_session.commit()
+    return {"start_date": start.isoformat(), "end_date": (start + timedelta(days=DAYS - 1)).isoformat()}
+
+def raw_get(client, path, **kwargs):
+    """Réponse et corps tels qu'envoyés, sans le décodage automatique de httpx"""
+    with client.stream("GET", path, **kwargs) as response:
+        return response, b"".join(response.iter_raw())
+
+def test_compression_negotiation():
+    assert negotiate(None) is None
+    assert negotiate("gzip, deflate", ["br", "gzip"]) == "gzip"
+    assert negotiate("gzip, br", ["br", "gzip"]) == "br"  # Qualités égales : préférence du serveur
+    assert negotiate("br;q=0.5, gzip", ["br", "gzip"]) == "gzip"
+    assert negotiate("gzip;q=0, identity", ["br", "gzip"]) is None
+    assert negotiate("*", ["gzip"]) == "gzip"
+    assert negotiate("*;q=0", ["gzip"]) is None
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_compressed_responses(client, admin_token_headers, season, monkeypatch, encoding):
+    if encoding not in compression.SUPPORTED_ENCODINGS:
+        pytest.skip("paquet brotli non installé")
+    decompress = gzip.decompress if encoding == "gzip" else compression.brotli.decompress
+    plain = client.get("/api/v1/planning/", params=season, headers={**admin_token_headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    # Gros corps compressé dans un thread
+    monkeypatch.setattr(settings, "compression_thread_min_size", len(plain.content) // 2)
+    response, body = raw_get(client, "/api/v1/planning/", params=season,
+                             headers={**admin_token_headers, "Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body) < len(plain.content) / 4
+    assert decompress(body) == plain.content
+
+    # Sous le seuil : envoyé tel quel
+    response, body = raw_get(client, "/health", headers={"Accept-Encoding": encoding})
+    assert "content-encoding" not in response.headers
+    assert body == b'{"status":"healthy"}'
+
+    monkeypatch.setattr(settings, "compression_min_size", 0)
+    response, body = raw_get(client, "/api/v1/planning/", params=season,
+                             headers={**admin_token_headers, "Accept-Encoding": encoding})
+    assert "content-encoding" not in response.headers and body == plain.content
+
+def test_precompressed_static_files(tmp_path):
+    css = b"body { color: black; }\n" * 200
+    (tmp_path / "app.css").write_bytes(css)
+    (tmp_path / "app.css.gz").write_bytes(gzip.compress(css, 9))
+    (tmp_path / "app.js").write_bytes(b"console.log('ok');\n" * 10000)  # Plusieurs blocs de 64 Kio
+
+    static_app = FastAPI()
+    static_app.mount("/static", AppStaticFiles(directory=tmp_path), name="static")
+    static_app.add_middleware(CompressionMiddleware)
+    client = TestClient(static_app)
+
+    response, body = raw_get(client, "/static/app.css", headers={"Accept-Encoding": "br, gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "text/css; charset=utf-8"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert body == (tmp_path / "app.css.gz").read_bytes()
+
+    # Variante précompressée revalidée par son propre ETag
+    response, _ = raw_get(client, "/static/app.css",
+                          headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+    response, body = raw_get(client, "/static/app.css", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers and body == css
+
+    # Sans variante sur disque : fichier compressé à la volée, ETag propre à l'encodage
+    response, body = raw_get(client, "/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].endswith("-gzip")
+    assert "content-length" not in response.headers  # Compressé bloc par bloc
+    assert gzip.decompress(body) == (tmp_path / "app.js").read_bytes()
+
+def test_revalidation_keeps_validator(client, admin_token_headers, season, tmp_path):
+    """ETag fort par représentation ; le 304 porte celui de la représentation revalidée"""
+    etags = {}
+    for encoding in ("gzip", "identity"):
+        headers = {**admin_token_headers, "Accept-Encoding": encoding}
+        response, _ = raw_get(client, "/api/v1/planning/", params=season, headers=headers)
+        etag = etags[encoding] = response.headers["etag"]
+        assert not etag.startswith("W/")
+        response, _ = raw_get(client, "/api/v1/planning/", params=season, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304 and response.headers["etag"] == etag
+    assert etags["gzip"] == encoded_etag(etags["identity"], "gzip")
+    assert strip_encoding(etags["gzip"]) == etags["identity"]
+
+    (tmp_path / "app.js").write_bytes(b"console.log('ok');\n" * 100)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 2048)
+    static_app = FastAPI()
+    static_app.mount("/static", AppStaticFiles(directory=tmp_path), name="static")
+    static_app.add_middleware(CompressionMiddleware)
+    static_client = TestClient(static_app)
+    for path, suffixed in (("/static/app.js", True), ("/static/logo.png", False)):
+        response, _ = raw_get(static_client, path, headers={"Accept-Encoding": "gzip"})
+        etag = response.headers["etag"]
+        assert etag.endswith("-gzip") == suffixed
+        response, _ = raw_get(static_client, path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert response.status_code == 304 and response.headers["etag"] == etag
@@ -0,0 +1,63 @@
+# ============================================
+# FICHIER : backend/tests/test_hashing.py
+# ============================================
+
+import asyncio
+import threading
+import time
+import pytest
+from app.core import hashing
+from app.core.hashing import HashingPool, HashingPoolSaturated, check_password_async
+from app.core.security import get_password_hash
+
+def test_hashing_pool_backpressure():
+    """Au-delà des workers et de la file, le pool refuse au lieu d'attendre"""
+    pool = HashingPool(workers=1, queue_size=1)
+    release = threading.Event()
+    running = pool.submit("test", release.wait)
+    queued = pool.submit("test", lambda: "ok")
+    with pytest.raises(HashingPoolSaturated):
+        pool.submit("test", lambda: "ko")
+    release.set()
+    assert queued.result(timeout=5) == "ok"
+    running.result(timeout=5)
+    assert pool.run("test", lambda: 42) == 42
+    # La place est rendue par un callback de fin, éventuellement après result() : attendre
+    deadline = time.monotonic() + 5
+    while pool.stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["operations"]["test"]["count"] == 3
+
+def test_login_saturated_returns_429(client, test_user, monkeypatch):
+    monkeypatch.setattr(hashing, "hashing_pool", HashingPool(workers=1, queue_size=0))
+    release = threading.Event()
+    hashing.hashing_pool.submit("test", release.wait)
+    try:
+        response = client.post("/api/v1/auth/login", json={"email": "test@example.com", "password": "ValidP@ssw0rd123"})
+    finally:
+        release.set()
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+
+def test_check_password_async(monkeypatch):
+    """Vérification attendue par la boucle d'événements ; pool saturé : refus immédiat"""
+    hashed = get_password_hash("ValidP@ssw0rd123")
+    assert asyncio.run(check_password_async("ValidP@ssw0rd123", hashed)) is True
+    assert asyncio.run(check_password_async("Mauvais", hashed)) is False
+
+    monkeypatch.setattr(hashing, "hashing_pool", HashingPool(workers=1, queue_size=0))
+    release = threading.Event()
+    hashing.hashing_pool.submit("test", release.wait)
+    try:
+        with pytest.raises(HashingPoolSaturated):
+            asyncio.run(check_password_async("ValidP@ssw0rd123", hashed))
+    finally:
+        release.set()
+
+def test_hashing_metrics(client, admin_token_headers):
+    response = client.get("/api/v1/admin/metrics/hashing", headers=admin_token_headers)
+    assert response.status_code == 200
+    assert response.json()["operations"]["verify"]["count"] >= 1
@@ -0,0 +1,141 @@
+# ============================================
+# FICHIER : backend/tests/test_loading.py
+# ============================================
+
+import sqlite3
+import pytest
+from datetime import date, time, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import get_db
+from app.models.models import User, Player, Team, Event, Match
+from app.core.security import get_password_hash
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+class CountingCursor(sqlite3.Cursor):
+    """Curseur sqlite3 qui compte les lignes renvoyées à SQLAlchemy"""
+    rows = 0
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            CountingCursor.rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = super().fetchmany(*args)
+        CountingCursor.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        CountingCursor.rows += len(rows)
+        return rows
+
+class CountingConnection(sqlite3.Connection):
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+class SQLCounter:
+    def __init__(self, engine):
+        self.statements = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+
+    def reset(self):
+        self.statements = 0
+        CountingCursor.rows = 0
+
+    @property
+    def rows(self):
+        return CountingCursor.rows
+
+DAYS = 30
+MATCHES_PER_SLOT = 3
+
+@pytest.fixture
+def counted(test_db):
+    """Client relié à un moteur qui compte requêtes et lignes, avec un mois de planning"""
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False, "factory": CountingConnection}
+    )
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    session.add(User(
+        email="admin@example.com",
+        password_hash=get_password_hash("AdminP@ssw0rd123"),
+        role="ADMINISTRATEUR",
+        is_active=True
+    ))
+    teams = []
+    for i in range(2 * MATCHES_PER_SLOT):
+        team = Team(name=f"Team {i}")
+        team.players = [
+            Player(firstname="P", lastname=f"{i}{j}", company=f"Company {i}",
+                   email=f"p{i}{j}@test.com", license_number=f"L{i}{j:05d}")
+            for j in range(2)
+        ]
+        teams.append(team)
+    session.add_all(teams)
+    session.commit()
+
+    start = date.today() + timedelta(days=1)
+    for day in range(DAYS):
+        event_ = Event(date=start + timedelta(days=day), start_time=time(19, 0))
+        event_.matches = [
+            Match(court_number=court + 1, team1_id=teams[2 * court].id, team2_id=teams[2 * court + 1].id)
+            for court in range(MATCHES_PER_SLOT)
+        ]
+        session.add(event_)
+    session.commit()
+
+    def override_get_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    token = client.post("/api/v1/auth/login", json={
+        "email": "admin@example.com",
+        "password": "AdminP@ssw0rd123"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    params = {"start_date": start.isoformat(), "end_date": (start + timedelta(days=DAYS - 1)).isoformat()}
+
+    yield client, headers, params, SQLCounter(engine), session
+
+    app.dependency_overrides.clear()
+    session.close()
+    engine.dispose()
+
+def test_get_events_loads_linearly(counted):
+    client, headers, params, counter, session = counted
+    session.expire_all()
+    counter.reset()
+
+    response = client.get("/api/v1/planning/", params=params, headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == DAYS
+
+    # Utilisateur courant, événements, matchs + équipes, joueurs des équipes 1 puis 2
+    assert counter.statements <= 5
+    players = 2 * 2 * MATCHES_PER_SLOT
+    assert counter.rows <= 1 + DAYS + DAYS * MATCHES_PER_SLOT + players
+
+def test_get_matches_loads_linearly(counted):
+    client, headers, params, counter, session = counted
+    session.expire_all()
+    counter.reset()
+
+    response = client.get("/api/v1/matches/", params=params, headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == DAYS * MATCHES_PER_SLOT
+
+    # Utilisateur courant, matchs + événements + équipes, joueurs des équipes 1 puis 2
+    assert counter.statements <= 4
+    players = 2 * 2 * MATCHES_PER_SLOT
+    assert counter.rows <= 1 + DAYS * MATCHES_PER_SLOT + players
@@ -4,6 +4,7 @@
 
 import pytest
 from datetime import date, time, timedelta
+from sqlalchemy.exc import IntegrityError
 from app.models.models import Match, Event, Team, Player, MatchStatus
 
 @pytest.fixture
@@ -30,7 +31,7 @@ def test_teams(db_session):
     db_session.commit()
     return t1, t2
 
-def test_create_match(client, admin_token_headers, test_teams):
+def test_create_match(client, admin_token_headers, test_teams, max_queries):
     t1, t2 = test_teams
     match_date = date.today() + timedelta(days=1)
     
@@ -47,6 +48,8 @@ def test_create_match(client, admin_token_headers, test_teams):
     )
     
     assert response.status_code == 200
+    # Principal, savepoint + insertions + contrôle du créneau, puis le match relu avec équipes et joueurs
+    max_queries(response, 9)
     data = response.json()
     assert data["court_number"] == 1
     assert data["status"] == "A_VENIR"
@@ -123,6 +126,95 @@ def test_get_matches(client, admin_token_headers, test_teams):
     assert response.status_code == 200
     assert len(response.json()) >= 1
 
+def test_list_responses_byte_identical(client, admin_token_headers, test_teams, db_session):
+    """Les listes sérialisées d'une traite sont identiques octet pour octet à l'encodage FastAPI"""
+    from fastapi.responses import JSONResponse
+    t1, t2 = test_teams
+    t1.name = 'Équipe "Ünïcode" \\ 🎾'
+    t1.players[0].company = "Société Ünïcode"
+    db_session.commit()
+    event = Event(date=date.today() + timedelta(days=1), start_time=time(19, 0))
+    event.matches = [Match(court_number=1, team1_id=t1.id, team2_id=t2.id)]
+    db_session.add(event)
+    db_session.commit()
+
+    for path, params in (
+        ("/api/v1/matches/", {}),
+        ("/api/v1/matches/", {"lean": True}),
+        ("/api/v1/planning/", {}),
+        ("/api/v1/planning/", {"lean": True}),
+        ("/api/v1/admin/players", {}),
+    ):
+        response = client.get(path, params=params, headers=admin_token_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert "Ünïcode" in response.text
+        assert response.content == JSONResponse(response.json()).body
+
+def test_matches_cache_scope_and_invalidation(client, admin_token_headers, user_token_headers, test_user, test_teams, db_session):
+    """Cache de /matches : une entrée par portée d'utilisateur, invalidée par les écritures"""
+    t1, t2 = test_teams
+    etag = client.get("/api/v1/matches/", headers=admin_token_headers).headers["etag"]
+
+    response = client.post("/api/v1/matches/", headers=admin_token_headers, json={
+        "date": (date.today() + timedelta(days=1)).isoformat(),
+        "time": "19:00:00",
+        "court_number": 1,
+        "team1_id": t1.id,
+        "team2_id": t2.id
+    })
+    assert response.status_code == 200
+    response = client.get("/api/v1/matches/", headers={**admin_token_headers, "If-None-Match": etag})
+    assert response.status_code == 200 and len(response.json()) == 1
+
+    # Joueur sans équipe : aucun match, pas la réponse de l'administrateur
+    player = Player(firstname="Solo", lastname="Player", company="Company C", license_number="L000009", email="solo@c.com")
+    db_session.add(player)
+    db_session.flush()
+    test_user.player_id = player.id
+    db_session.commit()
+    response = client.get("/api/v1/matches/", headers=user_token_headers)
+    assert response.status_code == 200 and response.json() == []
+
+def test_matches_cache_follows_default_window(client, admin_token_headers, test_teams, db_session, monkeypatch):
+    """Sans dates, la période par défaut fait partie de la clé : le lendemain, pas l'ancienne réponse"""
+    import datetime as dt
+    from app.api import matches
+    t1, t2 = test_teams
+    day_31 = date.today() + timedelta(days=31)  # Hors de la période par défaut, sauf demain
+    event = Event(date=day_31, start_time=time(19, 0))
+    db_session.add(event)
+    db_session.flush()
+    db_session.add(Match(event_id=event.id, court_number=1, team1_id=t1.id, team2_id=t2.id))
+    db_session.commit()
+
+    assert client.get("/api/v1/matches/", headers=admin_token_headers).json() == []
+
+    class Tomorrow(dt.date):
+        @classmethod
+        def today(cls):
+            return dt.date.today() + timedelta(days=1)
+
+    monkeypatch.setattr(matches, "date", Tomorrow)
+    assert len(client.get("/api/v1/matches/", headers=admin_token_headers).json()) == 1
+
+def test_response_cache_skips_stale_put():
+    """Une réponse calculée pendant une écriture n'est pas mise en cache"""
+    from app.core.response_cache import CachedResponse, ResponseCache
+    cache = ResponseCache(max_size=2, ttl_seconds=60)
+    entry = CachedResponse(b"[]", (), '"x"')
+
+    versions = cache.versions(("matches", "teams"))
+    cache.invalidate(["teams"])  # Commit concurrent
+    cache.put("a", ("matches", "teams"), versions, entry)
+    assert cache.get("a") is None
+
+    cache.put("a", ("matches", "teams"), cache.versions(("matches", "teams")), entry)
+    cache.put("b", ("events",), cache.versions(("events",)), entry)
+    assert cache.get("a") is entry
+    cache.invalidate(["matches"])
+    assert cache.get("a") is None and cache.get("b") is entry
+
 def test_update_match(client, admin_token_headers, test_teams):
     t1, t2 = test_teams
     match_date = date.today() + timedelta(days=1)
@@ -177,3 +269,119 @@ def test_delete_match(client, admin_token_headers, test_teams):
     get_res = client.get("/api/v1/matches/", headers=admin_token_headers)
     match_ids = [m["id"] for m in get_res.json()]
     assert match_id not in match_ids
+
+def test_get_matches_cursor_pagination(client, admin_token_headers, test_teams, db_session):
+    t1, t2 = test_teams
+    match_date = date.today() + timedelta(days=3)
+
+    # 3 matchs au même créneau : l'id départage l'ordre
+    event = Event(date=match_date, start_time=time(19, 0))
+    db_session.add(event)
+    db_session.commit()
+    for court in (1, 2, 3):
+        db_session.add(Match(event_id=event.id, court_number=court, team1_id=t1.id, team2_id=t2.id))
+    db_session.commit()
+
+    first = client.get("/api/v1/matches/?limit=2", headers=admin_token_headers)
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get(f"/api/v1/matches/?limit=2&cursor={cursor}", headers=admin_token_headers)
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+
+    ids = [m["id"] for m in first.json() + second.json()]
+    assert [m["court_number"] for m in first.json() + second.json()] == [1, 2, 3]
+    assert ids == sorted(ids)
+
+def test_get_matches_invalid_cursor(client, admin_token_headers):
+    response = client.get("/api/v1/matches/?cursor=invalide", headers=admin_token_headers)
+    assert response.status_code == 400
+
+def test_cancelled_match_frees_court_slot(client, admin_token_headers, test_teams):
+    t1, t2 = test_teams
+    payload = {
+        "date": (date.today() + timedelta(days=4)).isoformat(),
+        "time": "19:00:00",
+        "court_number": 1,
+        "team1_id": t1.id,
+        "team2_id": t2.id
+    }
+    match_id = client.post("/api/v1/matches/", headers=admin_token_headers, json=payload).json()["id"]
+    client.put(f"/api/v1/matches/{match_id}", headers=admin_token_headers, json={"status": "ANNULE"})
+
+    response = client.post("/api/v1/matches/", headers=admin_token_headers, json=payload)
+    assert response.status_code == 200
+
+def test_court_slot_unique_in_database(db_session, test_teams):
+    """La base refuse un double booking même sans passer par l'API"""
+    t1, t2 = test_teams
+    event = Event(date=date.today() + timedelta(days=4), start_time=time(19, 0))
+    event.matches = [
+        Match(court_number=1, team1_id=t1.id, team2_id=t2.id),
+        Match(court_number=1, team1_id=t2.id, team2_id=t1.id)
+    ]
+    with pytest.raises(IntegrityError):
+        with db_session.begin_nested():
+            db_session.add(event)
+
+def test_update_match_slot_conflict(client, admin_token_headers, test_teams):
+    t1, t2 = test_teams
+    payload = {
+        "date": (date.today() + timedelta(days=4)).isoformat(),
+        "time": "19:00:00",
+        "court_number": 1,
+        "team1_id": t1.id,
+        "team2_id": t2.id
+    }
+    client.post("/api/v1/matches/", headers=admin_token_headers, json=payload)
+    other_id = client.post("/api/v1/matches/", headers=admin_token_headers, json={**payload, "court_number": 2}).json()["id"]
+
+    response = client.put(f"/api/v1/matches/{other_id}", headers=admin_token_headers, json={"court_number": 1})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Créneau indisponible"
+
+def test_overlapping_match_rejected(client, admin_token_headers, test_teams):
+    """Un match de 90 min à 19h occupe la piste jusqu'à 20h30"""
+    t1, t2 = test_teams
+    payload = {
+        "date": (date.today() + timedelta(days=5)).isoformat(),
+        "time": "19:00:00",
+        "court_number": 1,
+        "team1_id": t1.id,
+        "team2_id": t2.id
+    }
+    response = client.post("/api/v1/matches/", headers=admin_token_headers, json=payload)
+    assert response.status_code == 200
+    assert response.json()["end_time"] == "20:30:00"
+
+    response = client.post("/api/v1/matches/", headers=admin_token_headers, json={**payload, "time": "19:30:00"})
+    assert response.status_code == 400
+
+    response = client.post("/api/v1/matches/", headers=admin_token_headers, json={**payload, "time": "19:30:00", "court_number": 2})
+    assert response.status_code == 200
+
+    response = client.post("/api/v1/matches/", headers=admin_token_headers, json={**payload, "time": "20:30:00"})
+    assert response.status_code == 200
+
+def test_match_past_midnight_rejected(client, admin_token_headers, test_teams):
+    t1, t2 = test_teams
+    response = client.post("/api/v1/matches/", headers=admin_token_headers, json={
+        "date": (date.today() + timedelta(days=5)).isoformat(),
+        "time": "23:00:00",
+        "court_number": 1,
+        "team1_id": t1.id,
+        "team2_id": t2.id
+    })
+    assert response.status_code == 400
+
+def test_court_schedule_overlap():
+    from app.services.scheduling import CourtSchedule
+    day = date.today()
+    schedule = CourtSchedule()
+    schedule.add(day, 1, time(19, 0), time(20, 30), 1)
+    assert schedule.find_overlap(day, 1, time(19, 30), time(21, 0)) == (1140, 1230, 1)
+    assert schedule.find_overlap(day, 1, time(17, 30), time(19, 0)) is None
+    assert schedule.find_overlap(day, 1, time(20, 30), time(22, 0)) is None
+    assert schedule.find_overlap(day, 2, time(19, 0), time(20, 30)) is None
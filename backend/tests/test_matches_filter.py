@@ -75,3 +75,74 @@ def test_matches_company_filter(client, admin_token_headers, filter_data):
     # Filter by non-existent company
     response = client.get("/api/v1/matches?company=NonExistent&all_matches=true", headers=headers)
     assert len(response.json()) == 0
+
+
+def test_matches_company_filter_case_insensitive(client, admin_token_headers, db_session, filter_data):
+    """Le filtre entreprise est fait en SQL, sans tenir compte de la casse"""
+    t1, t2 = filter_data
+
+    # Un second match entre deux autres entreprises ne doit pas remonter
+    p5 = Player(firstname="P5", lastname="O", company="Other Co", email="p5@o.com", license_number="LO001")
+    p6 = Player(firstname="P6", lastname="O", company="Other Co", email="p6@o.com", license_number="LO002")
+    p7 = Player(firstname="P7", lastname="X", company="Xeno", email="p7@x.com", license_number="LX001")
+    p8 = Player(firstname="P8", lastname="X", company="Xeno", email="p8@x.com", license_number="LX002")
+    t3 = Team(name="Others")
+    t3.players = [p5, p6]
+    t4 = Team(name="Xenos")
+    t4.players = [p7, p8]
+    db_session.add_all([t3, t4])
+    db_session.commit()
+
+    event = Event(date=date.today() + timedelta(days=6), start_time=time(10, 0))
+    db_session.add(event)
+    db_session.commit()
+    db_session.add(Match(event_id=event.id, court_number=1, team1_id=t3.id, team2_id=t4.id, status=MatchStatus.A_VENIR))
+    db_session.commit()
+
+    response = client.get("/api/v1/matches?company=dream%20team&all_matches=true", headers=admin_token_headers)
+    matches = response.json()
+    assert len(matches) == 1
+    assert matches[0]["team1"]["name"] == "Dream Team"
+
+    # Correspondance sur l'équipe 2 via l'entreprise de ses joueurs
+    response = client.get("/api/v1/matches?company=XENO&all_matches=true", headers=admin_token_headers)
+    matches = response.json()
+    assert len(matches) == 1
+    assert matches[0]["team2"]["name"] == "Xenos"
+
+
+def test_matches_company_filter_unicode(client, admin_token_headers, db_session):
+    """Casse des lettres accentuées ignorée aussi (LOWER de SQLite ne plie que l'ASCII)"""
+    p1 = Player(firstname="Anne", lastname="E", company="École Corp", email="a@ecole.com", license_number="LEC001")
+    p2 = Player(firstname="Paul", lastname="E", company="École Corp", email="p@ecole.com", license_number="LEC002")
+    p3 = Player(firstname="Rita", lastname="S", company="Straße AG", email="r@strasse.com", license_number="LST001")
+    p4 = Player(firstname="Ugo", lastname="S", company="Straße AG", email="u@strasse.com", license_number="LST002")
+    t1 = Team(name="Élèves")
+    t1.players = [p1, p2]
+    t2 = Team(name="Rue")
+    t2.players = [p3, p4]
+    db_session.add_all([t1, t2])
+    db_session.commit()
+    event = Event(date=date.today() + timedelta(days=5), start_time=time(10, 0))
+    event.matches = [Match(court_number=1, team1_id=t1.id, team2_id=t2.id, status=MatchStatus.A_VENIR)]
+    db_session.add(event)
+    db_session.commit()
+
+    for company in ("École Corp", "école corp", "ÉCOLE CORP", "élèves", "STRASSE AG"):
+        response = client.get("/api/v1/matches", params={"company": company, "all_matches": True}, headers=admin_token_headers)
+        assert len(response.json()) == 1, company
+
+
+def test_matches_lean_mode(client, admin_token_headers, filter_data):
+    """En mode allégé, l'entreprise vient de l'équipe et les joueurs ne sont pas chargés"""
+    response = client.get("/api/v1/matches?company=Dream%20Team&all_matches=true&lean=true", headers=admin_token_headers)
+    matches = response.json()
+    assert len(matches) == 1
+    assert matches[0]["team1"]["company"] == "Dream Team"
+    assert matches[0]["team1"]["players"] == []
+
+    start = (date.today() + timedelta(days=5)).isoformat()
+    response = client.get(f"/api/v1/planning/?start_date={start}&end_date={start}&lean=true", headers=admin_token_headers)
+    events = response.json()
+    assert events[0]["matches"][0]["team2"]["company"] == "Equipe 42"
+    assert events[0]["matches"][0]["team2"]["players"] == []
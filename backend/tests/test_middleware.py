@@ -0,0 +1,24 @@
+# ============================================
+# FICHIER : backend/tests/test_middleware.py
+# ============================================
+
+from app.core.config import settings
+
+def test_security_headers(client):
+    response = client.get("/health")
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["X-XSS-Protection"] == "1; mode=block"
+    assert "X-Request-ID" not in response.headers and "Server-Timing" not in response.headers
+
+def test_request_id_and_server_timing(client, monkeypatch):
+    monkeypatch.setattr(settings, "request_id_header", True)
+    monkeypatch.setattr(settings, "server_timing_header", True)
+
+    response = client.get("/health", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["X-Request-ID"] == "abc-123"
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+
+    # Identifiant client invalide : remplacé
+    response = client.get("/health", headers={"X-Request-ID": "a b\tc"})
+    assert len(response.headers["X-Request-ID"]) == 32
@@ -126,3 +126,69 @@ def test_delete_event(client: TestClient, admin_token_headers, db_session: Sessi
     events = response.json()
     assert not any(e["id"] == event_id for e in events)
 
+
+def test_get_events_cursor_pagination(client: TestClient, user_token_headers, db_session: Session):
+    start = date.today().replace(day=1)
+    for hour in (10, 12, 14):
+        db_session.add(Event(date=start, start_time=time(hour, 0)))
+    db_session.commit()
+
+    params = f"start_date={start.isoformat()}&end_date={start.isoformat()}&limit=2"
+    first = client.get(f"/api/v1/planning/?{params}", headers=user_token_headers)
+    assert [e["start_time"] for e in first.json()] == ["10:00:00", "12:00:00"]
+
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/api/v1/planning/?{params}&cursor={cursor}", headers=user_token_headers)
+    assert [e["start_time"] for e in second.json()] == ["14:00:00"]
+    assert "X-Next-Cursor" not in second.headers
+
+def test_create_events_bulk(client: TestClient, admin_token_headers, db_session: Session, test_teams):
+    team1, team2, team3, team4 = test_teams
+    day = (date.today() + timedelta(days=12)).isoformat()
+    events = [
+        # Valide
+        {"date": day, "start_time": "10:00:00", "matches": [
+            {"court_number": 1, "team1_id": team1.id, "team2_id": team2.id}
+        ]},
+        # Piste 1 occupée jusqu'à 11h30 par l'événement précédent du lot
+        {"date": day, "start_time": "11:00:00", "matches": [
+            {"court_number": 1, "team1_id": team3.id, "team2_id": team4.id}
+        ]},
+        # Équipe 1 déjà engagée à 10h
+        {"date": day, "start_time": "11:00:00", "matches": [
+            {"court_number": 2, "team1_id": team1.id, "team2_id": team3.id}
+        ]},
+        # Équipe inconnue
+        {"date": day, "start_time": "14:00:00", "matches": [
+            {"court_number": 3, "team1_id": team1.id, "team2_id": 99999}
+        ]},
+        # Valide
+        {"date": day, "start_time": "11:30:00", "matches": [
+            {"court_number": 1, "team1_id": team1.id, "team2_id": team2.id},
+            {"court_number": 2, "team1_id": team3.id, "team2_id": team4.id}
+        ]},
+    ]
+
+    response = client.post("/api/v1/planning/bulk", json={"events": events}, headers=admin_token_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert [e["index"] for e in data["errors"]] == [1, 2, 3]
+    assert db_session.query(Match).filter(Match.event_id.in_(data["event_ids"])).count() == 3
+    match = db_session.query(Match).filter(Match.event_id == data["event_ids"][1]).first()
+    assert match.slot_end_time == time(13, 0)
+
+    # Conflit avec la base : rien n'est inséré en mode tout-ou-rien
+    response = client.post(
+        "/api/v1/planning/bulk",
+        json={"events": [events[0], {**events[3], "matches": [{"court_number": 3, "team1_id": team3.id, "team2_id": team4.id}]}],
+              "all_or_nothing": True},
+        headers=admin_token_headers
+    )
+    data = response.json()
+    assert data["created"] == 0
+    assert data["errors"] == [{"index": 0, "detail": "La piste 1 est déjà occupée à ce créneau"}]
+
+def test_create_events_bulk_forbidden(client: TestClient, user_token_headers):
+    response = client.post("/api/v1/planning/bulk", json={"events": []}, headers=user_token_headers)
+    assert response.status_code == 403
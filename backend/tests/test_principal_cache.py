@@ -0,0 +1,69 @@
+# ============================================
+# FICHIER : backend/tests/test_principal_cache.py
+# ============================================
+
+from fastapi.security import HTTPAuthorizationCredentials
+from app.api.deps import get_current_principal
+from app.models.models import Player, User
+from app.core.principal_cache import Principal, PrincipalCache, principal_cache
+from app.core.security import get_password_hash
+
+def test_principal_cache_ttl_and_lru():
+    """Expiration et éviction du moins récemment utilisé"""
+    now = [0.0]
+    cache = PrincipalCache(max_size=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.put(Principal(id=1, role="JOUEUR", is_active=True), cache.version(1))
+    cache.put(Principal(id=2, role="JOUEUR", is_active=True), cache.version(2))
+    assert cache.get(1) is not None
+    cache.put(Principal(id=3, role="JOUEUR", is_active=True), cache.version(3))  # évince 2
+    assert cache.get(2) is None
+    now[0] = 11
+    assert cache.get(1) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+def test_principal_cache_skips_stale_put():
+    """Principal lu avant une invalidation : pas remis en cache après elle"""
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+
+    version = cache.version(1)
+    cache.invalidate(user_ids=[1])  # Commit concurrent : compte désactivé
+    cache.put(Principal(id=1, role="JOUEUR", is_active=True), version)
+    assert cache.get(1) is None
+
+    version = cache.version(2)
+    cache.invalidate(player_ids=[7])  # Équipe d'un joueur changée (utilisateur pas encore connu)
+    cache.put(Principal(id=2, role="JOUEUR", is_active=True, player_id=7), version)
+    assert cache.get(2) is None
+
+    cache.put(Principal(id=2, role="JOUEUR", is_active=True, player_id=7), cache.version(2))
+    assert cache.get(2) is not None
+
+def test_principal_cache_hit_skips_db(client, user_token_headers):
+    """Un succès du cache n'ouvre pas de session (request=None ferait échouer open_db)"""
+    assert client.get("/api/v1/results/ranking", headers=user_token_headers).status_code == 200
+    assert client.get("/api/v1/results/ranking", headers=user_token_headers).status_code == 200
+    assert principal_cache.stats()["misses"] == 1
+    assert principal_cache.stats()["hits"] == 1
+
+    token = user_token_headers["Authorization"].split()[1]
+    principal = get_current_principal(None, HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+    assert principal.role == "JOUEUR"
+
+def test_principal_cache_invalidated_on_role_change(client, admin_token_headers, db_session):
+    """Un joueur promu accède à l'administration sans attendre l'expiration du cache"""
+    player = Player(firstname="Cache", lastname="Test", company="Test", email="cache@test.com", license_number="L777777")
+    db_session.add(player)
+    db_session.commit()
+    db_session.add(User(email=player.email, password_hash=get_password_hash("CacheP@ssw0rd123"),
+                        role="JOUEUR", is_active=True, player_id=player.id))
+    db_session.commit()
+    token = client.post("/api/v1/auth/login", json={"email": "cache@test.com", "password": "CacheP@ssw0rd123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/v1/admin/pools", headers=headers).status_code == 403
+    client.put(f"/api/v1/admin/players/{player.id}/role", json={"role": "ADMINISTRATEUR"}, headers=admin_token_headers)
+    assert client.get("/api/v1/admin/pools", headers=headers).status_code == 200
+
+    stats = client.get("/api/v1/admin/metrics/principal-cache", headers=admin_token_headers).json()
+    assert stats["hits"] >= 1 and stats["misses"] >= 2
@@ -7,6 +7,25 @@ from fastapi import status
 import os
 from app.models.models import User
 
+def make_image(fmt="JPEG", size=(300, 200), color=(200, 30, 30)) -> bytes:
+    """Petite image valide générée à la volée"""
+    import io
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, fmt)
+    return buffer.getvalue()
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """Dossier static servi et dossier des photos redirigés vers tmp_path : rien n'est écrit dans le dépôt"""
+    from app.main import app
+    from app.services import avatars
+    static = next(route.app for route in app.routes if getattr(route, "name", None) == "static")
+    monkeypatch.setattr(static, "directory", str(tmp_path))
+    monkeypatch.setattr(static, "all_directories", [str(tmp_path)])
+    monkeypatch.setattr(avatars, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    return tmp_path / "uploads"
+
 def test_get_profile(client, test_user, user_token_headers):
     """Test récupération du profil utilisateur"""
     response = client.get("/api/v1/auth/me", headers=user_token_headers)
@@ -91,10 +110,10 @@ def test_update_profile_email_conflict(client, test_user, user_token_headers, db
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert "déjà utilisé" in response.json()["detail"]
 
-def test_upload_avatar_success(client, test_user, user_token_headers):
+def test_upload_avatar_success(client, test_user, user_token_headers, upload_dir):
     """Test upload d'avatar réussi"""
-    # Créer une fausse image
-    file_content = b"fake image content"
+    # Créer une image (le format est déterminé par les premiers octets)
+    file_content = make_image("JPEG")
     files = {"file": ("test.jpg", file_content, "image/jpeg")}
     
     response = client.post("/api/v1/auth/me/avatar", files=files, headers=user_token_headers)
@@ -107,7 +126,7 @@ def test_upload_avatar_success(client, test_user, user_token_headers):
     # Nettoyage (optionnel si on utilise un dossier temporaire ou mock)
     # Dans un vrai test, on mockerait le système de fichiers ou on nettoierait après
 
-def test_upload_avatar_invalid_format(client, test_user, user_token_headers):
+def test_upload_avatar_invalid_format(client, test_user, user_token_headers, upload_dir):
     """Test upload avec mauvais format"""
     file_content = b"fake text content"
     files = {"file": ("test.txt", file_content, "text/plain")}
@@ -117,6 +136,53 @@ def test_upload_avatar_invalid_format(client, test_user, user_token_headers):
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert "Format de fichier non supporté" in response.json()["detail"]
 
+def test_upload_avatar_content_type_not_trusted(client, test_user, user_token_headers, upload_dir):
+    """Un Content-Type image ne suffit pas, une vraie image PNG sous un autre nom passe"""
+    files = {"file": ("test.png", b"<?php echo 'pas une image'; ?>", "image/png")}
+    response = client.post("/api/v1/auth/me/avatar", files=files, headers=user_token_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    files = {"file": ("photo", make_image("PNG"), "application/octet-stream")}
+    response = client.post("/api/v1/auth/me/avatar", files=files, headers=user_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["profile_picture"].endswith(".webp")
+
+def test_upload_avatar_thumbnails_deduplicated(client, test_user, user_token_headers, upload_dir):
+    """Vignettes WebP carrées par empreinte, stockées une fois, servies avec un cache immuable"""
+    from PIL import Image
+    content = make_image("JPEG", color=(10, 120, 200))
+    files = {"file": ("a.jpg", content, "image/jpeg")}
+    first = client.post("/api/v1/auth/me/avatar", files=files, headers=user_token_headers).json()
+    second = client.post("/api/v1/auth/me/avatar", files=files, headers=user_token_headers).json()
+    assert first["profile_picture"] == second["profile_picture"]
+
+    sizes = first["profile_picture_sizes"]
+    assert sorted(int(size) for size in sizes) == [64, 128, 256]
+    with Image.open(upload_dir / sizes["64"].removeprefix("/static/uploads/")) as image:
+        assert image.format == "WEBP" and image.size == (64, 64)
+
+    response = client.get(sizes["128"])
+    assert response.status_code == status.HTTP_200_OK
+    assert "immutable" in response.headers["cache-control"]
+
+def test_sweep_orphan_uploads(db_session, test_user, tmp_path, monkeypatch):
+    """Seuls les fichiers récents ou référencés par un utilisateur sont conservés"""
+    from app.services import avatars
+    monkeypatch.setattr(avatars, "UPLOAD_DIR", str(tmp_path))
+    digest = "a" * 64
+    (tmp_path / "avatars").mkdir()
+    kept = [tmp_path / "avatars" / f"{digest}-{size}.webp" for size in avatars.AVATAR_SIZES]
+    orphans = [tmp_path / "avatars" / f"{'b' * 64}-64.webp", tmp_path / "1_old.jpg"]
+    for path in kept + orphans:
+        path.write_bytes(b"x")
+    test_user.profile_picture = avatars.avatar_url(digest, 256)
+    db_session.commit()
+
+    assert avatars.sweep_orphan_uploads(db_session) == []  # Délai de grâce
+    removed = avatars.sweep_orphan_uploads(db_session, grace_seconds=0)
+    assert sorted(removed) == sorted(str(p) for p in orphans)
+    assert all(p.exists() for p in kept)
+
 def test_delete_avatar(client, test_user, user_token_headers):
     """Test suppression d'avatar"""
     # D'abord uploader ou définir un avatar
@@ -161,3 +227,57 @@ def test_change_password_wrong_current(client, test_user, user_token_headers):
     
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert "incorrect" in response.json()["detail"]
+
+def test_receive_image_stops_at_limit(tmp_path):
+    """Sans Content-Length, la réception s'arrête dès que la limite est franchie"""
+    import anyio
+    from starlette.requests import Request
+    from app.core.uploads import UploadRejected, receive_image
+
+    boundary = b"limite"
+    head = b"--limite\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.jpg\"\r\n\r\n\xff\xd8\xff"
+    chunks = [head] + [b"\x00" * 1024] * 100
+    sent = []
+
+    async def receive():
+        sent.append(1)
+        body = chunks[len(sent) - 1] if len(sent) <= len(chunks) else b""
+        return {"type": "http.request", "body": body, "more_body": len(sent) < len(chunks)}
+
+    scope = {"type": "http", "method": "POST", "headers": [(b"content-type", b"multipart/form-data; boundary=" + boundary)]}
+
+    async def run():
+        with pytest.raises(UploadRejected):
+            await receive_image(Request(scope, receive), "file", str(tmp_path), 10 * 1024)
+
+    anyio.run(run)
+    assert len(sent) < 20
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.parametrize("extra_part", [
+    b"--limite\r\nContent-Disposition: form-data; name=\"autre\"\r\n\r\n",  # Autre champ
+    b"\x00" * 64,  # Préambule avant la première partie : refusé par le parseur
+])
+def test_receive_image_limits_whole_body(tmp_path, extra_part):
+    """Sans Content-Length, un gros champ annexe ou préambule est aussi borné"""
+    import anyio
+    from starlette.requests import Request
+    from app.core.uploads import UploadRejected, receive_image
+
+    chunks = [extra_part] + [b"\x00" * 1024] * 200
+    sent = []
+
+    async def receive():
+        sent.append(1)
+        body = chunks[len(sent) - 1] if len(sent) <= len(chunks) else b""
+        return {"type": "http.request", "body": body, "more_body": len(sent) < len(chunks)}
+
+    scope = {"type": "http", "method": "POST", "headers": [(b"content-type", b"multipart/form-data; boundary=limite")]}
+
+    async def run():
+        with pytest.raises(UploadRejected):
+            await receive_image(Request(scope, receive), "file", str(tmp_path), 10 * 1024)
+
+    anyio.run(run)
+    assert len(sent) < 40  # 10 Kio + 16 Kio de marge
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,29 @@
+# ============================================
+# FICHIER : backend/tests/test_query_stats.py
+# ============================================
+
+from datetime import date, time, timedelta
+from app.models.models import Team, Event, Match
+from app.core.query_stats import N_PLUS_ONE_THRESHOLD, track_queries
+
+def test_track_queries_flags_n_plus_one(db_session):
+    """Un chargement paresseux en boucle apparaît comme une requête répétée"""
+    team1, team2 = Team(name="Team A"), Team(name="Team B")
+    db_session.add_all([team1, team2])
+    db_session.flush()
+    for day in range(N_PLUS_ONE_THRESHOLD):
+        event_ = Event(date=date.today() + timedelta(days=day), start_time=time(19, 0))
+        event_.matches = [Match(court_number=1, team1_id=team1.id, team2_id=team2.id)]
+        db_session.add(event_)
+    db_session.commit()
+    db_session.expire_all()
+
+    with track_queries() as stats:
+        matches = db_session.query(Match).all()
+        for match in matches:
+            match.event.date
+
+    assert stats.count == 1 + N_PLUS_ONE_THRESHOLD
+    assert stats.seconds > 0
+    [(statement, n)] = stats.repeated()
+    assert n == N_PLUS_ONE_THRESHOLD and "FROM events" in statement
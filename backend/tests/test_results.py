@@ -4,7 +4,8 @@
 
 import pytest
 from datetime import date, timedelta, time
-from app.models.models import Match, Team, Player, MatchStatus, Event
+from app.models.models import Match, Team, Player, MatchStatus, Event, TeamStanding, MatchSet
+from app.core import scores
 
 @pytest.fixture
 def ranking_data(db_session):
@@ -169,3 +170,133 @@ def test_score_validation_invalid_rules(client, admin_token_headers, ranking_dat
             "score_team2": "6-0, 6-0"  # Score valide pour l'autre équipe
         })
         assert res.status_code == 422
+
+def test_ranking_updated_on_score_entry(client, admin_token_headers, ranking_data):
+    """Le classement persistant suit la saisie puis l'annulation d'un score"""
+    t1, t2, t3 = ranking_data
+    response = client.post("/api/v1/matches/", headers=admin_token_headers, json={
+        "date": (date.today() + timedelta(days=4)).isoformat(),
+        "time": "12:00:00",
+        "court_number": 7,
+        "team1_id": t3.id,
+        "team2_id": t2.id
+    })
+    match_id = response.json()["id"]
+
+    res = client.put(f"/api/v1/matches/{match_id}", headers=admin_token_headers, json={
+        "status": "TERMINE",
+        "score_team1": "6-1, 6-1",
+        "score_team2": "1-6, 1-6"
+    })
+    assert res.status_code == 200
+
+    ranking = client.get("/api/v1/results/ranking", headers=admin_token_headers).json()
+    team_c = next(r for r in ranking if r["team_name"] == "Team C")
+    assert ranking[0]["team_name"] == "Team C"
+    assert team_c["points"] == 6
+    assert team_c["matches_played"] == 3
+    assert team_c["sets_won"] == 4
+
+    # Repasser le match à venir retire sa contribution
+    res = client.put(f"/api/v1/matches/{match_id}", headers=admin_token_headers, json={"status": "A_VENIR"})
+    assert res.status_code == 200
+
+    ranking = client.get("/api/v1/results/ranking", headers=admin_token_headers).json()
+    team_c = next(r for r in ranking if r["team_name"] == "Team C")
+    assert team_c["points"] == 3
+    assert team_c["matches_played"] == 2
+
+def test_recompute_standings(client, admin_token_headers, db_session, ranking_data):
+    """La reconstruction détecte et corrige une ligne de classement faussée"""
+    t1 = ranking_data[0]
+    db_session.query(TeamStanding).filter(TeamStanding.team_id == t1.id).update({"points": 42})
+    db_session.commit()
+
+    response = client.post("/api/v1/admin/standings/recompute", headers=admin_token_headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["teams_checked"] == 3
+    assert [m["team_id"] for m in report["mismatches"]] == [t1.id]
+    assert report["mismatches"][0]["expected"]["points"] == 3
+
+    response = client.post("/api/v1/admin/standings/recompute", headers=admin_token_headers)
+    assert response.json()["mismatches"] == []
+
+def test_standings_follow_expired_match(db_session, ranking_data):
+    """Match modifié puis supprimé après un commit (attributs expirés) : classement toujours juste"""
+    from app.services.standings import recompute_standings
+    t1, t2, t3 = ranking_data
+    m1, m3 = db_session.query(Match).filter(Match.court_number.in_([1, 3])).order_by(Match.court_number).all()
+    db_session.commit()  # Expire les attributs : plus d'historique à lire au flush
+
+    m1.status = MatchStatus.ANNULE
+    m1.score_team1 = None
+    db_session.commit()
+    assert db_session.get(TeamStanding, t1.id).points == 0
+    assert db_session.get(TeamStanding, t2.id).losses == 0
+
+    db_session.delete(m3)
+    db_session.commit()
+    assert recompute_standings(db_session)["mismatches"] == []
+
+def test_recompute_standings_forbidden(client, user_token_headers):
+    response = client.post("/api/v1/admin/standings/recompute", headers=user_token_headers)
+    assert response.status_code == 403
+
+def test_score_codec():
+    """Le codec découpe, formate et compte les sets"""
+    sets = scores.validate_score("6-4, 3-6, 7-5")
+    assert sets == [(6, 4), (3, 6), (7, 5)]
+    assert scores.format_score(sets) == "6-4, 3-6, 7-5"
+    assert scores.count_sets(sets) == (2, 1)
+    assert scores.decode_score("6-4 6-3") is None
+    with pytest.raises(ValueError):
+        scores.validate_score("6-4, 6-4, 6-4")
+
+def test_match_sets_follow_score(client, admin_token_headers, db_session, ranking_data):
+    """Le score texte est stocké set par set et effacé avec lui"""
+    t1, t2, t3 = ranking_data
+    response = client.post("/api/v1/matches/", headers=admin_token_headers, json={
+        "date": (date.today() + timedelta(days=4)).isoformat(),
+        "time": "14:00:00",
+        "court_number": 8,
+        "team1_id": t1.id,
+        "team2_id": t2.id
+    })
+    match_id = response.json()["id"]
+
+    client.put(f"/api/v1/matches/{match_id}", headers=admin_token_headers, json={
+        "status": "TERMINE",
+        "score_team1": "7-6, 4-6, 6-2",
+        "score_team2": "6-7, 6-4, 2-6"
+    })
+    rows = db_session.query(MatchSet).filter(MatchSet.match_id == match_id).order_by(MatchSet.set_number).all()
+    assert [(s.games_team1, s.games_team2) for s in rows] == [(7, 6), (4, 6), (6, 2)]
+
+    client.put(f"/api/v1/matches/{match_id}", headers=admin_token_headers, json={"status": "ANNULE"})
+    assert db_session.query(MatchSet).filter(MatchSet.match_id == match_id).count() == 0
+
+def test_ranking_etag_and_invalidation(client, admin_token_headers, db_session, ranking_data, max_queries):
+    """Classement inchangé : 304 sans requête SQL ; après une écriture, nouvel ETag"""
+    response = client.get("/api/v1/results/ranking", headers=admin_token_headers)
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, no-cache"
+    etag = response.headers["etag"]
+    assert etag.startswith('"')
+
+    for if_none_match in (etag, f"W/{etag}", f'"autre", {etag}'):
+        response = client.get("/api/v1/results/ranking", headers={**admin_token_headers, "If-None-Match": if_none_match})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["etag"] == etag
+        max_queries(response, 0)
+
+    # Écriture en masse (hors objets ORM) : invalidée au commit
+    db_session.query(TeamStanding).filter(TeamStanding.team_id == ranking_data[0].id).update({"points": 42})
+    db_session.commit()
+    response = client.get("/api/v1/results/ranking", headers={**admin_token_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()[0]["points"] == 42
+
+    stats = client.get("/api/v1/admin/metrics/response-cache", headers=admin_token_headers).json()
+    assert stats["not_modified"] == 3 and stats["invalidations"] == 1
@@ -49,4 +49,4 @@ def test_jwt_invalid_token():
     invalid_token = "invalid.token.here"
     decoded = decode_token(invalid_token)
     
-    assert decoded is None
\ No newline at end of file
+    assert decoded is None
@@ -0,0 +1,73 @@
+# ============================================
+# FICHIER : backend/tests/test_single_flight.py
+# ============================================
+
+import asyncio
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.core.single_flight import SingleFlight
+
+def test_single_flight_threads():
+    """Requêtes identiques simultanées : un seul calcul, même résultat pour toutes"""
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def compute():
+        started.set()
+        release.wait(5)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        leader = pool.submit(flights.do, "ranking", compute)
+        started.wait(5)
+        followers = [pool.submit(flights.do, "ranking", compute) for _ in range(4)]
+        other = pool.submit(flights.do, "planning", lambda: "autre clé")
+        assert other.result(5) == "autre clé"
+        while flights.stats()["coalesced"] < 4:
+            release.wait(0.01)
+        release.set()
+        results = {id(f.result(5)) for f in [leader, *followers]}
+
+    assert len(results) == 1
+    assert flights.stats() == {"in_flight": 0, "executed": 2, "coalesced": 4}
+
+    # Exception du calcul partagé : transmise à chaque requête en attente
+    def failing():
+        started.wait(5)
+        raise ValueError("base indisponible")
+
+    started.clear()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flights.do, "ranking", failing)
+        while flights.stats()["in_flight"] == 0:
+            release.wait(0.01)
+        follower = pool.submit(flights.do, "ranking", failing)
+        while flights.stats()["coalesced"] < 5:
+            release.wait(0.01)
+        started.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result(5)
+
+def test_single_flight_async():
+    flights = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return b"[]"
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async("events", compute) for _ in range(10)))
+
+    assert asyncio.run(main()) == [b"[]"] * 10
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "executed": 1, "coalesced": 9}
+
+def test_single_flight_metrics(client, admin_token_headers):
+    before = client.get("/api/v1/admin/metrics/single-flight", headers=admin_token_headers).json()
+    assert client.get("/api/v1/results/ranking", headers=admin_token_headers).status_code == 200
+    after = client.get("/api/v1/admin/metrics/single-flight", headers=admin_token_headers).json()
+    assert after["executed"] == before["executed"] + 1 and after["in_flight"] == 0
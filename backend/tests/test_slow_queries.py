@@ -0,0 +1,23 @@
+# ============================================
+# FICHIER : backend/tests/test_slow_queries.py
+# ============================================
+
+from app.core.slow_queries import slow_query_log
+
+def test_slow_query_log(client, admin_token_headers, monkeypatch):
+    """Au-delà du seuil, la requête est gardée avec sa route, la forme de ses paramètres et son plan"""
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 1e-6)  # Toutes les requêtes sont « lentes »
+    slow_query_log.clear()
+
+    client.get("/api/v1/matches/", params={"company": "acme"}, headers=admin_token_headers)
+    entries = client.get("/api/v1/admin/metrics/slow-queries", headers=admin_token_headers).json()["queries"]
+    slow_query_log.clear()
+
+    [entry] = [e for e in entries if e["route"] == "GET /api/v1/matches/" and "FROM matches" in e["statement"]]
+    assert entry["duration_ms"] > 0
+    assert "acme" not in str(entry["parameters"]) and "str" in entry["parameters"]
+    assert any(step.startswith(("SCAN", "SEARCH")) for step in entry["plan"])
+
+def test_slow_queries_forbidden(client, user_token_headers):
+    response = client.get("/api/v1/admin/metrics/slow-queries", headers=user_token_headers)
+    assert response.status_code == 403
@@ -0,0 +1,19 @@
+# ============================================
+# FICHIER : backend/tests/test_sqlite_profile.py
+# ============================================
+
+from sqlalchemy import create_engine, event
+from app.database import apply_sqlite_profile
+
+def test_sqlite_profile_applied(tmp_path):
+    """Les PRAGMA du profil sont posés sur chaque nouvelle connexion"""
+    profiled = create_engine(f"sqlite:///{tmp_path}/profile.db")
+    event.listen(profiled, "connect", apply_sqlite_profile)
+    with profiled.connect() as connection:
+        pragma = lambda name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == 5000
+        assert pragma("foreign_keys") == 1
+        assert pragma("temp_store") == 2  # MEMORY
+    profiled.dispose()
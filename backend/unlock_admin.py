@@ -1,13 +1,9 @@
+# Débloque admin@padel.com quand le suivi des échecs est en base (LOGIN_ATTEMPTS_BACKEND=database).
+# En mémoire (par défaut), utiliser DELETE /api/v1/admin/login-attempts/{email} ou redémarrer l'API.
+from app.core.login_attempts import DatabaseAttemptStore
 
-from app.database import SessionLocal
-from app.models.models import LoginAttempt
-
-db = SessionLocal()
 try:
-    db.query(LoginAttempt).filter(LoginAttempt.email == "admin@padel.com").delete()
-    db.commit()
+    DatabaseAttemptStore().reset("admin@padel.com")
     print("Unlocked admin@padel.com")
 except Exception as e:
     print(f"Error: {e}")
-finally:
-    db.close()
@@ -79,6 +79,19 @@ export const authAPI = {
   getPools: () => api.get('/admin/pools'),
 }
 
+// Suit l'en-tête X-Next-Cursor pour récupérer toutes les pages d'une liste
+const getAllPages = async (url, params = {}) => {
+  const response = await api.get(url, { params })
+  let data = response.data
+  let cursor = response.headers['x-next-cursor']
+  while (cursor) {
+    const page = await api.get(url, { params: { ...params, cursor } })
+    data = data.concat(page.data)
+    cursor = page.headers['x-next-cursor']
+  }
+  return { ...response, data }
+}
+
 export const matchesAPI = {
   getMatches: (params) => {
     // Map status to status_filter for backend
@@ -86,7 +99,7 @@ export const matchesAPI = {
       params.status_filter = params.status
       delete params.status
     }
-    return api.get('/matches', { params })
+    return getAllPages('/matches', params)
   },
   createMatch: (data) => api.post('/matches', data),
   updateMatch: (id, data) => api.put(`/matches/${id}`, data),
@@ -98,7 +111,7 @@ export const resultsAPI = {
 }
 
 export const planningAPI = {
-  getEvents: (params) => api.get('/planning', { params }),
+  getEvents: (params) => getAllPages('/planning', params),
   createEvent: (data) => api.post('/planning', data),
   deleteEvent: (id) => api.delete(`/planning/${id}`)
 }